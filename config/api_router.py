@@ -1,7 +1,17 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
-from fahari.common.views import FacilityViewSet, SystemViewSet, UserFacilityViewSet
+from fahari.common.views import (
+    ChunkedUploadViewSet,
+    DashboardMetricsView,
+    FacilityViewSet,
+    SystemViewSet,
+    UserFacilityViewSet,
+    async_dashboard_metrics_view,
+    async_facility_detail_view,
+    async_facility_list_view,
+)
 from fahari.misc.views import StockVerificationReceiptsAdapterView
 from fahari.ops.views import (
     ActivityLogViewSet,
@@ -20,7 +30,10 @@ from fahari.ops.views import (
     WeeklyProgramUpdateCommentsViewSet,
     WeeklyProgramUpdateViewSet,
 )
-from fahari.sims.views import QuestionnaireResponsesViewSet
+from fahari.sims.views import (
+    QuestionnaireResponsesViewSet,
+    async_questionnaire_responses_list_view,
+)
 from fahari.users.api.views import UserViewSet
 
 if settings.DEBUG:
@@ -49,6 +62,22 @@ router.register("facility_device_requests", FacilityDeviceRequestViewSet)
 router.register("security_incidents", SecurityIncidenceViewSet)
 router.register("stock_receipts_adapters", StockVerificationReceiptsAdapterView)
 router.register("questionnaire_responses", QuestionnaireResponsesViewSet)
+router.register("uploads", ChunkedUploadViewSet)
 
 app_name = "api"
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("dashboard_metrics/", DashboardMetricsView.as_view(), name="dashboard-metrics"),
+    # Async read endpoints, served from the read pool, see `fahari.common.read_pool`
+    path("async/facilities/", async_facility_list_view, name="async-facility-list"),
+    path("async/facilities/<pk>/", async_facility_detail_view, name="async-facility-detail"),
+    path(
+        "async/dashboard_metrics/",
+        async_dashboard_metrics_view,
+        name="async-dashboard-metrics",
+    ),
+    path(
+        "async/questionnaire_responses/",
+        async_questionnaire_responses_list_view,
+        name="async-questionnaireresponses-list",
+    ),
+]
@@ -26,6 +26,7 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 
 django_asgi_app = get_asgi_application()
 
+from fahari.common.consumers import LiveUpdatesConsumer  # noqa
 from fahari.misc.consumers import StockVerificationReceiptsAdapterConsumer  # noqa
 
 application = ProtocolTypeRouter(
@@ -40,6 +41,7 @@ application = ProtocolTypeRouter(
                         r"^ws/misc/stock_receipts_verification_ingest/$",
                         StockVerificationReceiptsAdapterConsumer.as_asgi(),
                     ),
+                    re_path(r"^ws/common/live_updates/$", LiveUpdatesConsumer.as_asgi()),
                 ]
             )
         ),
@@ -4,6 +4,7 @@ Base settings to build other settings files upon.
 import io
 import os
 from pathlib import Path
+from typing import Any, Dict
 
 import environ
 from google.cloud import secretmanager
@@ -114,7 +115,7 @@ MIGRATION_MODULES = {"sites": "fahari.contrib.sites.migrations"}
 # AUTHENTICATION
 # =============================================================================
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
+    "fahari.users.backends.PermissionSnapshotBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
 ]
 AUTH_USER_MODEL = "users.User"
@@ -332,15 +333,14 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.FileUploadParser",
     ),
     "DEFAULT_FILTER_BACKENDS": (
-        "rest_framework_datatables.filters.DatatablesFilterBackend",
+        "fahari.common.filters.LazyCountDatatablesFilterBackend",
         "django_filters.rest_framework.DjangoFilterBackend",
+        "fahari.common.filters.FullTextSearchFilterBackend",
         "rest_framework.filters.OrderingFilter",
         "fahari.common.filters.OrganisationFilterBackend",
         "fahari.common.filters.AllottedFacilitiesFilterBackend",
     ),
-    "DEFAULT_PAGINATION_CLASS": (
-        "rest_framework_datatables.pagination.DatatablesPageNumberPagination"
-    ),
+    "DEFAULT_PAGINATION_CLASS": "fahari.common.pagination.PinnedRecordDatatablesPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
@@ -385,6 +385,39 @@ WHITELISTED_DOMAINS = env.list(
     ],
 )
 
+# =============================================================================
+# CHUNKED UPLOADS CONFIG
+# =============================================================================
+# The storage of the staged parts and of the assembled files, `None` means
+# the default file storage, which is also the storage of the file fields
+CHUNKED_UPLOAD_STORAGE = env("CHUNKED_UPLOAD_STORAGE", default=None)
+CHUNKED_UPLOAD_MAX_SIZE = env.int("CHUNKED_UPLOAD_MAX_SIZE", default=100 * 1024 * 1024)
+CHUNKED_UPLOAD_MAX_PART_SIZE = env.int("CHUNKED_UPLOAD_MAX_PART_SIZE", default=5 * 1024 * 1024)
+
+# =============================================================================
+# ASYNC READS CONFIG
+# =============================================================================
+# The async read endpoints run their queries in a dedicated pool of threads,
+# each holding its own database connection, see `fahari.common.read_pool`
+ASYNC_READ_WORKERS = env.int("ASYNC_READ_WORKERS", default=8)
+ASYNC_READ_MAX_PENDING = env.int("ASYNC_READ_MAX_PENDING", default=64)
+
+# =============================================================================
+# CHANNELS CONFIG
+# =============================================================================
+# Live updates are off without a channel layer, see `fahari.common.broadcasts`
+CHANNEL_LAYERS: Dict[str, Any] = {}
+
+# =============================================================================
+# KENYA MASTER HEALTH FACILITIES LIST (MFL) API CONFIG
+# =============================================================================
+MFL_API = {
+    "TOKEN": env("MFL_API_TOKEN", default=""),
+    "TRANSPORT": "fahari.common.utils.RequestsMFLTransport",
+    "URL": env("MFL_API_URL", default="http://api.kmhfl.health.go.ke/api/facilities/material/"),
+}
+
+
 # =============================================================================
 # MJML CONFIG (FOR RESPONSIVE EMAILS)
 # =============================================================================
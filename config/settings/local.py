@@ -23,6 +23,11 @@ CACHES = {
     }
 }
 
+# CHANNELS
+# ------------------------------------------------------------------------------
+# Only reaches the clients connected to the same process
+CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-host
@@ -34,6 +34,20 @@ CACHES = {
     }
 }
 
+# CHANNELS
+# ------------------------------------------------------------------------------
+# Share the live updates between the app's instances. Without Redis, live
+# updates can only be turned off explicitly.
+if env.bool("LIVE_UPDATES_ENABLED", default=True):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [env("REDIS_URL")]},
+        }
+    }
+else:
+    logging.getLogger(__name__).warning("Live updates are off, LIVE_UPDATES_ENABLED is false.")
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -1,8 +1,11 @@
 from typing import Tuple
 
 from django.contrib import admin
+from django.template.loader import render_to_string
+from django.utils import timezone
 
 from .models import Facility, FacilityAttachment, Organisation, System
+from .templatetags.renditions import rendition_preview
 
 
 class BaseAdmin(admin.ModelAdmin):
@@ -19,13 +22,23 @@ class BaseAdmin(admin.ModelAdmin):
             obj.updated_by = request.user.pk
 
         if change:
+            obj.updated = timezone.now()
             obj.updated_by = request.user.pk
 
         obj.save()
 
 
-class FacilityAttachmentInline(admin.TabularInline):
+class AttachmentPreviewMixin:
+    """Show the thumbnails of image attachments, see `fahari.common.renditions`."""
+
+    @admin.display(description="Preview")
+    def preview(self, obj) -> str:
+        return render_to_string("fragments/rendition_preview.html", rendition_preview(obj.data))
+
+
+class FacilityAttachmentInline(AttachmentPreviewMixin, admin.TabularInline):
     model = FacilityAttachment
+    readonly_fields = ("aspect_ratio", "preview", "size")
 
 
 @admin.register(Facility)
@@ -51,8 +64,8 @@ class FacilityAdmin(BaseAdmin):
 
 
 @admin.register(FacilityAttachment)
-class FacilityAttachmentAdmin(BaseAdmin):
-    pass
+class FacilityAttachmentAdmin(AttachmentPreviewMixin, BaseAdmin):
+    readonly_fields = BaseAdmin.readonly_fields + ("aspect_ratio", "preview", "size")
 
 
 @admin.register(Organisation)
@@ -0,0 +1,97 @@
+"""Live updates of records, broadcast to the clients of their organisation.
+
+Models opt in by setting `broadcast_facility_lookup` to the lookup of their
+facility. Whenever such a record is created, updated or deleted, a compact
+change event is published, once the transaction commits, to the channel
+layer group of the record's organisation. `LiveUpdatesConsumer` relays the
+events of the facilities a user is allotted to over a websocket, so the
+dashboards and tables can refetch just the changed records instead of
+polling whole pages.
+
+Bulk creates, updates and deletes bypass `save` and `delete` and so are not
+broadcast.
+"""
+import logging
+from typing import Any, Dict, Set
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import models, transaction
+
+LOGGER = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+ACTION_CREATED = "created"
+
+ACTION_DELETED = "deleted"
+
+ACTION_UPDATED = "updated"
+
+CHANGE_EVENT_TYPE = "change.event"
+"""The channel layer message type, handled by `LiveUpdatesConsumer.change_event`."""
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def get_organisation_group(organisation_id: Any) -> str:
+    """Return the name of the channel layer group of the given organisation."""
+
+    return "live_updates.%s" % organisation_id
+
+
+def get_facility_id(instance: models.Model, lookup: str) -> str:
+    """Return the pk of the facility at the end of the given lookup of the given record."""
+
+    *path, field_name = lookup.split("__")
+    for name in path:
+        instance = getattr(instance, name)
+    return str(getattr(instance, instance._meta.get_field(field_name).attname))
+
+
+def get_change_event(instance: models.Model, action: str) -> Dict[str, Any]:
+    """Return the change event of the given record, the client fetches the record if needed."""
+
+    return {
+        "model": instance._meta.label_lower,
+        "action": action,
+        "id": str(instance.pk),
+        "facility": get_facility_id(instance, instance.broadcast_facility_lookup),
+        "active": instance.active,
+        "updated": instance.updated.isoformat(),
+    }
+
+
+def get_allotted_facility_ids(user) -> Set[str]:
+    """Return the pks of the facilities that the given user is allotted to."""
+
+    from .models import UserFacilityAllotment  # intentional late import
+
+    facilities = UserFacilityAllotment.get_facilities_for_user(user)
+    return {str(pk) for pk in facilities.values_list("pk", flat=True)}
+
+
+def _send(group: str, event: Dict[str, Any]) -> None:
+    channel_layer = get_channel_layer()
+    try:
+        async_to_sync(channel_layer.group_send)(group, {"type": CHANGE_EVENT_TYPE, "event": event})
+    except Exception:  # A live update is not worth failing a committed request over
+        LOGGER.exception("Failed to broadcast the change event %s", event)
+
+
+def publish_change_event(organisation_id: Any, event: Dict[str, Any]) -> None:
+    """Broadcast the given change event once the current transaction commits.
+
+    Nothing is broadcast when live updates are off, i.e. when there is no
+    channel layer.
+    """
+
+    if get_channel_layer() is None:
+        return
+    group = get_organisation_group(organisation_id)
+    transaction.on_commit(lambda: _send(group, event))
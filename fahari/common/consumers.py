@@ -0,0 +1,42 @@
+from typing import Any, Dict, Optional
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .broadcasts import get_allotted_facility_ids, get_organisation_group
+
+
+class LiveUpdatesConsumer(AsyncJsonWebsocketConsumer):
+    """Relay the change events of the requesting user's organisation.
+
+    Only the events of the facilities that the user is allotted to are
+    relayed. The allotment is read once, on connection, so clients should
+    reconnect to pick up a changed allotment. See `fahari.common.broadcasts`.
+    """
+
+    group_name: Optional[str] = None
+
+    async def connect(self) -> None:
+        if self.channel_layer is None:  # Live updates are off
+            await self.close(code=1013)
+            return
+        user = self.scope["user"]
+        if not user.is_authenticated or not user.is_approved:
+            await self.close(code=1008)
+            return
+
+        self.facilities = await database_sync_to_async(get_allotted_facility_ids)(user)
+        self.group_name = get_organisation_group(user.organisation_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code: int) -> None:
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def change_event(self, message: Dict[str, Any]) -> None:
+        """Relay a change event published by `fahari.common.broadcasts.publish_change_event`."""
+
+        event = message["event"]
+        if event["facility"] in self.facilities:
+            await self.send_json(event)
@@ -1,3 +1,5 @@
+from typing import Any, Dict
+
 from django.contrib.auth import get_user_model
 from django.db.models import Sum
 from django.utils import timezone
@@ -56,3 +58,14 @@ def get_appointments_mtd(user):
         organisation=user.organisation,
     ).aggregate(Sum("total"))
     return qs["total__sum"]
+
+
+def get_dashboard_metrics(user) -> Dict[str, Any]:
+    """Return the summaries shown on the dashboard of the given user's organisation."""
+
+    return {
+        "active_facility_count": get_active_facility_count(user),
+        "open_ticket_count": get_open_ticket_count(user),
+        "user_count": get_active_user_count(user),
+        "appointments_mtd": get_appointments_mtd(user),
+    }
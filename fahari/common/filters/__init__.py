@@ -1,12 +1,21 @@
 from .base_filters import CommonFieldsFilterset
 from .common_filters import FacilityFilter, SystemFilter, UserFacilityAllotmentFilter
-from .custom_filter_backends import AllottedFacilitiesFilterBackend, OrganisationFilterBackend
+from .custom_filter_backends import (
+    AllottedFacilitiesFilterBackend,
+    FullTextSearchFilterBackend,
+    LazyCountDatatablesFilterBackend,
+    OrganisationFilterBackend,
+    filter_visible_records,
+)
 
 __all__ = [
     "AllottedFacilitiesFilterBackend",
     "CommonFieldsFilterset",
     "FacilityFilter",
+    "FullTextSearchFilterBackend",
+    "LazyCountDatatablesFilterBackend",
     "OrganisationFilterBackend",
     "SystemFilter",
     "UserFacilityAllotmentFilter",
+    "filter_visible_records",
 ]
@@ -1,6 +1,5 @@
 """Base filters."""
 import django_filters
-from django.db.models import Case, IntegerField, Value, When
 from rest_framework.filters import SearchFilter
 
 
@@ -24,30 +23,10 @@ class CommonFieldsFilterset(django_filters.FilterSet):
 
         This ensures that the record is available in select / comboboxes
         even if it is a 'deep' entry that would otherwise be buried by
-        pagination.
+        pagination. The record is pinned to the top of the first page by
+        `PinnedRecordPaginationMixin`, hence the queryset is returned as is.
         """
-        ordering_filters = ("custom_order", "-updated", "-created")
-        annotated_qs = queryset.annotate(
-            custom_order=Case(
-                When(pk=value, then=Value(0)),
-                output_field=IntegerField(),
-                default=Value(1),
-            )
-        ).order_by(*ordering_filters)
-
-        # guarantee that an entry with the supplied PK is *always* returned
-        alternate_qs = (
-            queryset.model.objects.filter(pk=value)
-            .annotate(
-                custom_order=Case(
-                    When(pk=value, then=Value(0)),
-                    output_field=IntegerField(),
-                    default=Value(1),
-                )
-            )
-            .order_by(*ordering_filters)
-        )
-        return annotated_qs if annotated_qs.count() > 0 else alternate_qs
+        return queryset
 
     active = django_filters.BooleanFilter(method="inactive_records")
     bubble_record = django_filters.UUIDFilter(method="bubble_record_to_top")
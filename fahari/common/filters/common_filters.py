@@ -1,19 +1,70 @@
+import django_filters
 from rest_framework import filters
+from rest_framework.exceptions import ValidationError
 
 from ..models import Facility, System, UserFacilityAllotment
 from .base_filters import CommonFieldsFilterset
 
 
+def _parse_floats(value, expected_count, filter_name):
+    """Parse a comma separated list of numbers as passed to a geospatial filter."""
+    try:
+        numbers = [float(number) for number in value.split(",")]
+    except ValueError:
+        numbers = []
+    if len(numbers) != expected_count:
+        raise ValidationError(
+            {filter_name: "Expected %s comma separated numbers." % expected_count}
+        )
+    return numbers
+
+
 class FacilityFilter(CommonFieldsFilterset):
     """Filter facilities."""
 
     search = filters.SearchFilter()
 
+    def filter_within_bounding_box(self, queryset, field, value):
+        """Select the facilities located within the given "min_lon,min_lat,max_lon,max_lat" box."""
+        min_lon, min_lat, max_lon, max_lat = _parse_floats(value, 4, field)
+        return queryset.within_bounding_box(min_lon, min_lat, max_lon, max_lat)
+
+    def filter_near(self, queryset, field, value):
+        """Select the facilities near the given "lat,lon" point.
+
+        The facilities are limited to those within the given `radius` (in
+        kilometres) and/or the `nearest` facilities to the given point. If
+        neither is given, all the facilities are returned ordered by their
+        distance from the given point.
+        """
+        lat, lon = _parse_floats(value, 2, field)
+        radius = self.form.cleaned_data.get("radius")
+        nearest = self.form.cleaned_data.get("nearest")
+        if radius is not None:
+            queryset = queryset.within_radius(lat, lon, radius)
+        if nearest is not None:
+            return queryset.nearest(lat, lon, int(nearest))
+        return queryset if radius is not None else queryset.annotate_with_distance(lat, lon)
+
+    def used_with_near(self, queryset, field, value):
+        """Leave the queryset as is, these values are used by the `near` filter."""
+        return queryset
+
+    bbox = django_filters.CharFilter(
+        method="filter_within_bounding_box", help_text="min_lon,min_lat,max_lon,max_lat"
+    )
+    near = django_filters.CharFilter(method="filter_near", help_text="lat,lon")
+    radius = django_filters.NumberFilter(
+        method="used_with_near", min_value=0, help_text="Radius in kilometres"
+    )
+    nearest = django_filters.NumberFilter(method="used_with_near", min_value=1)
+
     class Meta:
         """Set up filter options."""
 
         model = Facility
         fields = "__all__"
+        exclude = ("location",)
 
 
 class SystemFilter(CommonFieldsFilterset):
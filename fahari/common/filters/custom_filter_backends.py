@@ -1,6 +1,9 @@
 from rest_framework import filters
+from rest_framework_datatables.filters import DatatablesFilterBackend
+from rest_framework_datatables.utils import get_param
 
 from ..models import UserFacilityAllotment
+from ..search import is_full_text_searchable, search
 
 
 class AllottedFacilitiesFilterBackend(filters.BaseFilterBackend):
@@ -28,3 +31,88 @@ class OrganisationFilterBackend(filters.BaseFilterBackend):
     def filter_queryset(self, request, queryset, view):
         """Filter all records that have an organisation field by user org."""
         return queryset.filter(organisation=request.user.organisation)
+
+
+def filter_visible_records(request, queryset, view):
+    """Return the records of the given queryset that the requesting user is allowed to view.
+
+    Only the view's organisation and allotted facilities filter backends are
+    applied, i.e. the filters, search and ordering of the request are not.
+    This is used where the records of a listing are needed regardless of
+    the request's filters, e.g. to count the whole listing.
+    """
+    for backend in view.filter_backends:
+        if issubclass(backend, (AllottedFacilitiesFilterBackend, OrganisationFilterBackend)):
+            queryset = backend().filter_queryset(request, queryset, view)
+    return queryset
+
+
+class FullTextSearchFilterBackend(filters.SearchFilter):
+    """Search the records of views using their `search_fields`.
+
+    Views whose `search_fields` are all part of their model's search vector,
+    see `fahari.common.search`, are searched through the `search` query
+    parameter using the vector's GIN index. Other views fall back to
+    matching each of their `search_fields` using `icontains`. The global
+    search box of datatables is handled by `LazyCountDatatablesFilterBackend`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the records that match the search value of the request, if any."""
+        search_fields = self.get_search_fields(view, request)
+        if not is_full_text_searchable(queryset.model, search_fields or ()):
+            return super().filter_queryset(request, queryset, view)
+        value = get_param(request, self.search_param)
+        return search(queryset, value) if value else queryset
+
+
+class LazyCountDatatablesFilterBackend(DatatablesFilterBackend):
+    """Datatables filter backend that leaves counting to paginators that count lazily.
+
+    The stock backend counts the whole listing, up to three times, on every
+    datatables request. Views whose paginator has a truthy `counts_lazily`
+    attribute, e.g. `KeysetPagination`, compute their own, possibly
+    estimated, counts so this backend only searches and orders their
+    querysets.
+
+    Views that support full-text search are searched through their search
+    vector, rather than per column, before any counting so that the number
+    of filtered records reflects the search.
+    """
+
+    datatables_search_param = "search[value]"
+
+    def parse_datatables_query(self, request, view):
+        """Drop the global search value of views that support full-text search."""
+        datatables_query = super().parse_datatables_query(request, view)
+        search_fields = getattr(view, "search_fields", None) or ()
+        if is_full_text_searchable(view.get_queryset().model, search_fields):
+            datatables_query["search_value"] = None
+        return datatables_query
+
+    def search_full_text(self, request, queryset, view):
+        """Search views that support full-text search using the global search value."""
+        search_fields = getattr(view, "search_fields", None) or ()
+        value = get_param(request, self.datatables_search_param)
+        if value and is_full_text_searchable(queryset.model, search_fields):
+            queryset = search(queryset, value)
+        return queryset
+
+    def filter_queryset(self, request, queryset, view):
+        """Search and order the queryset, counting it only if the view's paginator won't."""
+        if not self.check_renderer_format(request):
+            return queryset
+
+        queryset = self.search_full_text(request, queryset, view)
+        paginator = getattr(view, "paginator", None)
+        if not getattr(paginator, "counts_lazily", False):
+            return super().filter_queryset(request, queryset, view)
+
+        datatables_query = self.parse_datatables_query(request, view)
+        q = self.get_q(datatables_query)
+        if q:
+            queryset = queryset.filter(q).distinct()
+        ordering = self.get_ordering(request, view, datatables_query["fields"])
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
@@ -1,14 +1,92 @@
 from crispy_forms.layout import Field, Fieldset, Layout
-from django.forms import MultipleChoiceField, TextInput
+from django.db.models import BLANK_CHOICE_DASH
+from django.forms import ChoiceField, MultipleChoiceField, TextInput, TypedChoiceField
+from django.urls import reverse_lazy
 
 from ..dashboard import get_fahari_facilities_queryset
 from ..models import Facility, FacilityAttachment, Organisation, System, UserFacilityAllotment
 from ..utils import get_constituencies, get_counties, get_sub_counties, get_wards
-from ..widgets import MultiSearchableComboBox, SearchableComboBox
+from ..widgets import (
+    MultiSearchableComboBox,
+    RemoteMultiSearchableComboBox,
+    RemoteSearchableComboBox,
+    SearchableComboBox,
+)
 from .base_forms import BaseModelForm
 
+_ADMINISTRATIVE_UNIT_FIELDS = frozenset(
+    {
+        "constituencies",
+        "constituency",
+        "counties",
+        "county",
+        "sub_counties",
+        "sub_county",
+        "ward",
+        "wards",
+    }
+)
+
+
+def _administrative_units_formfield_callback(model_field, **kwargs):
+    """Return the default form field of the given model field.
+
+    No form fields are returned for the administrative unit model fields as
+    building them loads all of their choices. The forms using this callback
+    declare their own administrative unit fields instead.
+    """
+
+    if model_field.name in _ADMINISTRATIVE_UNIT_FIELDS:
+        return None
+    return model_field.formfield(**kwargs)
+
+
+def _get_administrative_units_url(unit_type: str) -> str:
+    """Return the url from which the given type of administrative units can be loaded."""
+
+    return reverse_lazy("common:administrative_units", kwargs={"unit_type": unit_type})
+
+
+def _with_blank_choice(load_choices):
+    """Return a choices loader that prepends the blank choice to the given loader's choices."""
+
+    def load_choices_with_blank():
+        return [*BLANK_CHOICE_DASH, *load_choices()]
+
+    return load_choices_with_blank
+
 
 class FacilityForm(BaseModelForm):
+    # The administrative unit fields are declared here so that their choices
+    # are only loaded when the form is used. The sub-county, constituency and
+    # ward choices are loaded on demand by the selected county or sub-county.
+    formfield_callback = _administrative_units_formfield_callback
+    county = ChoiceField(choices=_with_blank_choice(get_counties))
+    sub_county = TypedChoiceField(
+        choices=_with_blank_choice(get_sub_counties),
+        empty_value=None,
+        required=False,
+        widget=RemoteSearchableComboBox(
+            choices_url=_get_administrative_units_url("sub_counties"), parent_field="county"
+        ),
+    )
+    constituency = TypedChoiceField(
+        choices=_with_blank_choice(get_constituencies),
+        empty_value=None,
+        required=False,
+        widget=RemoteSearchableComboBox(
+            choices_url=_get_administrative_units_url("constituencies"), parent_field="county"
+        ),
+    )
+    ward = TypedChoiceField(
+        choices=_with_blank_choice(get_wards),
+        empty_value=None,
+        required=False,
+        widget=RemoteSearchableComboBox(
+            choices_url=_get_administrative_units_url("wards"), parent_field="sub_county"
+        ),
+    )
+
     field_order = (
         "name",
         "mfl_code",
@@ -84,43 +162,51 @@ class OrganisationForm(BaseModelForm):
 class FacilityAttachmentForm(BaseModelForm):
     class Meta:
         model = FacilityAttachment
-        fields = "__all__"
+        # The size and aspect ratio are recorded while validating the file
+        exclude = ("aspect_ratio", "size")
         widgets = {"facility": SearchableComboBox()}
 
 
 class UserFacilityAllotmentForm(BaseModelForm):
+    formfield_callback = _administrative_units_formfield_callback
     counties = MultipleChoiceField(
-        choices=get_counties(),
+        choices=get_counties,
         help_text=(
             "All the facilities in the selected counties will be allocated to the selected user."
         ),
         required=False,
     )
     constituencies = MultipleChoiceField(
-        choices=get_constituencies(),
+        choices=get_constituencies,
         help_text=(
             "All the facilities in the selected constituencies will be allocated to the selected "
             "user."
         ),
         required=False,
-        widget=MultiSearchableComboBox,
+        widget=RemoteMultiSearchableComboBox(
+            choices_url=_get_administrative_units_url("constituencies"), parent_field="counties"
+        ),
     )
     sub_counties = MultipleChoiceField(
-        choices=get_sub_counties(),
+        choices=get_sub_counties,
         help_text=(
             "All the facilities in the selected sub counties will be allocated to the selected "
             "user."
         ),
         required=False,
-        widget=MultiSearchableComboBox,
+        widget=RemoteMultiSearchableComboBox(
+            choices_url=_get_administrative_units_url("sub_counties"), parent_field="counties"
+        ),
     )
     wards = MultipleChoiceField(
-        choices=get_wards(),
+        choices=get_wards,
         help_text=(
             "All the facilities in the selected wards will be allocated to the selected user."
         ),
         required=False,
-        widget=MultiSearchableComboBox,
+        widget=RemoteMultiSearchableComboBox(
+            choices_url=_get_administrative_units_url("wards"), parent_field="sub_counties"
+        ),
     )
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,125 @@
+"""Compare the throughput of the sync and async read endpoints under load.
+
+Each pair of endpoints is loaded, in process, through Django's ASGI handler,
+the way the app is served in production, with the given number of
+concurrent clients authenticated as the given user. The sync endpoints are
+run on Django's sync thread, the async ones from the read pool, see
+`fahari.common.read_pool`. The benchmark only reads, so it can be run
+against a copy of the production data.
+"""
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient
+from django.urls import reverse
+
+DEFAULT_CONCURRENCY = 32
+
+DEFAULT_REQUESTS = 500
+
+ENDPOINTS = (
+    ("facility lookups", "api:facility-list", "api:async-facility-list"),
+    ("dashboard metrics", "api:dashboard-metrics", "api:async-dashboard-metrics"),
+    (
+        "questionnaire responses",
+        "api:questionnaireresponses-list",
+        "api:async-questionnaireresponses-list",
+    ),
+)
+
+
+class LoadResult(NamedTuple):
+    """A summary of the responses to a load of requests to an endpoint."""
+
+    throughput: float
+    median_latency: float
+    p95_latency: float
+    failures: int
+
+
+async def load(client: AsyncClient, url: str, concurrency: int, requests: int) -> LoadResult:
+    """Make the given number of requests to the given URL from concurrent clients.
+
+    :return: The throughput, in requests per second, the median and 95th
+             percentile latencies, in milliseconds, and the number of
+             responses other than 200s.
+    """
+
+    pending = iter(range(requests))
+    latencies = []
+    statuses: Counter = Counter()
+
+    async def run_client():
+        for _ in pending:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    # The test client leaves the connection of Django's sync thread open
+    await sync_to_async(connections.close_all)()
+    return LoadResult(
+        throughput=requests / elapsed,
+        median_latency=statistics.median(latencies),
+        p95_latency=statistics.quantiles(latencies, n=20)[-1] if requests > 1 else latencies[0],
+        failures=requests - statuses[200],
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare the throughput of the sync and async read endpoints under load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="The user that the requests are authenticated as.")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help="The number of clients making requests at the same time.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help="The number of requests made to each endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError('The user "%s" does not exist.' % options["username"])
+
+        client = AsyncClient(raise_request_exception=False)
+        client.force_login(user)
+        concurrency, requests = options["concurrency"], options["requests"]
+        self.stdout.write(
+            "Making %d requests to each endpoint from %d concurrent clients, the read pool "
+            "has %d threads." % (requests, concurrency, settings.ASYNC_READ_WORKERS)
+        )
+        for label, sync_url, async_url in ENDPOINTS:
+            sync = asyncio.run(load(client, reverse(sync_url), concurrency, requests))
+            async_ = asyncio.run(load(client, reverse(async_url), concurrency, requests))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: {sync.throughput:.1f} requests/s sync, "
+                    f"{async_.throughput:.1f} requests/s async "
+                    f"({async_.throughput / sync.throughput:.2f}x)."
+                )
+            )
+            for name, result in (("sync", sync), ("async", async_)):
+                self.stdout.write(
+                    f"  {name}: median latency {result.median_latency:.1f}ms, "
+                    f"p95 latency {result.p95_latency:.1f}ms, {result.failures} failures."
+                )
@@ -0,0 +1,320 @@
+"""Benchmark the hot query shapes with and without the query index suite.
+
+Realistic volumes of data are seeded into a handful of new organisations,
+every hot query shape is then timed and explained with the index suite in
+place and again with it dropped. Everything, including the seeded data and
+the dropped indexes, is rolled back once the benchmark completes.
+"""
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from fahari.common.models import Facility, Organisation, System
+from fahari.ops.models import DailyUpdate, FacilitySystem, FacilitySystemTicket
+from fahari.sims.models import (
+    Question,
+    QuestionAnswer,
+    QuestionGroup,
+    Questionnaire,
+    QuestionnaireResponses,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+DEFAULT_ORGANISATIONS = 4
+
+DEFAULT_REPEAT = 5
+
+DEFAULT_SCALE = 10
+
+DAILY_UPDATE_DAYS = 60
+
+QUESTION_GROUPS_PER_QUESTIONNAIRE = 4
+
+QUESTIONS_PER_QUESTION_GROUP = 10
+
+TICKETS_PER_FACILITY = 10
+
+INDEX_SUITE = (
+    (Facility, "common_facility_org_recent_idx"),
+    (DailyUpdate, "ops_dailyupdate_org_date_idx"),
+    (FacilitySystemTicket, "ops_ticket_open_org_idx"),
+    (Question, "sims_question_group_prec_idx"),
+    (QuestionAnswer, "sims_answer_response_valid_idx"),
+    (QuestionnaireResponses, "sims_responses_org_recent_idx"),
+)
+
+
+class Sample(NamedTuple):
+    """The seeded records that the query shapes are parameterized with."""
+
+    organisation: Organisation
+    question_group: QuestionGroup
+    responses: QuestionnaireResponses
+
+
+def _recent_facilities(sample: Sample) -> QuerySet:
+    return Facility.objects.filter(active=True, organisation=sample.organisation).order_by(
+        "-updated", "-created"
+    )[:25]
+
+
+def _daily_updates_month_to_date(sample: Sample) -> QuerySet:
+    today = timezone.localdate()
+    return DailyUpdate.objects.filter(
+        active=True,
+        date__year=today.year,
+        date__month=today.month,
+        organisation=sample.organisation,
+    ).values("total")
+
+
+def _open_tickets(sample: Sample) -> QuerySet:
+    return FacilitySystemTicket.objects.filter(
+        active=True, organisation=sample.organisation, resolved__isnull=True
+    ).values("pk")
+
+
+def _question_group_questions(sample: Sample) -> QuerySet:
+    return Question.objects.filter(question_group=sample.question_group).order_by("precedence")
+
+
+def _valid_answers_for_responses(sample: Sample) -> QuerySet:
+    return (
+        QuestionAnswer.objects.filter(questionnaire_response=sample.responses)
+        .valid()
+        .values("question")
+    )
+
+
+def _recent_questionnaire_responses(sample: Sample) -> QuerySet:
+    return QuestionnaireResponses.objects.filter(
+        active=True, organisation=sample.organisation
+    ).order_by("-updated", "-created")[:25]
+
+
+QUERY_SHAPES: Dict[str, Callable[[Sample], QuerySet]] = {
+    "common.facility: recent for organisation": _recent_facilities,
+    "ops.dailyupdate: organisation month to date": _daily_updates_month_to_date,
+    "ops.facilitysystemticket: open for organisation": _open_tickets,
+    "sims.question: question group by precedence": _question_group_questions,
+    "sims.questionanswer: valid for responses": _valid_answers_for_responses,
+    "sims.questionnaireresponses: recent for organisation": _recent_questionnaire_responses,
+}
+
+
+def seed(organisations: int, scale: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Sample:
+    """Seed realistic volumes of the records queried by the hot query shapes.
+
+    Each organisation gets `5 * scale` facilities, each with daily updates
+    for the last 60 days and 10 system tickets, one of which is open, and
+    `10 * scale` questionnaire responses, each answering a 40 question
+    questionnaire.
+
+    :return: Records of the first organisation to parameterize the query
+             shapes with.
+    """
+
+    now = timezone.now()
+    today = timezone.localdate()
+    run = uuid.uuid4().hex[:6]
+    next_code = (Organisation.objects.aggregate(code=Max("code"))["code"] or 0) + 1
+    next_mfl_code = (Facility.objects.aggregate(mfl_code=Max("mfl_code"))["mfl_code"] or 0) + 1
+
+    orgs = Organisation.objects.bulk_create(
+        Organisation(
+            code=next_code + index,
+            email_address="benchmark@example.com",
+            org_code="BM-%s-%d" % (run, index),
+            organisation_name="Benchmark Organisation %s %d" % (run, index),
+            phone_number="+254700000000",
+        )
+        for index in range(organisations)
+    )
+    (system,) = System.objects.bulk_create(
+        [System(description="-", name="Benchmark System %s" % run, organisation=orgs[0])]
+    )
+    facilities, questionnaires, question_groups, questions, responses = [], [], [], [], []
+    questions_by_questionnaire: Dict[uuid.UUID, List[Question]] = defaultdict(list)
+    for org_index, org in enumerate(orgs):
+        org_facilities = [
+            Facility(
+                county="Nairobi",
+                mfl_code=next_mfl_code + index,
+                name="Benchmark Facility %s %d" % (run, next_mfl_code + index),
+                organisation=org,
+                updated=now - timedelta(minutes=index),
+            )
+            for index in range(5 * scale)
+        ]
+        next_mfl_code += len(org_facilities)
+        facilities.extend(org_facilities)
+        questionnaire = Questionnaire(
+            name="Benchmark Questionnaire %s %d" % (run, org_index), organisation=org
+        )
+        questionnaires.append(questionnaire)
+        for group_index in range(QUESTION_GROUPS_PER_QUESTIONNAIRE):
+            question_group = QuestionGroup(
+                organisation=org,
+                precedence=group_index + 1,
+                questionnaire=questionnaire,
+                title="Benchmark Question Group %d" % group_index,
+            )
+            question_groups.append(question_group)
+            for question_index in range(QUESTIONS_PER_QUESTION_GROUP):
+                question = Question(
+                    answer_type=Question.AnswerTypes.YES_NO.value,
+                    organisation=org,
+                    precedence=question_index + 1,
+                    query="Benchmark question?",
+                    question_code="bm-%s-%d-%d-%d" % (run, org_index, group_index, question_index),
+                    question_group=question_group,
+                )
+                questions.append(question)
+                questions_by_questionnaire[questionnaire.pk].append(question)
+        responses.extend(
+            QuestionnaireResponses(
+                facility=org_facilities[index % len(org_facilities)],
+                organisation=org,
+                questionnaire=questionnaire,
+                updated=now - timedelta(minutes=index),
+            )
+            for index in range(10 * scale)
+        )
+
+    Facility.objects.bulk_create(facilities, batch_size=batch_size)
+    Questionnaire.objects.bulk_create(questionnaires, batch_size=batch_size)
+    QuestionGroup.objects.bulk_create(question_groups, batch_size=batch_size)
+    Question.objects.bulk_create(questions, batch_size=batch_size)
+    QuestionnaireResponses.objects.bulk_create(responses, batch_size=batch_size)
+    # Every tenth answer is invalid
+    QuestionAnswer.objects.bulk_create(
+        (
+            QuestionAnswer(
+                has_valid_response=bool(index % 10),
+                organisation=response.organisation,
+                question=question,
+                questionnaire_response=response,
+                response={"content": True if index % 10 else None},
+            )
+            for response in responses
+            for index, question in enumerate(questions_by_questionnaire[response.questionnaire_id])
+        ),
+        batch_size=batch_size,
+    )
+    DailyUpdate.objects.bulk_create(
+        (
+            DailyUpdate(
+                date=today - timedelta(days=days),
+                facility=facility,
+                organisation=facility.organisation,
+                total=days,
+            )
+            for facility in facilities
+            for days in range(DAILY_UPDATE_DAYS)
+        ),
+        batch_size=batch_size,
+    )
+    facility_systems = FacilitySystem.objects.bulk_create(
+        (
+            FacilitySystem(
+                facility=facility, organisation=facility.organisation, system=system, version="1"
+            )
+            for facility in facilities
+        ),
+        batch_size=batch_size,
+    )
+    FacilitySystemTicket.objects.bulk_create(
+        (
+            FacilitySystemTicket(
+                details="Benchmark ticket",
+                facility_system=facility_system,
+                organisation=facility_system.organisation,
+                raised_by="benchmark",
+                resolved=now if index else None,
+                resolved_by="benchmark" if index else None,
+            )
+            for facility_system in facility_systems
+            for index in range(TICKETS_PER_FACILITY)
+        ),
+        batch_size=batch_size,
+    )
+
+    return Sample(organisation=orgs[0], question_group=question_groups[0], responses=responses[0])
+
+
+def measure(queryset: QuerySet, repeat: int) -> Tuple[float, str]:
+    """Return the median latency, in milliseconds, and the analyzed plan of a query."""
+
+    list(queryset.all())  # Warm up the caches
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), queryset.explain(analyze=True)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the hot query shapes with and without the query index suite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organisations",
+            type=int,
+            default=DEFAULT_ORGANISATIONS,
+            help="The number of organisations to seed data for.",
+        )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=DEFAULT_SCALE,
+            help="Multiplies the number of facilities and responses seeded per organisation.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=DEFAULT_REPEAT,
+            help="The number of times to run each query, the median latency is reported.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            start = time.perf_counter()
+            sample = seed(options["organisations"], options["scale"])
+            with connection.cursor() as cursor:
+                for model, _ in INDEX_SUITE:
+                    cursor.execute("ANALYZE %s" % connection.ops.quote_name(model._meta.db_table))
+            seeded = time.perf_counter()
+            self.stdout.write("Seeded the benchmark data in %.2fs." % (seeded - start))
+
+            after = self.run_query_shapes(sample, options["repeat"])
+            with connection.schema_editor() as schema_editor:
+                for model, index_name in INDEX_SUITE:
+                    (index,) = (i for i in model._meta.indexes if i.name == index_name)
+                    schema_editor.remove_index(model, index)
+            before = self.run_query_shapes(sample, options["repeat"])
+            transaction.set_rollback(True)
+
+        for label in QUERY_SHAPES:
+            before_latency, before_plan = before[label]
+            after_latency, after_plan = after[label]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: {before_latency:.2f}ms without the index suite, "
+                    f"{after_latency:.2f}ms with it."
+                )
+            )
+            self.stdout.write(f"Plan without the index suite:\n{before_plan}")
+            self.stdout.write(f"Plan with the index suite:\n{after_plan}\n")
+
+    def run_query_shapes(self, sample: Sample, repeat: int) -> Dict[str, Tuple[float, str]]:
+        return {label: measure(shape(sample), repeat) for label, shape in QUERY_SHAPES.items()}
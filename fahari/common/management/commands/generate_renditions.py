@@ -0,0 +1,65 @@
+"""Generate the thumbnail and web sized renditions of uploaded images."""
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from fahari.common.renditions import DEFAULT_BATCH_SIZE, generate_renditions, queue_renditions
+
+DEFAULT_INTERVAL = 10  # seconds
+
+
+class Command(BaseCommand):
+    help = "Generate the renditions of the queued images, once or continuously with --loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of images to process per transaction.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep generating renditions as images are uploaded, until interrupted.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help="The number of seconds to wait for new images when the queue is empty.",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="First queue the images that were uploaded before renditions were introduced.",
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            queued = 0
+            for model in apps.get_models():
+                for field_name in getattr(model, "rendition_fields", ()):
+                    sources = model._base_manager.exclude(**{field_name: ""}).values_list(
+                        field_name, flat=True
+                    )
+                    queued += queue_renditions(sources.iterator())
+            self.stdout.write(f"Queued {queued} existing images.")
+
+        try:
+            while True:
+                result = generate_renditions(options["batch_size"])
+                if any(result):
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Processed a batch of images: {result.ready} ready, "
+                            f"{result.retrying} to be retried, {result.failed} failed."
+                        )
+                    )
+                if not options["loop"]:
+                    break
+                if sum(result) < options["batch_size"]:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped generating renditions.")
@@ -0,0 +1,254 @@
+"""Load facilities from a Kenya Master Health Facilities List (MFL) workbook."""
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from fahari.common.models import Facility, Organisation
+from fahari.common.search import update_search_vectors
+from fahari.users.models import User, default_organisation
+
+DEFAULT_BATCH_SIZE = 500
+
+DEFAULT_SOURCE = settings.ROOT_DIR / "data" / "all_mfl_facilities.xlsx"
+
+
+def _to_bool(value: Any) -> bool:
+    return value == "Yes"
+
+
+def _to_int(value: Any) -> int:
+    return int(value or 0)
+
+
+def _to_optional_str(value: Any) -> Optional[str]:
+    return None if value in (None, "", "None") else str(value)
+
+
+# A mapping of facility fields to the workbook column they are read from and
+# the function used to convert the workbook value to the field's value.
+FACILITY_COLUMNS: Mapping[str, Tuple[str, Callable[[Any], Any]]] = {
+    "name": ("Name", str),
+    "registration_number": ("Registration_number", _to_optional_str),
+    "keph_level": ("Keph level", _to_optional_str),
+    "facility_type": ("Facility type", _to_optional_str),
+    "facility_type_category": ("Facility_type_category", _to_optional_str),
+    "facility_owner": ("Owner", _to_optional_str),
+    "owner_type": ("Owner type", _to_optional_str),
+    "regulatory_body": ("Regulatory body", _to_optional_str),
+    "beds": ("Beds", _to_int),
+    "cots": ("Cots", _to_int),
+    "county": ("County", str),
+    "constituency": ("Constituency", _to_optional_str),
+    "sub_county": ("Sub county", _to_optional_str),
+    "ward": ("Ward", _to_optional_str),
+    "operation_status": ("Operation status", str),
+    "open_whole_day": ("Open_whole_day", _to_bool),
+    "open_public_holidays": ("Open_public_holidays", _to_bool),
+    "open_weekends": ("Open_weekends", _to_bool),
+    "open_late_night": ("Open_late_night", _to_bool),
+    "approved": ("Approved", _to_bool),
+    "public_visible": ("Public visible", _to_bool),
+    "closed": ("Closed", _to_bool),
+}
+
+
+class FacilitiesLoadResult(NamedTuple):
+    """A summary of the changes made when loading facilities."""
+
+    created: int
+    updated: int
+    unchanged: int
+    invalid: Dict[int, List[str]]
+
+
+def iter_workbook_records(source_path) -> Iterator[Dict[str, Any]]:
+    """Stream the records in the active worksheet of the given workbook.
+
+    The first row of the worksheet is treated as the header and each of the
+    remaining rows is yielded as a mapping of column names to values.
+    """
+    workbook = load_workbook(source_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        for row in rows:
+            yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def get_facility_values(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert a workbook record to a mapping of facility fields to values."""
+    return {
+        field: convert(record.get(column)) for field, (column, convert) in FACILITY_COLUMNS.items()
+    }
+
+
+def validate_facility(facility: Facility) -> None:
+    """Run the facility field and model validators.
+
+    Unlike `Facility.full_clean()`, this doesn't hit the database. Uniqueness
+    is checked by the loader and the organisation is known to exist.
+    """
+    facility.clean_fields(exclude=("organisation",))
+    facility.clean()
+
+
+def load_facility_records(
+    records: Iterable[Mapping[str, Any]],
+    organisation: Organisation,
+    user_pk=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> FacilitiesLoadResult:
+    """Create new facilities and update the changed ones from the given MFL records.
+
+    The existing facilities are loaded in a single query and compared with
+    the given records in memory. New facilities are then inserted, and the
+    changed ones updated, in batches of `batch_size`.
+
+    :param records: The MFL workbook records to load.
+    :param organisation: The organisation that new facilities belong to.
+    :param user_pk: The pk of the user performing the load.
+    :param batch_size: The maximum number of facilities to write per query.
+
+    :return: A summary of the changes made.
+    """
+
+    values_by_mfl_code: Dict[int, Dict[str, Any]] = {}
+    for record in records:
+        if record.get("Code") in (None, "", "None"):
+            continue
+        values_by_mfl_code[int(record["Code"])] = get_facility_values(record)
+
+    existing = Facility.objects.in_bulk(values_by_mfl_code.keys(), field_name="mfl_code")
+    names = {facility.name: mfl_code for mfl_code, facility in existing.items()}
+    names.update(
+        Facility.objects.filter(name__in=[v["name"] for v in values_by_mfl_code.values()])
+        .exclude(mfl_code__in=values_by_mfl_code.keys())
+        .values_list("name", "mfl_code")
+    )
+
+    now = timezone.now()
+    to_create: List[Facility] = []
+    to_update: List[Facility] = []
+    updated_fields = {"updated", "updated_by"}
+    unchanged = 0
+    invalid: Dict[int, List[str]] = {}
+    for mfl_code, values in values_by_mfl_code.items():
+        facility = existing.get(mfl_code)
+        if facility is not None:
+            changed = {f: v for f, v in values.items() if getattr(facility, f) != v}
+            if not changed:
+                unchanged += 1
+                continue
+        else:
+            facility = Facility(
+                mfl_code=mfl_code,
+                organisation=organisation,
+                created=now,
+                created_by=user_pk,
+                **values,
+            )
+            changed = values
+
+        if names.setdefault(values["name"], mfl_code) != mfl_code:
+            invalid[mfl_code] = ['A facility named "%s" already exists.' % values["name"]]
+            continue
+        for field, value in changed.items():
+            setattr(facility, field, value)
+        facility.updated = now
+        facility.updated_by = user_pk
+        try:
+            validate_facility(facility)
+        except ValidationError as error:
+            invalid[mfl_code] = error.messages
+            continue
+
+        if mfl_code in existing:
+            to_update.append(facility)
+            updated_fields.update(changed)
+        else:
+            to_create.append(facility)
+
+    with transaction.atomic():
+        Facility.objects.bulk_create(to_create, batch_size=batch_size)
+        Facility.objects.bulk_update(to_update, sorted(updated_fields), batch_size=batch_size)
+        update_search_vectors(
+            Facility.objects.filter(
+                mfl_code__in=[facility.mfl_code for facility in to_create + to_update]
+            )
+        )
+
+    return FacilitiesLoadResult(len(to_create), len(to_update), unchanged, invalid)
+
+
+class Command(BaseCommand):
+    help = "Create or update facilities from a Kenya Master Health Facilities List workbook."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source",
+            nargs="?",
+            default=str(DEFAULT_SOURCE),
+            help="The path of the MFL workbook to load.",
+        )
+        parser.add_argument(
+            "--organisation",
+            help="The id of the organisation that new facilities belong to.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of facilities to write per query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            organisation = Organisation.objects.get(
+                pk=options["organisation"] or default_organisation()
+            )
+        except (Organisation.DoesNotExist, ValidationError):
+            raise CommandError("The given organisation does not exist.")
+        user = User.objects.filter(is_staff=True).order_by("date_joined").first()
+
+        start = time.perf_counter()
+        try:
+            result = load_facility_records(
+                iter_workbook_records(options["source"]),
+                organisation,
+                user_pk=user.pk if user else None,
+                batch_size=options["batch_size"],
+            )
+        except FileNotFoundError:
+            raise CommandError('The workbook "%s" does not exist.' % options["source"])
+        elapsed = time.perf_counter() - start
+
+        for mfl_code, errors in result.invalid.items():
+            self.stderr.write(f"Skipped facility {mfl_code}: {'; '.join(errors)}")
+        total = result.created + result.updated + result.unchanged + len(result.invalid)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {total} facilities in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} facilities/s): "
+                f"{result.created} created, {result.updated} updated, "
+                f"{result.unchanged} unchanged, {len(result.invalid)} skipped."
+            )
+        )
@@ -0,0 +1,48 @@
+"""Delete the chunked uploads that were abandoned, whether they were completed or not."""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from fahari.common.uploads import purge_stale_uploads
+
+DEFAULT_INTERVAL = 60 * 60  # seconds
+
+DEFAULT_MAX_AGE = 48  # hours
+
+
+class Command(BaseCommand):
+    help = "Delete the abandoned chunked uploads and their files, once or hourly with --loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            default=DEFAULT_MAX_AGE,
+            help=(
+                "The number of hours after its last part, or after its completion if no record "
+                "uses its file, that an upload is considered abandoned."
+            ),
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep deleting abandoned uploads periodically, until interrupted.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help="The number of seconds to wait between purges.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                count = purge_stale_uploads(timedelta(hours=options["max_age"]))
+                self.stdout.write(self.style.SUCCESS(f"Deleted {count} stale uploads."))
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped deleting stale uploads.")
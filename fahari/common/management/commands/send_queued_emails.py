@@ -0,0 +1,49 @@
+"""Deliver the emails queued in the outbox."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from fahari.common.outbox import DEFAULT_BATCH_SIZE, deliver_queued_emails
+
+DEFAULT_INTERVAL = 5  # seconds
+
+
+class Command(BaseCommand):
+    help = "Deliver the emails queued in the outbox, once or continuously with --loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of emails to deliver per connection to the mail provider.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep delivering emails as they are queued, until interrupted.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help="The number of seconds to wait for new emails when the outbox is empty.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                result = deliver_queued_emails(options["batch_size"])
+                if any(result):
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Delivered a batch of emails: {result.sent} sent, "
+                            f"{result.retrying} to be retried, {result.failed} failed."
+                        )
+                    )
+                if not options["loop"]:
+                    break
+                if sum(result) < options["batch_size"]:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped delivering emails.")
@@ -0,0 +1,78 @@
+"""Sync facility coordinates from the Kenya Master Health Facilities List (MFL) API."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from requests import RequestException
+
+from fahari.common.models import Facility
+from fahari.common.utils import get_mfl_transport, iter_mfl_records
+
+DEFAULT_BATCH_SIZE = 1000
+
+DEFAULT_PAGE_SIZE = 500
+
+DEFAULT_WORKERS = 8
+
+
+class Command(BaseCommand):
+    help = "Update the coordinates of facilities from the Kenya Master Health Facilities List API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="The MFL API url to fetch facilities from. Defaults to the configured url.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="The maximum number of pages to fetch concurrently.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=DEFAULT_PAGE_SIZE,
+            help="The number of facilities to fetch per page.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of facilities to update per query.",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Only update facilities whose coordinates are not known yet.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        transport = get_mfl_transport(
+            url=options["url"], pool_size=options["workers"], page_size=options["page_size"]
+        )
+        try:
+            coordinates = {
+                record["code"]: (record["lat"], record["long"])
+                for record in iter_mfl_records(transport, max_workers=options["workers"])
+                if None not in (record["code"], record["lat"], record["long"])
+            }
+        except RequestException as exp:
+            raise CommandError("Unable to fetch the facilities from the MFL API: %s" % exp)
+        finally:
+            transport.close()
+        fetched = time.perf_counter()
+
+        facilities = Facility.objects.all()
+        if options["only_missing"]:
+            facilities = facilities.filter(lat=0.0, lon=0.0)
+        updated = facilities.bulk_update_coordinates(coordinates, batch_size=options["batch_size"])
+        done = time.perf_counter()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fetched the coordinates of {len(coordinates)} facilities "
+                f"in {fetched - start:.2f}s and updated {updated} facilities "
+                f"in {done - fetched:.2f}s."
+            )
+        )
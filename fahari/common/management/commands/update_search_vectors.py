@@ -0,0 +1,28 @@
+"""Recompute the full-text search vectors of all the models that support full-text search."""
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from fahari.common.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the full-text search vectors of all the models that support full-text "
+        "search, e.g. after records were bulk loaded or related records were renamed."
+    )
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not getattr(model, "search_vector_fields", None):
+                continue
+            start = time.perf_counter()
+            updated = update_search_vectors(model._base_manager.all())
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Updated the search vectors of {updated} {model._meta.verbose_name_plural} "
+                    f"in {elapsed:.2f}s."
+                )
+            )
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.6 on 2022-01-24 09:12
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+BACKFILL_FACILITY_LOCATION_SQL = """
+UPDATE common_facility
+SET location = ST_SetSRID(ST_MakePoint(lon, lat), 4326)::geography
+WHERE lat IS NOT NULL AND lon IS NOT NULL AND NOT (lat = 0.0 AND lon = 0.0);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0024_auto_20210919_1704"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="facility",
+            name="location",
+            field=django.contrib.gis.db.models.fields.PointField(
+                blank=True,
+                editable=False,
+                geography=True,
+                help_text="The facility's location. This is derived from the lat and lon values.",
+                null=True,
+                srid=4326,
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_FACILITY_LOCATION_SQL, migrations.RunSQL.noop),
+    ]
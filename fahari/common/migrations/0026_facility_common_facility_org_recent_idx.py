@@ -0,0 +1,17 @@
+# Generated by Django 3.2.9 on 2022-01-27 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0025_facility_location'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facility',
+            index=models.Index(condition=models.Q(('active', True)), fields=['organisation', '-updated', '-created'], name='common_facility_org_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.9 on 2022-01-28 10:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def backfill_search_vector(apps, schema_editor):
+    Facility = apps.get_model('common', 'Facility')
+    Facility.objects.update(
+        search_vector=(
+            SearchVector('name', config='simple', weight='A')
+            + SearchVector('mfl_code', config='simple', weight='A')
+            + SearchVector('registration_number', config='simple', weight='B')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0026_facility_common_facility_org_recent_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='facility',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='facility',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='common_facility_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facility',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='common_facility_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.9 on 2022-02-07 11:18
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0028_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('active', models.BooleanField(default=True)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.UUIDField(blank=True, null=True)),
+                ('updated', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_by', models.UUIDField(blank=True, null=True)),
+                ('source', models.TextField(help_text='The storage name of the original image.', unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('renditions', models.JSONField(blank=True, default=dict, help_text='The storage names of the renditions, by rendition.')),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ('-updated', '-created'),
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='imagerendition',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created'], name='common_rendition_pending_idx'),
+        ),
+    ]
@@ -14,6 +14,9 @@ from .organisation_models import (
     OrganisationAbstractBase,
     OrganisationSequenceGenerator,
 )
+from .outbox_models import OutboundEmail
+from .rendition_models import ImageRendition
+from .upload_models import ChunkedUpload
 from .utils import get_directory, is_image_type, unique_list
 
 __all__ = [
@@ -21,11 +24,14 @@ __all__ = [
     "AbstractBaseManager",
     "AbstractBaseQuerySet",
     "Attachment",
+    "ChunkedUpload",
     "Facility",
     "FacilityAttachment",
+    "ImageRendition",
     "Organisation",
     "OrganisationAbstractBase",
     "OrganisationSequenceGenerator",
+    "OutboundEmail",
     "OwnerlessAbstractBase",
     "OwnerlessAbstractBaseManager",
     "OwnerlessAbstractBaseQuerySet",
@@ -2,17 +2,26 @@ import logging
 import uuid
 from collections import defaultdict
 from fractions import Fraction
-from typing import List, Tuple, TypeVar
+from typing import Dict, List, Optional, Tuple, TypeVar
 
 from django.conf import settings
 from django.contrib.gis.db import models
 from django.core.exceptions import ValidationError
+from django.core.files.images import get_image_dimensions
 from django.db.models.base import ModelBase
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
 
+from ..broadcasts import (
+    ACTION_CREATED,
+    ACTION_DELETED,
+    ACTION_UPDATED,
+    get_change_event,
+    publish_change_event,
+)
 from ..constants import CONTENT_TYPES
+from ..renditions import queue_renditions
+from ..search import update_search_vectors
 from .organisation_models import Organisation
 from .utils import get_directory, is_image_type, unique_list
 
@@ -125,6 +134,15 @@ class OwnerlessAbstractBase(models.Model, metaclass=ValidationMetaclass):
 
     model_validators = ["validate_updated_date_greater_than_created"]
 
+    # The lookups, and their weights, that make up the `search_vector` of
+    # models that support full-text search, see `fahari.common.search`.
+    search_vector_fields: Dict[str, str] = {}
+    trigram_search_fields: Tuple[str, ...] = ()
+
+    # The file fields holding images that get thumbnail and web sized
+    # renditions, see `fahari.common.renditions`.
+    rendition_fields: Tuple[str, ...] = ()
+
     def _raise_errors(self, errors):
         if errors:
             raise ValidationError(errors)
@@ -180,7 +198,17 @@ class OwnerlessAbstractBase(models.Model, metaclass=ValidationMetaclass):
         self.updated = timezone.now() if self.updated is None else self.updated
         self.preserve_created_and_created_by()
         self.full_clean()
+        # Files that are not yet committed to the storage are new uploads
+        uploaded_fields = [
+            field_name
+            for field_name in self.rendition_fields
+            if getattr(self, field_name) and not getattr(self, field_name)._committed
+        ]
         super().save(*args, **kwargs)
+        if self.search_vector_fields:
+            update_search_vectors(self.__class__._base_manager.filter(pk=self.pk))
+        if uploaded_fields:
+            queue_renditions(getattr(self, field_name).name for field_name in uploaded_fields)
 
     class Meta:
         """Define a sensible default ordering."""
@@ -208,6 +236,10 @@ class AbstractBase(OwnerlessAbstractBase):
         "validate_updated_date_greater_than_created",
     ]
 
+    # The lookup of the facility of models whose changes are broadcast as live
+    # updates to their organisation, see `fahari.common.broadcasts`.
+    broadcast_facility_lookup: Optional[str] = None
+
     @property
     def owner(self):
         """Return the record's owner."""
@@ -226,6 +258,24 @@ class AbstractBase(OwnerlessAbstractBase):
                     LOGGER.error(f"{field} has an inconsistent org")
                     raise ValidationError({"organisation": _(error_msg)})
 
+    def save(self, *args, **kwargs):
+        """Broadcast the change of the record, if its model is broadcast."""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if self.broadcast_facility_lookup:
+            action = ACTION_CREATED if adding else ACTION_UPDATED
+            publish_change_event(self.organisation_id, get_change_event(self, action))
+
+    def delete(self, *args, **kwargs):
+        """Broadcast the deletion of the record, if its model is broadcast."""
+        if not self.broadcast_facility_lookup:
+            return super().delete(*args, **kwargs)
+        # Describe the record while it still has its pk
+        event = get_change_event(self, ACTION_DELETED)
+        deleted = super().delete(*args, **kwargs)
+        publish_change_event(self.organisation_id, event)
+        return deleted
+
     class Meta(OwnerlessAbstractBase.Meta):
         """Define a sensible default ordering."""
 
@@ -246,16 +296,42 @@ class Attachment(AbstractBase):
     aspect_ratio = models.CharField(max_length=50, blank=True, null=True)
 
     model_validators = ["validate_image_size"]
+    rendition_fields = ("data",)
+
+    # Protected properties
+    _loaded_data_name: Optional[str] = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Extend the base implementation to also remember the name of the loaded file."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_data_name = instance.__dict__.get("data")
+        return instance
 
     def validate_image_size(self):
-        """Ensure that the supplied image size matches the actual file."""
+        """Ensure that the supplied image's dimensions are within the allowed limits.
+
+        Only the image's header is read to get its dimensions and the size is
+        taken from the file's metadata. The size and aspect ratio of the image
+        are recorded. Files that haven't changed since this attachment was
+        loaded were validated when they were uploaded.
+        """
         if not is_image_type(self.content_type):
             return
+        if (
+            not self._state.adding
+            and self.data.name == self._loaded_data_name
+            and self.size is not None
+            and self.aspect_ratio
+        ):
+            return
 
-        image = Image.open(self.data)
-        self.size = len(image.fp.read())
+        width, height = get_image_dimensions(self.data)
+        if width is None or height is None:
+            raise ValidationError("The attachment is not a valid image.")
+        self.size = self.data.size
 
-        width, height = image.size
         msg_template = (
             "Your image has a {axis} of {actual_size} {extra_text} "
             "pixels which is larger than allowable dimension of "
@@ -291,6 +367,14 @@ class Attachment(AbstractBase):
         fraction_ratio = str(Fraction(float_ratio).limit_denominator())
         self.aspect_ratio = fraction_ratio.replace("/", ":")
 
+    def save(self, *args, **kwargs):
+        """Extend the base implementation to always save the recorded size and aspect ratio."""
+        if kwargs.get("update_fields") is not None:
+            # The size and aspect ratio are recorded while validating the file
+            kwargs["update_fields"] = {*kwargs["update_fields"], "aspect_ratio", "size"}
+        super().save(*args, **kwargs)
+        self._loaded_data_name = self.data.name
+
     def __str__(self):
         """Represent an attachment by its title."""
         return self.title
@@ -1,12 +1,21 @@
+from typing import Any, Mapping, Optional, Tuple
+
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models
+from django.contrib.gis.db.models.functions import Distance, GeometryDistance
+from django.contrib.gis.geos import Point, Polygon
+from django.contrib.gis.measure import D
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.urls import reverse
+from django.utils import timezone
 
 from ..constants import WHITELIST_COUNTIES
 from ..utils import (
+    LazyFieldChoices,
     get_constituencies,
     get_counties,
     get_sub_counties,
@@ -19,6 +28,9 @@ from .base_models import AbstractBase, AbstractBaseManager, AbstractBaseQuerySet
 
 User = get_user_model()
 
+Coordinates = Tuple[float, float]
+"""A (latitude, longitude) pair."""
+
 
 # =============================================================================
 # QUERYSETS
@@ -28,12 +40,90 @@ User = get_user_model()
 class FacilityQuerySet(AbstractBaseQuerySet):
     """Queryset for the Facility model."""
 
+    def annotate_with_distance(self, lat: float, lon: float):
+        """Annotate each facility with its `distance` from the given point.
+
+        The facilities are also ordered by their distance from the given point.
+        """
+        point = Facility.get_location_for_coordinates(lat, lon, allow_origin=True)
+        return self.annotate(distance=Distance("location", point)).order_by("distance")
+
+    def bulk_update_coordinates(
+        self,
+        coordinates: Mapping[int, Coordinates],
+        updated_by: Optional[Any] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """Update the coordinates of the facilities with the given MFL codes in bulk.
+
+        The facilities are loaded in a single query and only the facilities
+        whose coordinates have changed are written back to the database.
+
+        :param coordinates: A mapping of MFL codes to (latitude, longitude) pairs.
+        :param updated_by: The pk of the user performing the update.
+        :param batch_size: The maximum number of facilities to update per query.
+
+        :return: The number of facilities whose coordinates were updated.
+        """
+
+        now = timezone.now()
+        changed = []
+        for facility in self.filter(mfl_code__in=coordinates.keys()):
+            lat, lon = coordinates[facility.mfl_code]
+            if (facility.lat, facility.lon) == (lat, lon):
+                continue
+            facility.lat, facility.lon = lat, lon
+            facility.location = Facility.get_location_for_coordinates(lat, lon)
+            facility.updated = now
+            facility.updated_by = updated_by or facility.updated_by
+            changed.append(facility)
+
+        self.bulk_update(
+            changed, ("lat", "lon", "location", "updated", "updated_by"), batch_size=batch_size
+        )
+        return len(changed)
+
     def fahari_facilities(self):
         """Return all the facilities that are part of the FYJ program."""
         return self.active().filter(
             is_fahari_facility=True, operation_status="Operational", county__in=WHITELIST_COUNTIES
         )
 
+    def nearest(self, lat: float, lon: float, count: int):
+        """Return the `count` facilities nearest to the given point ordered by distance.
+
+        The nearest facilities are determined using an index assisted
+        K-nearest neighbour search and each facility is annotated with its
+        `distance` from the given point.
+        """
+        point = Facility.get_location_for_coordinates(lat, lon, allow_origin=True)
+        knn_ordering = GeometryDistance("location", point)
+        nearest_pks = (
+            self.filter(location__isnull=False).order_by(knn_ordering).values("pk")[:count]
+        )
+        return (
+            self.filter(pk__in=nearest_pks)
+            .annotate(distance=Distance("location", point))
+            .order_by(knn_ordering)
+        )
+
+    def within_bounding_box(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float):
+        """Return the facilities located within the given bounding box."""
+        bbox = Polygon.from_bbox((min_lon, min_lat, max_lon, max_lat))
+        bbox.srid = Facility.LOCATION_SRID
+        return self.filter(location__intersects=bbox)
+
+    def within_radius(self, lat: float, lon: float, radius_km: float):
+        """Return the facilities within `radius_km` kilometres of the given point.
+
+        The facilities are ordered by, and annotated with, their `distance`
+        from the given point.
+        """
+        point = Facility.get_location_for_coordinates(lat, lon, allow_origin=True)
+        return self.filter(location__dwithin=(point, D(km=radius_km))).annotate_with_distance(
+            lat, lon
+        )
+
 
 # =============================================================================
 # MANAGERS
@@ -43,6 +133,19 @@ class FacilityQuerySet(AbstractBaseQuerySet):
 class FacilityManager(AbstractBaseManager):
     """Manager for the UserFacilityAllotment model."""
 
+    def annotate_with_distance(self, lat: float, lon: float):
+        """Annotate each facility with its `distance` from the given point."""
+        return self.get_queryset().annotate_with_distance(lat, lon)
+
+    def bulk_update_coordinates(
+        self,
+        coordinates: Mapping[int, Coordinates],
+        updated_by: Optional[Any] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """Update the coordinates of the facilities with the given MFL codes in bulk."""
+        return self.get_queryset().bulk_update_coordinates(coordinates, updated_by, batch_size)
+
     def fahari_facilities(self):
         """Return all the facilities that are part of the FYJ program."""
         return self.get_queryset().fahari_facilities()
@@ -50,6 +153,18 @@ class FacilityManager(AbstractBaseManager):
     def get_queryset(self):
         return FacilityQuerySet(self.model, using=self.db)
 
+    def nearest(self, lat: float, lon: float, count: int):
+        """Return the `count` facilities nearest to the given point ordered by distance."""
+        return self.get_queryset().nearest(lat, lon, count)
+
+    def within_bounding_box(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float):
+        """Return the facilities located within the given bounding box."""
+        return self.get_queryset().within_bounding_box(min_lon, min_lat, max_lon, max_lat)
+
+    def within_radius(self, lat: float, lon: float, radius_km: float):
+        """Return the facilities within `radius_km` kilometres of the given point."""
+        return self.get_queryset().within_radius(lat, lon, radius_km)
+
 
 # =============================================================================
 # MODELS
@@ -139,12 +254,16 @@ class Facility(AbstractBase):
 
     name = models.TextField(unique=True)
     mfl_code = models.IntegerField(unique=True, help_text="MFL Code")
-    county = models.CharField(max_length=64, choices=get_counties())
-    sub_county = models.CharField(max_length=64, null=True, blank=True, choices=get_sub_counties())
+    county = models.CharField(max_length=64, choices=LazyFieldChoices(get_counties))
+    sub_county = models.CharField(
+        max_length=64, null=True, blank=True, choices=LazyFieldChoices(get_sub_counties)
+    )
     constituency = models.CharField(
-        max_length=64, null=True, blank=True, choices=get_constituencies()
+        max_length=64, null=True, blank=True, choices=LazyFieldChoices(get_constituencies)
+    )
+    ward = models.CharField(
+        max_length=64, null=True, blank=True, choices=LazyFieldChoices(get_wards)
     )
-    ward = models.CharField(max_length=64, null=True, blank=True, choices=get_wards())
     operation_status = models.CharField(max_length=24, default="Operational")
     registration_number = models.CharField(max_length=64, null=True, blank=True)
     keph_level = models.CharField(max_length=12, choices=KEPHLevels.choices, null=True, blank=True)
@@ -170,10 +289,24 @@ class Facility(AbstractBase):
     closed = models.BooleanField(default=False)
     lon = models.FloatField(default=0.0)
     lat = models.FloatField(default=0.0)
+    location = models.PointField(
+        geography=True,
+        srid=4326,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="The facility's location. This is derived from the lat and lon values.",
+    )
     is_fahari_facility = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = FacilityManager()
 
+    search_vector_fields = {"name": "A", "mfl_code": "A", "registration_number": "B"}
+    trigram_search_fields = ("name",)
+
+    LOCATION_SRID = 4326
+
     model_validators = [
         "check_facility_name_longer_than_three_characters",
         "check_constituency_belongs_to_selected_county",
@@ -185,6 +318,20 @@ class Facility(AbstractBase):
         update_url = reverse("common:facility_update", kwargs={"pk": self.pk})
         return update_url
 
+    @staticmethod
+    def get_location_for_coordinates(
+        lat: Optional[float], lon: Optional[float], allow_origin: bool = False
+    ) -> Optional[Point]:
+        """Return a point for the given coordinates.
+
+        Facilities whose coordinates are not known default to a lat and lon
+        of 0.0 and as such, `None` is returned for such coordinates unless
+        `allow_origin` is set.
+        """
+        if lat is None or lon is None or (lat == lon == 0.0 and not allow_origin):
+            return None
+        return Point(lon, lat, srid=Facility.LOCATION_SRID)
+
     def check_facility_name_longer_than_three_characters(self):
         if len(self.name) < 3:
             raise ValidationError("the facility name should exceed 3 characters")
@@ -227,11 +374,27 @@ class Facility(AbstractBase):
                 }
             )
 
+    def save(self, *args, **kwargs):
+        """Keep the location of this facility in sync with its coordinates."""
+        self.location = self.get_location_for_coordinates(self.lat, self.lon)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} - {self.mfl_code} ({self.county})"
 
     class Meta(AbstractBase.Meta):
         verbose_name_plural = "facilities"
+        indexes = [
+            models.Index(
+                fields=["organisation", "-updated", "-created"],
+                name="common_facility_org_recent_idx",
+                condition=models.Q(active=True),
+            ),
+            GinIndex(fields=["search_vector"], name="common_facility_search_idx"),
+            GinIndex(
+                fields=["name"], name="common_facility_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
 
 class FacilityAttachment(Attachment):
@@ -304,7 +467,9 @@ class UserFacilityAllotment(AbstractBase):
     )
     facilities = models.ManyToManyField(Facility, blank=True)
     counties = ArrayField(
-        models.CharField(max_length=150, choices=get_counties(), null=True, blank=True),
+        models.CharField(
+            max_length=150, choices=LazyFieldChoices(get_counties), null=True, blank=True
+        ),
         help_text=(
             "All the facilities in the selected counties will be allocated to the selected user."
         ),
@@ -312,7 +477,9 @@ class UserFacilityAllotment(AbstractBase):
         blank=True,
     )
     constituencies = ArrayField(
-        models.CharField(max_length=150, choices=get_constituencies(), null=True, blank=True),
+        models.CharField(
+            max_length=150, choices=LazyFieldChoices(get_constituencies), null=True, blank=True
+        ),
         help_text=(
             "All the facilities in the selected constituencies will be allocated to the selected "
             "user."
@@ -321,7 +488,9 @@ class UserFacilityAllotment(AbstractBase):
         blank=True,
     )
     sub_counties = ArrayField(
-        models.CharField(max_length=150, choices=get_sub_counties(), null=True, blank=True),
+        models.CharField(
+            max_length=150, choices=LazyFieldChoices(get_sub_counties), null=True, blank=True
+        ),
         help_text=(
             "All the facilities in the selected sub counties will be allocated to the selected "
             "user."
@@ -330,7 +499,9 @@ class UserFacilityAllotment(AbstractBase):
         blank=True,
     )
     wards = ArrayField(
-        models.CharField(max_length=150, choices=get_wards(), null=True, blank=True),
+        models.CharField(
+            max_length=150, choices=LazyFieldChoices(get_wards), null=True, blank=True
+        ),
         help_text=(
             "All the facilities in the selected wards will be allocated to the selected user."
         ),
@@ -0,0 +1,61 @@
+from django.contrib.gis.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from .base_models import OwnerlessAbstractBase
+
+
+class OutboundEmail(OwnerlessAbstractBase):
+    """An email waiting in, or delivered from, the outbox.
+
+    Emails are written to the outbox in the same transaction as the changes
+    that they announce and are delivered by the `send_queued_emails` worker,
+    see `fahari.common.outbox`.
+    """
+
+    class Status(models.TextChoices):
+        """The delivery statuses of an email."""
+
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=16, default="html")
+    from_email = models.TextField()
+    to = ArrayField(models.TextField())
+    reply_to = ArrayField(models.TextField(), blank=True, default=list)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, help_text="The earliest time at which delivery is (re)attempted."
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    def to_message(self, connection=None) -> EmailMessage:
+        """Return the email message that delivers this email."""
+        message = EmailMessage(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            reply_to=self.reply_to,
+            connection=connection,
+        )
+        message.content_subtype = self.content_subtype
+        return message
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+    class Meta(OwnerlessAbstractBase.Meta):
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="common_email_due_idx",
+                condition=models.Q(status="pending"),
+            )
+        ]
@@ -0,0 +1,38 @@
+from django.contrib.gis.db import models
+
+from .base_models import OwnerlessAbstractBase
+
+
+class ImageRendition(OwnerlessAbstractBase):
+    """The thumbnail and web sized renditions of an uploaded image.
+
+    Renditions are generated by the `generate_renditions` worker, off the
+    request path, see `fahari.common.renditions`.
+    """
+
+    class Status(models.TextChoices):
+        """The generation statuses of the renditions of an image."""
+
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
+    source = models.TextField(unique=True, help_text="The storage name of the original image.")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    renditions = models.JSONField(
+        default=dict, blank=True, help_text="The storage names of the renditions, by rendition."
+    )
+    last_error = models.TextField(blank=True, default="")
+
+    def __str__(self):
+        return f"{self.source} ({self.status})"
+
+    class Meta(OwnerlessAbstractBase.Meta):
+        indexes = [
+            models.Index(
+                fields=["created"],
+                name="common_rendition_pending_idx",
+                condition=models.Q(status="pending"),
+            )
+        ]
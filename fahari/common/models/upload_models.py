@@ -0,0 +1,37 @@
+from django.contrib.gis.db import models
+
+from .base_models import AbstractBase
+
+
+class ChunkedUpload(AbstractBase):
+    """A file uploaded in parts, see `fahari.common.uploads`."""
+
+    class Status(models.TextChoices):
+        """The statuses of a chunked upload."""
+
+        PENDING = "pending", "Pending"
+        COMPLETE = "complete", "Complete"
+
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    size = models.BigIntegerField(help_text="The size of the whole file in bytes")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    parts = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="The storage name and size of the staged parts, by part number.",
+    )
+    file = models.TextField(
+        blank=True, default="", help_text="The storage name of the assembled file."
+    )
+
+    @property
+    def received_size(self) -> int:
+        """Return the number of bytes received so far."""
+        return sum(part["size"] for part in self.parts.values())
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+    class Meta(AbstractBase.Meta):
+        ordering = ("-updated", "-created")
@@ -0,0 +1,142 @@
+"""A durable outbox for outbound emails.
+
+Emails are rendered and written to the outbox as `OutboundEmail` rows, in
+the same transaction as the changes that they announce, so queueing an email
+never waits on the mail provider and emails of rolled back changes are never
+sent. The `send_queued_emails` worker delivers the queued emails in batches,
+over a single connection per batch, and retries failed deliveries with an
+exponential backoff.
+
+Email templates are MJML documents. Compiling MJML to HTML shells out to the
+MJML compiler, so each template is compiled once per process, with its
+Django template tags intact, and only the compiled HTML is rendered per
+email.
+"""
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.template import engines, loader
+from django.utils import timezone
+from mjml.tools import mjml_render
+
+from .models import OutboundEmail
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_BATCH_SIZE = 50
+
+MAX_DELIVERY_ATTEMPTS = 8
+
+RETRY_BACKOFF = timedelta(minutes=1)
+"""The delay before the first retry, it is doubled for every later retry."""
+
+MAX_RETRY_BACKOFF = timedelta(hours=6)
+
+
+class DeliveryResult(NamedTuple):
+    """A summary of a batch of delivered emails."""
+
+    sent: int
+    retrying: int
+    failed: int
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name: str):
+    """Return the compiled email template with the given name.
+
+    MJML templates, i.e. those whose name ends with ".mjml", are compiled to
+    HTML once and the resulting HTML is then compiled as a Django template.
+    """
+
+    source = loader.get_template(template_name).template.source
+    if template_name.endswith(".mjml"):
+        source = mjml_render(source)
+    return engines["django"].from_string(source)
+
+
+def get_retry_backoff(attempts: int) -> timedelta:
+    """Return the delay before retrying an email that has failed the given number of times."""
+
+    return min(RETRY_BACKOFF * 2 ** (attempts - 1), MAX_RETRY_BACKOFF)
+
+
+def queue_email(
+    subject: str,
+    template_name: str,
+    context: Mapping[str, Any],
+    to: Sequence[str],
+    reply_to: Sequence[str] = (),
+    from_email: Optional[str] = None,
+) -> Optional[OutboundEmail]:
+    """Render an email and add it to the outbox.
+
+    :return: The queued email or `None` if the email has no recipients.
+    """
+
+    if not to:
+        return None
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=get_email_template(template_name).render(dict(context)),
+        from_email=from_email or settings.SERVER_EMAIL,
+        to=list(to),
+        reply_to=list(reply_to),
+    )
+
+
+def deliver_queued_emails(batch_size: int = DEFAULT_BATCH_SIZE) -> DeliveryResult:
+    """Deliver a batch of the queued emails that are due.
+
+    The batch is locked with `SKIP LOCKED`, so that several workers can
+    deliver emails concurrently, and sent over a single connection. Emails
+    that fail to send are retried with an exponential backoff until they
+    have failed `MAX_DELIVERY_ATTEMPTS` times.
+    """
+
+    sent = retrying = failed = 0
+    with transaction.atomic():
+        now = timezone.now()
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not emails:
+            return DeliveryResult(sent, retrying, failed)
+
+        with get_connection() as connection:
+            for email in emails:
+                email.attempts += 1
+                email.updated = timezone.now()
+                try:
+                    connection.send_messages([email.to_message(connection)])
+                except Exception as error:  # Any backend or provider error
+                    email.last_error = "%s: %s" % (type(error).__name__, error)
+                    if email.attempts >= MAX_DELIVERY_ATTEMPTS:
+                        email.status = OutboundEmail.Status.FAILED
+                        failed += 1
+                    else:
+                        email.next_attempt_at = now + get_retry_backoff(email.attempts)
+                        retrying += 1
+                else:
+                    email.status = OutboundEmail.Status.SENT
+                    email.sent_at = email.updated
+                    sent += 1
+
+        OutboundEmail.objects.bulk_update(
+            emails,
+            ["attempts", "last_error", "next_attempt_at", "sent_at", "status", "updated"],
+        )
+    return DeliveryResult(sent, retrying, failed)
@@ -0,0 +1,341 @@
+import json
+import operator
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import reduce
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+from rest_framework_datatables.pagination import DatatablesPageNumberPagination
+from rest_framework_datatables.utils import get_param
+
+from .filters import filter_visible_records
+
+
+class PinnedRecordPaginationMixin:
+    """Mixin that pins a record, e.g. the current value of a combobox, to the top of a listing.
+
+    The pk of the record to pin is taken from the first of the
+    `pinned_record_query_params` present in a request. The pinned record is
+    fetched by pk and merged into the first page of the normally ordered
+    results, and left out of every other page. Neither the whole listing
+    nor the count are affected, so pinning a record costs a single indexed
+    lookup regardless of the size of the listing.
+    """
+
+    pinned_record_query_params: Sequence[str] = ("bubble_record", "combobox")
+
+    def get_pinned_record_pk(self, request: Request) -> Optional[str]:
+        """Return the pk of the record to pin or `None` if there is no valid pk to pin."""
+
+        for query_param in self.pinned_record_query_params:
+            if query_param in request.query_params:
+                try:
+                    return str(uuid.UUID(request.query_params[query_param]))
+                except ValueError:
+                    return None
+        return None
+
+    def get_pinned_record(
+        self,
+        queryset: QuerySet,
+        pinned_record_pk: str,
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> Optional[Any]:
+        """Return the record to pin.
+
+        The record is looked up in the given queryset so that it carries the
+        same annotations as the rest of the page and, should the current
+        filters exclude it, in the view's queryset limited to the records
+        that the user is allowed to view. This guarantees that a combobox can
+        always display its current value without exposing other records.
+        """
+
+        pinned_record = queryset.filter(pk=pinned_record_pk).first()
+        if pinned_record is None and view is not None:
+            visible_records = filter_visible_records(request, view.get_queryset(), view)
+            pinned_record = visible_records.filter(pk=pinned_record_pk).first()
+        return pinned_record
+
+    def is_first_page(self) -> bool:
+        """Return true if the page being paginated is the first one."""
+
+        return self.page.number == 1  # type: ignore
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List[Any]]:
+        page = super().paginate_queryset(queryset, request, view)  # type: ignore
+        return self.pin_record(page, queryset, request, view)
+
+    def pin_record(
+        self,
+        page: Optional[List[Any]],
+        queryset: QuerySet,
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> Optional[List[Any]]:
+        """Merge the pinned record, if any, into the given page of records."""
+
+        pinned_record_pk = self.get_pinned_record_pk(request)
+        if page is None or pinned_record_pk is None:
+            return page
+
+        pinned_record = next((r for r in page if str(r.pk) == pinned_record_pk), None)
+        page = [record for record in page if record is not pinned_record]
+        if self.is_first_page():
+            if pinned_record is None:
+                pinned_record = self.get_pinned_record(queryset, pinned_record_pk, request, view)
+            if pinned_record is not None:
+                page.insert(0, pinned_record)
+        return page
+
+
+class PinnedRecordDatatablesPagination(
+    PinnedRecordPaginationMixin, DatatablesPageNumberPagination
+):
+    """Datatables aware page number pagination with support for pinned records."""
+
+
+class Cursor(NamedTuple):
+    """The position of a keyset page, i.e. the ordering values of the record it starts after."""
+
+    position: Tuple[str, ...]
+    reverse: bool
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Return the planner's estimate of the number of rows in the given queryset.
+
+    This is a single `EXPLAIN` of the query, which unlike `COUNT(*)` doesn't
+    scan any rows. The accuracy of the estimate depends on how recently the
+    tables involved were analyzed.
+    """
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) %s" % sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):  # pragma: nocover
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(PinnedRecordPaginationMixin, BasePagination):
+    """Keyset (cursor) pagination with estimated counts for large listings.
+
+    Pages are fetched by seeking past the `ordering` values of the last
+    record of the previous page, which is an indexed range scan, so deep
+    pages cost as much as the first one. The `next` and `previous` links
+    carry the cursors to these positions. Datatables requests without a
+    cursor are paginated using their `start` offset, as are querysets whose
+    explicit ordering, e.g. a user chosen sort column, isn't compatible with
+    `ordering`.
+
+    Counts are estimated from the query planner's statistics, except when
+    the estimate is below `exact_count_threshold` or when exact counts are
+    requested using the `exact_count` query parameter. Whether a count is
+    an estimate is indicated in the response.
+
+    To use this pagination, set it as the `pagination_class` of a view.
+    """
+
+    counts_lazily = True  # Tells `LazyCountDatatablesFilterBackend` not to count
+    cursor_query_param = "cursor"
+    exact_count_query_param = "exact_count"
+    exact_count_threshold = 1000
+    invalid_cursor_message = "Invalid cursor."
+    max_page_size = 1000
+    offset_query_param = "offset"
+    ordering: Sequence[str] = ("-updated", "-created", "id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Optional[APIView] = None
+    ) -> Optional[List[Any]]:
+        self.request = request
+        renderer = getattr(request, "accepted_renderer", None)
+        self.is_datatable_request = getattr(renderer, "format", None) == "datatables"
+        page_size = self.get_page_size(request)
+        if page_size is None:
+            return None
+
+        self.cursor = self.decode_cursor(request)
+        self.offset = 0 if self.cursor else self.get_offset(request)
+        self.count, self.count_is_estimate = self.get_count(queryset)
+        if self.is_datatable_request:
+            self.total_count = (
+                self.get_count(filter_visible_records(request, view.get_queryset(), view))[0]
+                if view is not None
+                else self.count
+            )
+
+        self.is_keyset = self.is_keyset_compatible(queryset)
+        page_queryset = queryset
+        if self.is_keyset:
+            page_queryset = queryset.order_by(*self.ordering)
+            if self.cursor:
+                page_queryset = page_queryset.filter(self.get_seek_filter(self.cursor))
+                if self.cursor.reverse:
+                    page_queryset = page_queryset.order_by(
+                        *(self._invert(field) for field in self.ordering)
+                    )
+        elif self.cursor:
+            raise NotFound(self.invalid_cursor_message)
+
+        end = self.offset + page_size + 1
+        records = list(page_queryset[self.offset : end])  # noqa
+        self.has_more = len(records) > page_size
+        self.records = records[:page_size]
+        if self.cursor and self.cursor.reverse:
+            self.records.reverse()
+        return self.pin_record(list(self.records), queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.is_datatable_request:
+            return Response(
+                OrderedDict(
+                    [
+                        ("recordsTotal", self.total_count),
+                        ("recordsFiltered", self.count),
+                        ("countIsEstimate", self.count_is_estimate),
+                        ("next", self.get_next_link()),
+                        ("previous", self.get_previous_link()),
+                        ("data", data),
+                    ]
+                )
+            )
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("count_is_estimate", self.count_is_estimate),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_count(self, queryset: QuerySet) -> Tuple[int, bool]:
+        """Return the, possibly estimated, count of the given queryset.
+
+        Only the primary keys are selected, so annotations, e.g. the stats
+        subqueries of questionnaire responses, are left out of the count.
+
+        :return: A tuple of the count and whether the count is an estimate.
+        """
+
+        queryset = queryset.order_by().values("pk")
+        exact_count = get_param(self.request, self.exact_count_query_param, "")
+        if exact_count.lower() not in ("1", "true", "yes"):
+            estimate = estimate_count(queryset)
+            if estimate >= self.exact_count_threshold:
+                return estimate, True
+        return queryset.count(), False
+
+    def get_next_link(self) -> Optional[str]:
+        reverse = self.cursor is not None and self.cursor.reverse
+        if not self.records or not (self.has_more or reverse):
+            return None
+        return self._get_link(self.records[-1], reverse=False)
+
+    def get_offset(self, request: Request) -> int:
+        query_param = "start" if self.is_datatable_request else self.offset_query_param
+        try:
+            return max(int(get_param(request, query_param, 0)), 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def get_page_size(self, request: Request) -> Optional[int]:
+        query_param = "length" if self.is_datatable_request else self.page_size_query_param
+        value = get_param(request, query_param)
+        if self.is_datatable_request and value == "-1":
+            return None
+        try:
+            page_size = int(value)
+            if page_size <= 0:
+                raise ValueError
+            return min(page_size, self.max_page_size)
+        except (TypeError, ValueError):
+            return self.page_size
+
+    def get_previous_link(self) -> Optional[str]:
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_previous = self.has_more if reverse else bool(self.cursor or self.offset)
+        if not self.records or not has_previous:
+            return None
+        return self._get_link(self.records[0], reverse=True)
+
+    def get_seek_filter(self, cursor: Cursor) -> Q:
+        """Return a filter matching the records that come after the given cursor's position.
+
+        For an ordering `(-a, -b, c)` and position `(x, y, z)` this is
+        `a < x OR (a = x AND b < y) OR (a = x AND b = y AND c > z)`, with the
+        comparisons flipped when seeking in reverse.
+        """
+
+        terms, equal_to = [], {}
+        for field, value in zip(self.ordering, cursor.position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != cursor.reverse else "gt"
+            terms.append(Q(**equal_to, **{"%s__%s" % (name, lookup): value}))
+            equal_to[name] = value
+        return reduce(operator.or_, terms)
+
+    def is_first_page(self) -> bool:
+        return self.cursor is None and self.offset == 0
+
+    def is_keyset_compatible(self, queryset: QuerySet) -> bool:
+        """Return true if the given queryset can be paginated by seeking on `ordering`.
+
+        This is the case when the queryset isn't explicitly ordered, or is
+        ordered by a prefix of `ordering`.
+        """
+
+        order_by = tuple(queryset.query.order_by)
+        return order_by == tuple(self.ordering[: len(order_by)])
+
+    def decode_cursor(self, request: Request) -> Optional[Cursor]:
+        """Return the cursor in the given request or `None` if the request has no cursor."""
+
+        encoded = get_param(request, self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position, reverse = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return Cursor(position=tuple(position), reverse=bool(reverse))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        return urlsafe_b64encode(json.dumps([cursor.position, cursor.reverse]).encode()).decode()
+
+    def _get_link(self, record: Any, reverse: bool) -> Optional[str]:
+        if not self.is_keyset:
+            offset = self.offset + (-1 if reverse else 1) * len(self.records)
+            url = remove_query_param(self.request.build_absolute_uri(), "start")
+            return replace_query_param(url, self.offset_query_param, max(offset, 0))
+        position = tuple(str(getattr(record, field.lstrip("-"))) for field in self.ordering)
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        url = remove_query_param(url, "start")
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(Cursor(position, reverse))
+        )
+
+    @staticmethod
+    def _invert(field: str) -> str:
+        return field[1:] if field.startswith("-") else "-%s" % field
@@ -23,3 +23,15 @@ class CanImportData(BasePermission):
             and request.user.is_authenticated
             and request.user.has_perm("can_import_data")
         )
+
+
+class CanViewDashboard(BasePermission):
+    """Allow access only to approved users who have the view dashboard permission."""
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        return (
+            request.user
+            and request.user.is_authenticated
+            and request.user.is_approved
+            and request.user.has_perm("users.can_view_dashboard")
+        )
@@ -0,0 +1,70 @@
+"""A dedicated, bounded pool of threads for the database reads of async views.
+
+Django 3.2 has no async ORM, so async views hand their queries to threads.
+Under ASGI, Django runs every sync view on a single thread, and asgiref's
+shared executor also runs the sync middleware, so neither is a good home for
+slow reads. The read pool instead has its own `ASYNC_READ_WORKERS` threads,
+and so at most that many database connections per process, and admits at
+most `ASYNC_READ_MAX_PENDING` reads waiting for a thread. Reads beyond that
+are rejected straight away instead of queueing behind slow queries.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.db import close_old_connections
+
+T = TypeVar("T")
+
+
+class ReadPoolSaturated(Exception):
+    """Raised when a read pool can't admit any more reads."""
+
+
+def _run_read(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Pool threads keep their connections between reads, drop the broken and
+    # expired ones the way Django does at the start and end of requests
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class ReadPool:
+    """Runs sync, database bound, callables for async code with bounded concurrency."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="read-pool")
+        self.slots = threading.BoundedSemaphore(workers + max_pending)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run the given callable in the pool and return its result.
+
+        The callable runs in a copy of the current context, so that e.g.
+        the active translation carries over.
+
+        :raises ReadPoolSaturated: When every thread is busy and the maximum
+            number of reads are already waiting for one.
+        """
+
+        if not self.slots.acquire(blocking=False):
+            raise ReadPoolSaturated()
+
+        context = contextvars.copy_context()
+        future = self.executor.submit(context.run, partial(_run_read, func, *args, **kwargs))
+        # Release the slot once the read completes, even if the caller stops
+        # waiting for it, e.g. when the client disconnects
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+
+@lru_cache(maxsize=None)
+def get_read_pool() -> ReadPool:
+    """Return the read pool of the process, configured with the `ASYNC_READ_*` settings."""
+
+    return ReadPool(settings.ASYNC_READ_WORKERS, settings.ASYNC_READ_MAX_PENDING)
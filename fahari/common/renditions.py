@@ -0,0 +1,212 @@
+"""Thumbnail and web sized renditions of uploaded images.
+
+Models list their image fields in `rendition_fields`. Whenever a new file is
+saved to one of those fields, an `ImageRendition` is queued for it and the
+`generate_renditions` worker later decodes the image once, downscaling it
+while decoding where the format supports it, and stores a JPEG rendition for
+every size in `RENDITION_SIZES`. The UI can then show the renditions instead
+of the full-size photos, falling back to the original until they are ready.
+"""
+import mimetypes
+import os
+from io import BytesIO
+from typing import Dict, Iterable, NamedTuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .constants import IMAGE_TYPES
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_BATCH_SIZE = 20
+
+MAX_RENDITION_ATTEMPTS = 3
+
+RENDITION_QUALITY = 85
+
+RENDITION_SIZES = {
+    "thumbnail": (320, 320),
+    "web": (1600, 1600),
+}
+"""The bounding boxes of the renditions, images are never upscaled."""
+
+
+class RenditionsResult(NamedTuple):
+    """A summary of a batch of processed images."""
+
+    ready: int
+    retrying: int
+    failed: int
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def is_image_name(name: str) -> bool:
+    """Return true if the given file name is that of an image that can have renditions."""
+
+    return mimetypes.guess_type(name)[0] in IMAGE_TYPES
+
+
+def get_rendition_name(source: str, rendition: str) -> str:
+    """Return the storage name of the given rendition of the given image."""
+
+    root, _ = os.path.splitext(source)
+    return "renditions/%s/%s.jpg" % (rendition, root)
+
+
+def queue_renditions(sources: Iterable[str]) -> int:
+    """Queue the generation of the renditions of the given images.
+
+    Files that are not images, and images that are already queued, are
+    skipped.
+
+    :return: The number of images considered for queueing.
+    """
+
+    from .models import ImageRendition  # intentional late import
+
+    renditions = [
+        ImageRendition(source=source)
+        for source in set(sources)
+        if source and is_image_name(source)
+    ]
+    ImageRendition.objects.bulk_create(renditions, ignore_conflicts=True)
+    return len(renditions)
+
+
+def delete_renditions(sources: Iterable[str], storage: Storage = default_storage) -> int:
+    """Delete the renditions of the given images, e.g. once the images are deleted.
+
+    The rendition files are deleted once the deletion commits.
+
+    :return: The number of images whose renditions were deleted.
+    """
+
+    from .models import ImageRendition  # intentional late import
+
+    renditions = ImageRendition.objects.filter(source__in=set(sources))
+    names = [
+        name
+        for value in renditions.values_list("renditions", flat=True)
+        for name in value.values()
+    ]
+    count, _ = renditions.delete()
+
+    def delete_files():
+        for name in names:
+            storage.delete(name)
+
+    transaction.on_commit(delete_files)
+    return count
+
+
+def render_image(source: str, storage: Storage = default_storage) -> Dict[str, str]:
+    """Generate and store the renditions of the given image.
+
+    :return: The storage names of the renditions keyed by rendition.
+    """
+
+    with storage.open(source, "rb") as file:
+        image = Image.open(file)
+        # Let JPEG decoders skip the detail that the largest rendition doesn't need
+        image.draft("RGB", max(RENDITION_SIZES.values()))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+
+    renditions = {}
+    for rendition, size in RENDITION_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail(size)
+        content = BytesIO()
+        resized.save(content, "JPEG", quality=RENDITION_QUALITY, optimize=True)
+        renditions[rendition] = storage.save(
+            get_rendition_name(source, rendition), ContentFile(content.getvalue())
+        )
+    return renditions
+
+
+def generate_renditions(
+    batch_size: int = DEFAULT_BATCH_SIZE, storage: Storage = default_storage
+) -> RenditionsResult:
+    """Generate the renditions of a batch of the queued images.
+
+    The batch is locked with `SKIP LOCKED`, so that several workers can
+    process images concurrently. Images that fail to render are retried up
+    to `MAX_RENDITION_ATTEMPTS` times.
+    """
+
+    from .models import ImageRendition  # intentional late import
+
+    ready = retrying = failed = 0
+    with transaction.atomic():
+        pending = list(
+            ImageRendition.objects.select_for_update(skip_locked=True)
+            .filter(status=ImageRendition.Status.PENDING)
+            .order_by("created")[:batch_size]
+        )
+        for image in pending:
+            image.attempts += 1
+            image.updated = timezone.now()
+            try:
+                image.renditions = render_image(image.source, storage)
+            except Exception as error:  # Missing, corrupt or unsupported images and storage errors
+                image.last_error = "%s: %s" % (type(error).__name__, error)
+                if image.attempts >= MAX_RENDITION_ATTEMPTS:
+                    image.status = ImageRendition.Status.FAILED
+                    failed += 1
+                else:
+                    retrying += 1
+            else:
+                image.status = ImageRendition.Status.READY
+                ready += 1
+
+        ImageRendition.objects.bulk_update(
+            pending, ["attempts", "last_error", "renditions", "status", "updated"]
+        )
+    return RenditionsResult(ready, retrying, failed)
+
+
+def get_rendition_urls(
+    sources: Iterable[str], storage: Storage = default_storage
+) -> Dict[str, Dict[str, str]]:
+    """Return the URLs of the ready renditions of the given images, keyed by image.
+
+    Images without ready renditions are left out. A single query is made
+    regardless of the number of images.
+    """
+
+    from .models import ImageRendition  # intentional late import
+
+    sources = {source for source in sources if source}
+    if not sources:
+        return {}
+    ready = ImageRendition.objects.filter(
+        source__in=sources, status=ImageRendition.Status.READY
+    ).values_list("source", "renditions")
+    return {
+        source: {rendition: storage.url(name) for rendition, name in renditions.items()}
+        for source, renditions in ready
+    }
+
+
+def get_image_urls(image: FieldFile, storage: Storage = default_storage) -> Dict[str, str]:
+    """Return the URL of every rendition of the given image, keyed by rendition.
+
+    Until the renditions of the image are ready, the URL of the original
+    image is returned for every rendition. Files that aren't images have no
+    renditions and an empty dictionary is returned for them.
+    """
+
+    if not image or not is_image_name(image.name):
+        return {}
+    urls = get_rendition_urls([image.name], storage).get(image.name, {})
+    return {rendition: urls.get(rendition) or image.url for rendition in RENDITION_SIZES}
@@ -0,0 +1,122 @@
+"""Full-text search over the records listed by the API.
+
+Models opt into full-text search by declaring a `search_vector` field,
+backed by a GIN index, and the lookups that make up the vector, with their
+weights, in `search_vector_fields`. The vector is kept up to date whenever a
+record is saved. Lookups declared in `trigram_search_fields` are matched as
+substrings instead, using `ILIKE`, which a `gin_trgm_ops` index on the
+column can serve, e.g. for partial facility names.
+"""
+import re
+from functools import reduce
+from typing import Iterable, Optional, Type
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import CharField, Model, OuterRef, Q, QuerySet, Subquery, TextField
+from django.db.models.lookups import IContains
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+SEARCH_CONFIG = "simple"
+"""The text search configuration, "simple" doesn't stem or drop stop words, e.g. in names."""
+
+_SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+
+# =============================================================================
+# LOOKUPS
+# =============================================================================
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class ILikeContains(IContains):
+    """Case-insensitive containment test that a trigram index on the column can serve.
+
+    On PostgreSQL, `icontains` compiles to `UPPER(column) LIKE UPPER(value)`,
+    which can only use an index on `UPPER(column)`. This lookup compiles to
+    `column ILIKE value` instead, which is served by a `gin_trgm_ops` index
+    on the column itself.
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        params.extend(rhs_params)
+        return "%s ILIKE %s" % (lhs_sql, rhs_sql), params
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def get_search_query(value: str) -> Optional[SearchQuery]:
+    """Return a query matching records with words starting with every term in the given value.
+
+    `None` is returned if the value has no terms, i.e. only punctuation.
+    """
+
+    terms = _SEARCH_TERM_PATTERN.findall(value)
+    if not terms:
+        return None
+    return SearchQuery(
+        " & ".join("%s:*" % term for term in terms), config=SEARCH_CONFIG, search_type="raw"
+    )
+
+
+def get_search_vector(model: Type[Model]) -> SearchVector:
+    """Return the expression of the given model's weighted search vector."""
+
+    return reduce(
+        lambda vector, other: vector + other,
+        (
+            SearchVector(lookup, config=SEARCH_CONFIG, weight=weight)
+            for lookup, weight in model.search_vector_fields.items()  # type: ignore
+        ),
+    )
+
+
+def is_full_text_searchable(model: Type[Model], search_fields: Iterable[str]) -> bool:
+    """Return true if all the given search fields can be searched using the model's vector."""
+
+    searchable = {
+        *getattr(model, "search_vector_fields", {}),
+        *getattr(model, "trigram_search_fields", ()),
+    }
+    search_fields = [field.lstrip("^=@$") for field in search_fields]
+    return bool(search_fields) and searchable.issuperset(search_fields)
+
+
+def search(queryset: QuerySet, value: str) -> QuerySet:
+    """Filter the given queryset to the records that match the given search value."""
+
+    query = get_search_query(value)
+    if query is None:
+        return queryset
+    q = Q(search_vector=query)
+    for lookup in getattr(queryset.model, "trigram_search_fields", ()):
+        q |= Q(**{"%s__ilike_contains" % lookup: value.strip()})
+    return queryset.filter(q)
+
+
+def update_search_vectors(queryset: QuerySet) -> int:
+    """Recompute the search vectors of the records in the given queryset in a single query.
+
+    The vector is computed in a subquery as it may include the fields of
+    related records, which an UPDATE can't join.
+
+    :return: The number of records updated.
+    """
+
+    model = queryset.model
+    vectors = (
+        model._base_manager.filter(pk=OuterRef("pk"))
+        .annotate(computed_search_vector=get_search_vector(model))
+        .values("computed_search_vector")[:1]
+    )
+    return queryset.update(search_vector=Subquery(vectors))
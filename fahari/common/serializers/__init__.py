@@ -1,16 +1,21 @@
 """Shared serializer module."""
-from .base_serializers import BaseSerializer
+from .base_serializers import BaseSerializer, ChunkedUploadFileField, ChunkedUploadImageField
 from .common_serializers import (
+    ChunkedUploadSerializer,
     FacilitySerializer,
     SystemSerializer,
     UserFacilityAllotmentSerializer,
 )
-from .mixins import AuditFieldsMixin, PartialResponseMixin
+from .mixins import AuditFieldsMixin, PartialResponseMixin, RenditionsMixin
 
 __all__ = [
     "AuditFieldsMixin",
     "BaseSerializer",
+    "ChunkedUploadFileField",
+    "ChunkedUploadImageField",
+    "ChunkedUploadSerializer",
     "PartialResponseMixin",
+    "RenditionsMixin",
     "FacilitySerializer",
     "SystemSerializer",
     "UserFacilityAllotmentSerializer",
@@ -1,16 +1,66 @@
 """Base serializers used in the project."""
 import logging
 
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from ..models import ChunkedUpload
+from ..renditions import is_image_name
 from .mixins import AuditFieldsMixin
 
 LOGGER = logging.getLogger(__name__)
 
 
+class ChunkedUploadFileField(serializers.FileField):
+    """A file field that also accepts the id of a completed chunked upload.
+
+    Only the requesting user's uploads can be used. The assembled file is
+    already stored, so it is assigned by name instead of being re-uploaded.
+    """
+
+    default_error_messages = {
+        "invalid_upload": _("There is no completed upload with the given id."),
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            return super().to_internal_value(data)
+
+        request = self.context.get("request")
+        try:
+            upload = ChunkedUpload.objects.get(
+                pk=data,
+                created_by=getattr(request and request.user, "pk", None),
+                status=ChunkedUpload.Status.COMPLETE,
+            )
+        except (ChunkedUpload.DoesNotExist, ValidationError):
+            self.fail("invalid_upload")
+        return self.to_internal_upload_value(upload)
+
+    def to_internal_upload_value(self, upload: ChunkedUpload) -> str:
+        return upload.file
+
+
+class ChunkedUploadImageField(ChunkedUploadFileField, serializers.ImageField):
+    """An image field that also accepts the id of a completed chunked upload of an image."""
+
+    def to_internal_upload_value(self, upload: ChunkedUpload) -> str:
+        if not is_image_name(upload.file):
+            self.fail("invalid_image")
+        return upload.file
+
+
 class BaseSerializer(AuditFieldsMixin):
     """Base class intended for inheritance by 'regular' app serializers."""
 
+    serializer_field_mapping = {
+        **AuditFieldsMixin.serializer_field_mapping,
+        models.FileField: ChunkedUploadFileField,
+        models.ImageField: ChunkedUploadImageField,
+    }
+
     url = serializers.URLField(source="get_absolute_url", read_only=True)
 
     class Meta:
@@ -1,18 +1,32 @@
 """Common serializers."""
 import logging
 
+from django.conf import settings
 from rest_framework import serializers
 
-from ..models import Facility, System, UserFacilityAllotment
+from ..models import ChunkedUpload, Facility, System, UserFacilityAllotment
 from .base_serializers import BaseSerializer
+from .mixins import AuditFieldsMixin
 
 LOGGER = logging.getLogger(__name__)
 
 
 class FacilitySerializer(BaseSerializer):
+
+    distance = serializers.SerializerMethodField()
+
+    def get_distance(self, facility):
+        """Return the distance, in kilometres, of the facility from a geospatial query's point.
+
+        This is only available when the facility has been annotated with a
+        distance, e.g. by a `near` filter.
+        """
+        distance = getattr(facility, "distance", None)
+        return distance.km if distance is not None else None
+
     class Meta(BaseSerializer.Meta):
         model = Facility
-        fields = "__all__"
+        exclude = ("location",)
 
 
 class SystemSerializer(BaseSerializer):
@@ -29,3 +43,39 @@ class UserFacilityAllotmentSerializer(BaseSerializer):
     class Meta(BaseSerializer.Meta):
         model = UserFacilityAllotment
         fields = "__all__"
+
+
+class ChunkedUploadSerializer(AuditFieldsMixin):
+
+    received_size = serializers.ReadOnlyField()
+    parts = serializers.SerializerMethodField()
+
+    def get_parts(self, upload: ChunkedUpload):
+        """Return the sizes of the received parts by part number, e.g. to resume an upload."""
+        return {number: part["size"] for number, part in upload.parts.items()}
+
+    def validate_size(self, size: int) -> int:
+        if not 0 < size <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                "The file should have between 1 and %d bytes." % settings.CHUNKED_UPLOAD_MAX_SIZE
+            )
+        return size
+
+    class Meta:
+        model = ChunkedUpload
+        fields = (
+            "id",
+            "filename",
+            "content_type",
+            "size",
+            "status",
+            "received_size",
+            "parts",
+            "file",
+            "organisation",
+            "created",
+            "created_by",
+            "updated",
+            "updated_by",
+        )
+        read_only_fields = ("status", "file")
@@ -1,10 +1,13 @@
 """Shared serializer mixins."""
 import logging
+from typing import Dict
 
+from django.utils import timezone
 from rest_framework import exceptions, serializers
 from rest_framework.serializers import ValidationError
 
 from fahari.common.models import Organisation
+from fahari.common.renditions import get_rendition_urls
 
 LOGGER = logging.getLogger(__name__)
 
@@ -71,6 +74,7 @@ class AuditFieldsMixin(PartialResponseMixin, serializers.ModelSerializer):
     def populate_audit_fields(self, data, is_create):
         request = self.context["request"]
         user = request.user
+        data["updated"] = timezone.now()
         data["updated_by"] = user.pk
         if is_create:
             data["created_by"] = user.pk
@@ -103,3 +107,37 @@ class AuditFieldsMixin(PartialResponseMixin, serializers.ModelSerializer):
         origi_fields = super().get_fields()
         request = self.context.get("request", None)
         return self.strip_fields(request, origi_fields)
+
+
+class RenditionsMixin(serializers.Serializer):
+    """Mixin that adds the URLs of the renditions of a model's images.
+
+    The renditions of all the records in a list are looked up with a single
+    query, see `fahari.common.renditions.get_rendition_urls`.
+    """
+
+    renditions = serializers.SerializerMethodField()
+
+    def _get_rendition_urls(self, instance) -> Dict[str, Dict[str, str]]:
+        instances = [instance]
+        if isinstance(self.parent, serializers.ListSerializer) and self.parent.instance:
+            instances = self.parent.instance
+        cache = self.context.setdefault("rendition_urls", {})
+        sources = {
+            getattr(obj, field_name).name
+            for obj in instances
+            for field_name in obj.rendition_fields
+            if getattr(obj, field_name)
+        }
+        cache.update(get_rendition_urls(sources.difference(cache)))
+        cache.update((source, None) for source in sources.difference(cache))
+        return cache
+
+    def get_renditions(self, obj) -> Dict[str, Dict[str, str]]:
+        """Return the URLs of the ready renditions of the record's images, by field."""
+        rendition_urls = self._get_rendition_urls(obj)
+        return {
+            field_name: rendition_urls[getattr(obj, field_name).name]
+            for field_name in obj.rendition_fields
+            if getattr(obj, field_name) and rendition_urls.get(getattr(obj, field_name).name)
+        }
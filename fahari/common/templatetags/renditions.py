@@ -0,0 +1,19 @@
+from typing import Any, Dict
+
+from django import template
+from django.db.models.fields.files import FieldFile
+
+from ..renditions import get_image_urls
+
+register = template.Library()
+
+
+@register.inclusion_tag("fragments/rendition_preview.html")
+def rendition_preview(image: FieldFile) -> Dict[str, Any]:
+    """Show the thumbnail of an image, linked to its web sized rendition.
+
+    The original image is shown until its renditions are ready and nothing
+    is shown for files that aren't images.
+    """
+
+    return {"image": image, "urls": get_image_urls(image)}
@@ -1,10 +1,12 @@
+from unittest.mock import patch
+
 import pytest
 from django.contrib.admin.sites import AdminSite
 from model_bakery import baker
 
-from fahari.common.admin import OrganisationAdmin
+from fahari.common.admin import FacilityAttachmentAdmin, OrganisationAdmin
 from fahari.common.forms import OrganisationForm
-from fahari.common.models import Organisation
+from fahari.common.models import FacilityAttachment, Organisation
 
 pytestmark = pytest.mark.django_db
 
@@ -38,3 +40,15 @@ def test_base_admin_update_updated_by(request_with_user, organisation_admin, org
     organisation_admin.save_model(request_with_user, org, organisation_form, change=True)
     assert org.created_by == original_created_by
     assert org.updated_by != original_updated_by
+
+
+def test_facility_attachment_admin_preview():
+    admin = FacilityAttachmentAdmin(model=FacilityAttachment, admin_site=AdminSite())
+    assert "preview" in admin.get_readonly_fields(None)
+    assert not admin.preview(baker.prepare(FacilityAttachment, data="notes/a.pdf")).strip()
+
+    urls = {"thumbnail": "/media/thumbnail.jpg", "web": "/media/web.jpg"}
+    with patch("fahari.common.templatetags.renditions.get_image_urls", return_value=urls):
+        preview = admin.preview(baker.prepare(FacilityAttachment, data="notes/a.jpg"))
+    assert 'href="/media/web.jpg"' in preview
+    assert 'src="/media/thumbnail.jpg"' in preview
@@ -1,11 +1,18 @@
+from types import MappingProxyType
+
 import pytest
 
 from fahari.common.utils import (
+    LazyFieldChoices,
+    build_administrative_units_index,
+    get_administrative_units_index,
     get_constituencies,
     get_constituencies_for_county,
     get_counties,
+    get_county_for_sub_county,
     get_sub_counties,
     get_sub_counties_for_county,
+    get_sub_counties_for_ward,
     get_wards,
     get_wards_for_sub_county,
     has_constituency,
@@ -124,3 +131,70 @@ def test_has_wards():
 def test_has_ward_with_missing_sub_county():
     with pytest.raises(ValueError):
         assert has_ward("Kitui", "Kitui")
+
+
+def test_get_administrative_units_index():
+    index = get_administrative_units_index()
+    assert index is get_administrative_units_index()  # The index is only built once
+    assert index.counties == ("Nairobi", "Kajiado")
+    assert index.constituency_to_county["Magadi"] == "Kajiado"
+    assert index.sub_county_to_county["Westlands"] == "Nairobi"
+    assert "Kilimani" in index.sub_county_to_wards["Dagoretti North"]
+    assert "Kibra" in index.county_to_constituencies["Nairobi"]
+    assert "Loitokitok" in index.county_to_sub_counties["Kajiado"]
+    assert index.ward_to_sub_counties["Utawala"] == {"Embakasi East", "Embakasi West"}
+    assert isinstance(index.sub_county_to_county, MappingProxyType)
+    with pytest.raises(TypeError):
+        index.sub_county_to_county["Naivasha"] = "Nakuru"  # type: ignore
+
+
+def test_build_administrative_units_index_with_duplicate_units():
+    """Assert that the first county to declare a unit is treated as it's owner."""
+    index = build_administrative_units_index(
+        {
+            "County A": {
+                "Constituencies": ("Shared Constituency",),
+                "Sub Counties": {"Shared Sub County": ("Ward A",)},
+            },
+            "County B": {
+                "Constituencies": ("Shared Constituency",),
+                "Sub Counties": {"Shared Sub County": ("Ward B",), "Other": ("Ward A",)},
+            },
+            "County C": {},
+        }
+    )
+    assert index.constituency_to_county["Shared Constituency"] == "County A"
+    assert index.sub_county_to_county["Shared Sub County"] == "County A"
+    assert index.sub_county_to_wards["Shared Sub County"] == ("Ward A",)
+    assert index.ward_to_sub_counties["Ward A"] == frozenset({"Shared Sub County", "Other"})
+    assert "Ward B" not in index.ward_to_sub_counties
+    assert index.county_to_constituencies["County C"] == frozenset()
+    assert index.county_to_sub_counties["County C"] == frozenset()
+
+
+def test_get_county_for_sub_county():
+    assert get_county_for_sub_county("Kibra") == "Nairobi"
+    assert get_county_for_sub_county("Kajiado North") == "Kajiado"
+    assert get_county_for_sub_county("Naivasha") is None
+
+
+def test_get_sub_counties_for_ward():
+    assert get_sub_counties_for_ward("Kilimani") == frozenset({"Dagoretti North"})
+    assert get_sub_counties_for_ward("Kitui") == frozenset()
+
+
+def test_lazy_field_choices():
+    calls = []
+
+    def load_choices():
+        calls.append(1)
+        return get_counties()
+
+    choices = LazyFieldChoices(load_choices)
+    assert not calls  # Nothing is loaded until the choices are accessed
+    assert ("Nairobi", "Nairobi") in choices
+    assert len(choices) == 2
+    assert list(choices) == list(get_counties())
+    assert choices[0] == tuple(get_counties())[0]
+    assert len(calls) == 1
+    assert repr(choices) == "LazyFieldChoices(load_choices)"
@@ -4,10 +4,13 @@ import shutil
 import uuid
 from functools import partial
 from os import path
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 from model_bakery import baker
@@ -17,6 +20,7 @@ from rest_framework.test import APITestCase
 
 from fahari.common.constants import WHITELIST_COUNTIES
 from fahari.common.models import Facility, Organisation, System, UserFacilityAllotment
+from fahari.common.views import FacilityViewSet
 
 from .test_utils import patch_baker
 
@@ -278,6 +282,53 @@ class FacilityViewsetTest(LoggedInMixin, APITestCase):
         facility_codes = [a["mfl_code"] for a in response.data["results"]]
         assert facility.mfl_code in facility_codes
 
+        # Records excluded by the current filters are still pinned
+        response = self.client.get(f"{self.url_list}?combobox={facility.pk}&search=not-a-match")
+        assert [a["id"] for a in response.data["results"]] == [str(facility.pk)]
+
+        # But never records of other organisations or of facilities that aren't allotted
+        other_organisation_facility = baker.make(
+            Facility,
+            county=random.choice(WHITELIST_COUNTIES),
+            organisation=baker.make(Organisation),
+        )
+        unallotted_facility = baker.make(
+            Facility, county="Mombasa", organisation=self.global_organisation
+        )
+        for other in (other_organisation_facility, unallotted_facility):
+            response = self.client.get(f"{self.url_list}?combobox={other.pk}&search=not-a-match")
+            assert response.status_code == 200, response.json()
+            assert response.data["results"] == []
+
+    def test_retrieve_facility_search(self):
+        """Test searching facilities."""
+        facility, other = (
+            baker.make(
+                Facility,
+                name=name,
+                is_fahari_facility=True,
+                county=random.choice(WHITELIST_COUNTIES),
+                operation_status="Operational",
+                organisation=self.global_organisation,
+            )
+            for name in ("Mbagathi District Hospital", "Kangemi Health Centre")
+        )
+
+        for url in (
+            f"{self.url_list}?search=mbagathi",
+            f"{self.url_list}?search={facility.mfl_code}",
+            f"{self.url_list}?format=datatables&length=10&start=0&search[value]=gathi",
+        ):
+            response = self.client.get(url)
+            assert response.status_code == 200, response.json()
+            results = response.data.get("results", response.data.get("data"))
+            facility_codes = [a["mfl_code"] for a in results]
+            assert facility.mfl_code in facility_codes, url
+            assert other.mfl_code not in facility_codes, url
+
+        # The filtered count of datatables reflects the search
+        assert response.data["recordsFiltered"] == 1
+
     def test_retrieve_facility_active(self):
         """Test retrieving facility."""
         facility = baker.make(
@@ -296,6 +347,47 @@ class FacilityViewsetTest(LoggedInMixin, APITestCase):
         facility_codes = [a["mfl_code"] for a in response.data["results"]]
         assert facility.mfl_code in facility_codes
 
+    def test_retrieve_facility_geospatial_filters(self):
+        """Test retrieving facilities using the geospatial filters."""
+        make_facility = partial(
+            baker.make,
+            Facility,
+            is_fahari_facility=True,
+            county="Nairobi",
+            operation_status="Operational",
+            organisation=self.global_organisation,
+        )
+        nairobi = make_facility(lat=-1.2921, lon=36.8219)
+        kajiado = make_facility(lat=-1.8524, lon=36.7768)
+        mombasa = make_facility(lat=-4.0435, lon=39.6682)
+
+        def get_mfl_codes(query):
+            response = self.client.get(f"{self.url_list}?{query}")
+            assert response.status_code == 200, response.json()
+            return [f["mfl_code"] for f in response.data["results"]]
+
+        in_bbox = get_mfl_codes("bbox=36.5,-2.0,37.0,-1.0")
+        assert nairobi.mfl_code in in_bbox
+        assert kajiado.mfl_code in in_bbox
+        assert mombasa.mfl_code not in in_bbox
+
+        near = get_mfl_codes("near=-1.2921,36.8219&radius=100")
+        assert near.index(nairobi.mfl_code) < near.index(kajiado.mfl_code)
+        assert mombasa.mfl_code not in near
+
+        assert get_mfl_codes("near=-4.0,39.6&nearest=2") == [mombasa.mfl_code, kajiado.mfl_code]
+
+        response = self.client.get(f"{self.url_list}?near=-4.0,39.6")
+        assert response.status_code == 200, response.json()
+        assert response.data["results"][0]["mfl_code"] == mombasa.mfl_code
+        assert response.data["results"][0]["distance"] < 10
+
+    def test_retrieve_facility_geospatial_filters_invalid_input(self):
+        """Test that malformed geospatial filters are rejected."""
+        for query in ("bbox=36.5,-2.0", "near=north", "near=-1.29,36.82&radius=-1"):
+            response = self.client.get(f"{self.url_list}?{query}")
+            assert response.status_code == 400, response.json()
+
     def test_patch_facility(self):
         """Test changing user facility."""
         facility = baker.make(
@@ -335,6 +427,54 @@ class FacilityViewsetTest(LoggedInMixin, APITestCase):
         assert response.status_code == 200, response.json()
         assert response.data["mfl_code"] == data["mfl_code"]
 
+    def test_conditional_requests(self):
+        """Test that unchanged facilities are not sent again."""
+        facility = baker.make(
+            Facility,
+            is_fahari_facility=True,
+            county=random.choice(WHITELIST_COUNTIES),
+            operation_status="Operational",
+            organisation=self.global_organisation,
+        )
+
+        response = self.client.get(self.url_list)
+        assert response.status_code == 200, response.json()
+        etag = response["ETag"]
+        assert "no-cache" in response["Cache-Control"]
+        response = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        # The query parameters are part of the representation
+        response = self.client.get(self.url_list, {"page": 1}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+        url_detail = reverse("api:facility-detail", kwargs={"pk": facility.pk})
+        response = self.client.get(url_detail)
+        detail_etag, last_modified = response["ETag"], response["Last-Modified"]
+        assert self.client.get(url_detail, HTTP_IF_NONE_MATCH=detail_etag).status_code == 304
+        assert self.client.get(url_detail, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+        # Updates change the validators of the list and of the record
+        response = self.client.patch(url_detail, {"mfl_code": 999999999})
+        assert response.status_code == 200, response.json()
+        assert self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert self.client.get(url_detail, HTTP_IF_NONE_MATCH=detail_etag).status_code == 200
+
+        with patch.object(FacilityViewSet, "pagination_class", None):
+            response = self.client.get(self.url_list)
+        assert response.status_code == 200, response.json()
+        assert [record["id"] for record in response.json()] == [str(facility.pk)]
+        assert response["ETag"] != etag
+
+        # The validators reuse the paginator's counts, so no other query is made
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url_list)
+        with patch.object(FacilityViewSet, "conditional_requests", False):
+            with CaptureQueriesContext(connection) as unconditional_queries:
+                response = self.client.get(self.url_list)
+        assert "ETag" not in response
+        assert len(queries) == len(unconditional_queries)
+
 
 class FacilityFormTest(LoggedInMixin, TestCase):
     def test_create(self):
@@ -354,6 +494,45 @@ class FacilityFormTest(LoggedInMixin, TestCase):
             302,
         )
 
+    def test_create_with_administrative_units(self):
+        data = {
+            "name": fake.name(),
+            "mfl_code": random.randint(1, 999_999_999),
+            "county": "Nairobi",
+            "sub_county": "Dagoretti North",
+            "constituency": "",
+            "ward": "Kilimani",
+            "is_fahari_facility": True,
+            "operation_status": "Operational",
+            "lon": 0.0,
+            "lat": 0.0,
+            "organisation": self.global_organisation.pk,
+        }
+        response = self.client.post(reverse("common:facility_create"), data=data)
+        self.assertEqual(response.status_code, 302)
+        facility = Facility.objects.get(name=data["name"])
+        assert facility.sub_county == "Dagoretti North"
+        assert facility.constituency is None
+        assert facility.ward == "Kilimani"
+
+    def test_render_only_selected_administrative_units(self):
+        facility = baker.make(
+            Facility,
+            county="Nairobi",
+            is_fahari_facility=True,
+            organisation=self.global_organisation,
+            sub_county="Dagoretti North",
+            ward="Kilimani",
+        )
+        response = self.client.get(reverse("common:facility_update", kwargs={"pk": facility.pk}))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        wards_url = reverse("common:administrative_units", kwargs={"unit_type": "wards"})
+        assert 'data-choices_url="%s"' % wards_url in content
+        assert 'data-parent_field="sub_county"' in content
+        assert '<option value="Kilimani" selected>Kilimani</option>' in content
+        assert 'value="Korogocho"' not in content
+
     def test_update(self):
         facility = baker.make(
             Facility,
@@ -427,6 +606,19 @@ class SystemViewsetTest(LoggedInMixin, APITestCase):
         names = [a["name"] for a in response.data["results"]]
         assert system.name in names
 
+    def test_retrieve_systems_search(self):
+        system, other = (
+            baker.make(System, name=name, organisation=self.global_organisation)
+            for name in ("Kenya EMR", "DHIS2")
+        )
+
+        response = self.client.get(f"{self.url_list}?search=emr")
+        assert response.status_code == 200, response.json()
+
+        names = [a["name"] for a in response.data["results"]]
+        assert system.name in names
+        assert other.name not in names
+
     def test_patch_system(self):
         system = baker.make(
             System,
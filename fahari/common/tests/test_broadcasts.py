@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from model_bakery import baker
+
+from config.asgi import application as asgi_application
+from fahari.common.broadcasts import get_organisation_group, publish_change_event
+from fahari.common.models import Facility, System, UserFacilityAllotment
+from fahari.ops.models import DailyUpdate, FacilitySystem, FacilitySystemTicket
+
+# The consumer reads the allotments from another thread, so the test data must be committed
+pytestmark = pytest.mark.django_db(transaction=True)
+
+LIVE_UPDATES_PATH = "/ws/common/live_updates/"
+
+
+def test_change_events(user, django_capture_on_commit_callbacks):
+    organisation = user.organisation
+    facility = baker.make(Facility, organisation=organisation)
+
+    with patch("fahari.common.broadcasts._send") as send:
+        with django_capture_on_commit_callbacks(execute=True):
+            update = baker.make(DailyUpdate, facility=facility, organisation=organisation)
+            update.total = 10
+            update.save()
+            ticket = baker.make(
+                FacilitySystemTicket,
+                facility_system=baker.make(
+                    FacilitySystem, facility=facility, organisation=organisation
+                ),
+                organisation=organisation,
+            )
+            ticket_pk = ticket.pk
+            ticket.delete()
+            baker.make(System, organisation=organisation)  # Systems are not broadcast
+
+    group = get_organisation_group(organisation.pk)
+    events = [call.args for call in send.call_args_list]
+    assert [(g, e["model"], e["action"], e["id"]) for g, e in events] == [
+        (group, "ops.dailyupdate", "created", str(update.pk)),
+        (group, "ops.dailyupdate", "updated", str(update.pk)),
+        (group, "ops.facilitysystemticket", "created", str(ticket_pk)),
+        (group, "ops.facilitysystemticket", "deleted", str(ticket_pk)),
+    ]
+    assert {e["facility"] for _, e in events} == {str(facility.pk)}
+
+
+def test_publish_change_event_failure(caplog, django_capture_on_commit_callbacks):
+    layer = Mock(group_send=AsyncMock(side_effect=ConnectionError("The layer is down")))
+
+    with patch("fahari.common.broadcasts.get_channel_layer", return_value=layer):
+        with django_capture_on_commit_callbacks(execute=True):
+            publish_change_event("abc", {"id": "1"})
+    layer.group_send.assert_called_once()
+    assert "Failed to broadcast the change event" in caplog.text
+
+
+def test_live_updates_off(settings, django_capture_on_commit_callbacks):
+    settings.CHANNEL_LAYERS = {}
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        publish_change_event("abc", {"id": "1"})
+    assert not callbacks
+
+
+@pytest.mark.asyncio
+async def test_live_updates_consumer_when_off(settings) -> None:
+    settings.CHANNEL_LAYERS = {}
+
+    communicator = WebsocketCommunicator(
+        asgi_application, LIVE_UPDATES_PATH, headers=[(b"origin", b"...")]
+    )
+    connected, code = await communicator.connect()
+    assert not connected
+    assert code == 1013
+
+
+@pytest.mark.asyncio
+async def test_live_updates_consumer(async_client, user) -> None:
+    communicator = WebsocketCommunicator(asgi_application, LIVE_UPDATES_PATH)
+    connected, _ = await communicator.connect()
+    assert not connected  # The user is not authenticated
+
+    def make_facilities():
+        baker.make(
+            UserFacilityAllotment,
+            allotment_type=UserFacilityAllotment.AllotmentType.BY_REGION.value,
+            counties=["Nairobi"],
+            organisation=user.organisation,
+            region_type=UserFacilityAllotment.RegionType.COUNTY.value,
+            user=user,
+        )
+        return [
+            baker.make(Facility, county=county, organisation=user.organisation)
+            for county in ("Kajiado", "Nairobi")
+        ]
+
+    other, allotted = await database_sync_to_async(make_facilities)()
+    await database_sync_to_async(lambda: async_client.force_login(user))()
+    headers = [
+        (b"origin", b"..."),
+        (b"cookie", async_client.cookies.output(header="", sep="; ").encode()),
+    ]
+    communicator = WebsocketCommunicator(asgi_application, LIVE_UPDATES_PATH, headers=headers)
+    connected, _ = await communicator.connect()
+    assert connected
+
+    def make_updates():
+        for facility in (other, allotted):
+            baker.make(DailyUpdate, facility=facility, organisation=facility.organisation)
+
+    await database_sync_to_async(make_updates)()
+    event = await communicator.receive_json_from()
+    assert event["model"] == "ops.dailyupdate"
+    assert event["facility"] == str(allotted.pk)
+    assert await communicator.receive_nothing()  # The other facility is not allotted
+    await communicator.disconnect()
@@ -0,0 +1,264 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+from openpyxl import Workbook
+from requests import ConnectionError
+
+from fahari.common.management.commands.benchmark_async_reads import ENDPOINTS
+from fahari.common.management.commands.benchmark_indexes import INDEX_SUITE, QUERY_SHAPES
+from fahari.common.management.commands.load_facilities import FACILITY_COLUMNS
+from fahari.common.models import ChunkedUpload, Facility, ImageRendition, Organisation
+from fahari.common.outbox import queue_email
+from fahari.common.search import get_search_query
+
+from .test_mfl_api_utils import FAKE_MFL_API, FakeMFLTransport
+
+pytestmark = pytest.mark.django_db
+
+
+def make_mfl_record(code, name, **overrides):
+    record = {column: None for column, _ in FACILITY_COLUMNS.values()}
+    record.update(
+        {
+            "Code": code,
+            "Name": name,
+            "County": "Nairobi",
+            "Sub county": "Westlands",
+            "Ward": "Kangemi",
+            "Operation status": "Operational",
+            "Keph level": "Level 2",
+            "Beds": 2,
+            "Cots": None,
+            "Approved": "Yes",
+            "Closed": "No",
+        }
+    )
+    record.update(overrides)
+    return record
+
+
+def make_mfl_workbook(path, records):
+    workbook = Workbook()
+    worksheet = workbook.active
+    header = list(records[0].keys())
+    worksheet.append(header)
+    for record in records:
+        worksheet.append([record[column] for column in header])
+    workbook.save(path)
+    return str(path)
+
+
+def test_load_facilities(tmp_path):
+    organisation = baker.make(Organisation)
+    unchanged = baker.make(Facility, mfl_code=1, organisation=organisation)
+    changed = baker.make(Facility, mfl_code=2, organisation=organisation, beds=0)
+    unchanged_record = make_mfl_record(1, unchanged.name)
+    for field, (column, _) in FACILITY_COLUMNS.items():
+        unchanged_record[column] = getattr(unchanged, field)
+    for column in (
+        "Approved",
+        "Closed",
+        "Open_late_night",
+        "Open_public_holidays",
+        "Open_weekends",
+        "Open_whole_day",
+        "Public visible",
+    ):
+        unchanged_record[column] = "Yes" if unchanged_record[column] else "No"
+
+    source = make_mfl_workbook(
+        tmp_path / "mfl.xlsx",
+        [
+            unchanged_record,
+            make_mfl_record(2, changed.name, Beds=10),
+            make_mfl_record(3, "Kangemi Health Centre"),
+            make_mfl_record(4, "Kangemi Health Centre"),  # Duplicate name
+            make_mfl_record(5, "Wrong Ward Dispensary", Ward="Ngong"),
+            make_mfl_record(None, "No Code Clinic"),
+        ],
+    )
+    stdout, stderr = StringIO(), StringIO()
+    call_command(
+        "load_facilities",
+        source,
+        organisation=str(organisation.pk),
+        batch_size=2,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert "1 created, 1 updated, 1 unchanged, 2 skipped" in stdout.getvalue()
+    assert "Skipped facility 4" in stderr.getvalue()
+    assert "Skipped facility 5" in stderr.getvalue()
+    changed.refresh_from_db()
+    assert changed.beds == 10
+    created = Facility.objects.get(mfl_code=3)
+    assert created.organisation == organisation
+    assert (created.ward, created.beds, created.cots) == ("Kangemi", 2, 0)
+    assert not Facility.objects.filter(mfl_code__in=(4, 5)).exists()
+    assert Facility.objects.filter(search_vector=get_search_query("kangemi")).get() == created
+
+    # Re-loading the same workbook is a no-op
+    stdout = StringIO()
+    call_command("load_facilities", source, organisation=str(organisation.pk), stdout=stdout)
+    assert "0 created, 0 updated, 3 unchanged, 2 skipped" in stdout.getvalue()
+
+
+def test_load_facilities_default_organisation(tmp_path):
+    source = make_mfl_workbook(tmp_path / "mfl.xlsx", [make_mfl_record(1, "Kangemi Clinic")])
+    call_command("load_facilities", source, stdout=StringIO())
+    assert Facility.objects.get(mfl_code=1).organisation.code == 1
+
+
+def test_load_facilities_invalid_input(tmp_path):
+    with pytest.raises(CommandError, match="organisation does not exist"):
+        call_command("load_facilities", organisation="not-a-uuid")
+    with pytest.raises(CommandError, match="does not exist"):
+        call_command("load_facilities", str(tmp_path / "missing.xlsx"))
+
+
+@override_settings(MFL_API=FAKE_MFL_API)
+def test_sync_facility_coordinates():
+    organisation = baker.make(Organisation)
+    located = baker.make(Facility, mfl_code=1, lat=-1.0, lon=36.0, organisation=organisation)
+    not_located = baker.make(Facility, mfl_code=2, organisation=organisation)
+    no_mfl_coordinates = baker.make(Facility, mfl_code=3, organisation=organisation)
+
+    stdout = StringIO()
+    call_command("sync_facility_coordinates", only_missing=True, stdout=stdout)
+    assert "Fetched the coordinates of 2 facilities" in stdout.getvalue()
+    assert "updated 1 facilities" in stdout.getvalue()
+    located.refresh_from_db()
+    assert (located.lat, located.lon) == (-1.0, 36.0)
+    not_located.refresh_from_db()
+    assert (not_located.lat, not_located.lon) == (-4.0435, 39.6682)
+
+    call_command("sync_facility_coordinates", workers=2, stdout=StringIO())
+    located.refresh_from_db()
+    assert (located.lat, located.lon) == (-1.2921, 36.8219)
+    no_mfl_coordinates.refresh_from_db()
+    assert no_mfl_coordinates.location is None
+
+
+@override_settings(MFL_API=FAKE_MFL_API)
+def test_sync_facility_coordinates_fetch_error():
+    with patch.object(FakeMFLTransport, "get_page", side_effect=ConnectionError("offline")):
+        with pytest.raises(CommandError, match="offline"):
+            call_command("sync_facility_coordinates")
+
+
+def test_benchmark_indexes():
+    stdout = StringIO()
+    call_command("benchmark_indexes", organisations=2, scale=1, repeat=1, stdout=stdout)
+
+    output = stdout.getvalue()
+    for label in QUERY_SHAPES:
+        assert f"{label}: " in output
+    assert "Plan without the index suite" in output
+    assert "Plan with the index suite" in output
+    # The seeded data and the dropped indexes are rolled back
+    assert not Organisation.objects.filter(organisation_name__startswith="Benchmark").exists()
+    with connection.cursor() as cursor:
+        for model, index_name in INDEX_SUITE:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+            assert index_name in constraints
+
+
+def test_update_search_vectors():
+    facility = baker.make(Facility, name="Mbagathi District Hospital")
+    Facility.objects.filter(pk=facility.pk).update(mfl_code=99999)
+
+    stdout = StringIO()
+    call_command("update_search_vectors", stdout=stdout)
+    assert "search vectors of" in stdout.getvalue()
+    assert Facility.objects.filter(search_vector=get_search_query("99999")).get() == facility
+
+
+def test_send_queued_emails(mailoutbox):
+    queue_email(
+        subject="Fahari System Account Pending Approval",
+        template_name="emails/mjml/account_pending_approval_user.mjml",
+        context={"user": {"name": "Wanjiku Kamau"}},
+        to=["wanjiku@example.com"],
+    )
+
+    stdout = StringIO()
+    call_command("send_queued_emails", stdout=stdout)
+    assert "1 sent, 0 to be retried, 0 failed" in stdout.getvalue()
+    assert len(mailoutbox) == 1
+
+    stdout = StringIO()
+    with patch("time.sleep", side_effect=KeyboardInterrupt) as sleep:
+        call_command("send_queued_emails", loop=True, interval=2, stdout=stdout)
+    sleep.assert_called_once_with(2)
+    assert stdout.getvalue() == "Stopped delivering emails.\n"
+
+
+def test_generate_renditions():
+    organisation = baker.make(Organisation)
+    baker.make(
+        "ops.StockReceiptVerification",
+        delivery_note_image="notes/a.jpg",
+        facility=baker.make(Facility, organisation=organisation),
+        organisation=organisation,
+    )
+
+    stdout = StringIO()
+    with patch("fahari.common.renditions.render_image", return_value={}) as render_image:
+        call_command("generate_renditions", backfill=True, stdout=stdout)
+    render_image.assert_called_once()
+    assert "Queued 1 existing images." in stdout.getvalue()
+    assert "1 ready, 0 to be retried, 0 failed" in stdout.getvalue()
+    assert ImageRendition.objects.get(source="notes/a.jpg").status == ImageRendition.Status.READY
+
+    stdout = StringIO()
+    with patch("time.sleep", side_effect=KeyboardInterrupt) as sleep:
+        call_command("generate_renditions", loop=True, interval=2, stdout=stdout)
+    sleep.assert_called_once_with(2)
+    assert stdout.getvalue() == "Stopped generating renditions.\n"
+
+
+def test_purge_stale_uploads(settings):
+    settings.CHUNKED_UPLOAD_STORAGE = "django.core.files.storage.FileSystemStorage"
+    upload = baker.make(ChunkedUpload, filename="notes.txt", size=4)
+    ChunkedUpload.objects.filter(pk=upload.pk).update(updated=timezone.now() - timedelta(hours=12))
+
+    stdout = StringIO()
+    call_command("purge_stale_uploads", max_age=24, stdout=stdout)
+    assert "Deleted 0 stale uploads." in stdout.getvalue()
+    call_command("purge_stale_uploads", max_age=6, stdout=stdout)
+    assert "Deleted 1 stale uploads." in stdout.getvalue()
+    assert not ChunkedUpload.objects.exists()
+
+    stdout = StringIO()
+    with patch("time.sleep", side_effect=KeyboardInterrupt) as sleep:
+        call_command("purge_stale_uploads", loop=True, interval=60, stdout=stdout)
+    sleep.assert_called_once_with(60)
+    assert stdout.getvalue() == "Deleted 0 stale uploads.\nStopped deleting stale uploads.\n"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_async_reads(user_with_all_permissions):
+    stdout = StringIO()
+    call_command(
+        "benchmark_async_reads",
+        user_with_all_permissions.username,
+        concurrency=2,
+        requests=4,
+        stdout=stdout,
+    )
+
+    output = stdout.getvalue()
+    for label, _, _ in ENDPOINTS:
+        assert f"{label}: " in output
+    assert output.count(", 0 failures.") == 2 * len(ENDPOINTS)
+
+    with pytest.raises(CommandError, match="does not exist"):
+        call_command("benchmark_async_reads", "nobody")
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from fahari.common.utils import (
+    MFLTransport,
+    RequestsMFLTransport,
+    get_mfl_transport,
+    iter_mfl_records,
+)
+
+FAKE_MFL_PAGES = {
+    1: {"total_pages": 3, "results": [{"code": 1, "lat": -1.2921, "long": 36.8219}]},
+    2: {"total_pages": 3, "results": [{"code": 2, "lat": -4.0435, "long": 39.6682}]},
+    3: {"total_pages": 3, "results": [{"code": 3, "lat": None, "long": None}]},
+}
+
+
+class FakeMFLTransport(MFLTransport):
+    """Serves the MFL API pages defined in `FAKE_MFL_PAGES`."""
+
+    def get_page(self, page):
+        return FAKE_MFL_PAGES[page]
+
+
+FAKE_MFL_API = {
+    "TOKEN": "token",
+    "TRANSPORT": "fahari.common.tests.test_mfl_api_utils.FakeMFLTransport",
+    "URL": "http://mfl.test/api/facilities/",
+}
+
+
+@override_settings(MFL_API=FAKE_MFL_API)
+def test_get_mfl_transport():
+    transport = get_mfl_transport(pool_size=4)
+    assert isinstance(transport, FakeMFLTransport)
+    assert transport.url == "http://mfl.test/api/facilities/"
+    assert transport.token == "token"
+    assert transport.pool_size == 4
+    assert get_mfl_transport(url="http://localhost:8000/").url == "http://localhost:8000/"
+
+
+@override_settings(MFL_API={**FAKE_MFL_API, "TRANSPORT": "fahari.common.tests.NoSuchTransport"})
+def test_get_mfl_transport_improperly_configured():
+    with pytest.raises(ImproperlyConfigured):
+        get_mfl_transport()
+
+
+@override_settings(MFL_API=FAKE_MFL_API)
+def test_iter_mfl_records():
+    transport = get_mfl_transport()
+    records = list(iter_mfl_records(transport, max_workers=2))
+    assert [record["code"] for record in records] == [1, 2, 3]
+    transport.close()
+
+
+def test_requests_mfl_transport():
+    transport = RequestsMFLTransport(
+        url="http://mfl.test/api/facilities/", token="token", pool_size=4, page_size=50, timeout=5
+    )
+    assert transport.session.headers["Authorization"] == "Bearer token"
+    assert transport.session.get_adapter("https://mfl.test")._pool_maxsize == 4
+
+    response = MagicMock()
+    response.json.return_value = FAKE_MFL_PAGES[2]
+    with patch.object(transport.session, "get", return_value=response) as get:
+        assert transport.get_page(2) == FAKE_MFL_PAGES[2]
+
+    get.assert_called_once_with(
+        "http://mfl.test/api/facilities/",
+        params={"fields": RequestsMFLTransport.fields, "page": 2, "page_size": 50},
+        timeout=5,
+    )
+    response.raise_for_status.assert_called_once_with()
+    transport.close()
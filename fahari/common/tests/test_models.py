@@ -3,13 +3,14 @@ import os
 import tempfile
 import uuid
 from random import randint
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files import File
+from django.db.models.fields.files import FieldFile
 from django.test import TestCase
 from django.utils import timezone
 from faker import Faker
@@ -18,6 +19,7 @@ from PIL import Image
 
 from fahari.common.models import (
     Facility,
+    FacilityAttachment,
     Organisation,
     OwnerlessAbstractBase,
     System,
@@ -73,6 +75,72 @@ def test_facility_string_representation():
     assert str(facility) == f"{facility_name} - {mfl_code} (Nairobi)"
 
 
+def test_facility_location_is_derived_from_coordinates():
+    org = baker.make(Organisation)
+    facility = baker.make(Facility, lat=-1.2921, lon=36.8219, organisation=org)
+    assert facility.location.y == pytest.approx(-1.2921)
+    assert facility.location.x == pytest.approx(36.8219)
+
+    facility.lat, facility.lon = 0.0, 0.0
+    facility.save()
+    assert facility.location is None
+
+
+def test_facility_get_location_for_coordinates():
+    assert Facility.get_location_for_coordinates(None, 36.8219) is None
+    assert Facility.get_location_for_coordinates(0.0, 0.0) is None
+    assert Facility.get_location_for_coordinates(0.0, 0.0, allow_origin=True).coords == (0, 0)
+    assert Facility.get_location_for_coordinates(-1.2921, 36.8219).srid == 4326
+
+
+def test_facility_geospatial_queries():
+    org = baker.make(Organisation)
+    nairobi = baker.make(Facility, lat=-1.2921, lon=36.8219, organisation=org)
+    kajiado = baker.make(Facility, lat=-1.8524, lon=36.7768, organisation=org)
+    mombasa = baker.make(Facility, lat=-4.0435, lon=39.6682, organisation=org)
+    baker.make(Facility, lat=0.0, lon=0.0, organisation=org)  # No known location
+
+    within_radius = list(Facility.objects.within_radius(-1.2921, 36.8219, 100))
+    assert within_radius == [nairobi, kajiado]
+    assert within_radius[0].distance.km == pytest.approx(0, abs=0.01)
+    assert within_radius[1].distance.km == pytest.approx(62, rel=0.05)
+
+    assert list(Facility.objects.nearest(-4.0, 39.6, 2)) == [mombasa, kajiado]
+    assert list(Facility.objects.annotate_with_distance(-4.0, 39.6))[:3] == [
+        mombasa,
+        kajiado,
+        nairobi,
+    ]
+    assert set(Facility.objects.within_bounding_box(36.5, -2.0, 37.0, -1.0)) == {
+        nairobi,
+        kajiado,
+    }
+
+
+def test_facility_bulk_update_coordinates():
+    org = baker.make(Organisation)
+    updated_by = uuid.uuid4()
+    unchanged = baker.make(Facility, lat=-1.2921, lon=36.8219, organisation=org)
+    changed = baker.make(Facility, lat=0.0, lon=0.0, organisation=org)
+
+    updated = Facility.objects.bulk_update_coordinates(
+        {
+            unchanged.mfl_code: (-1.2921, 36.8219),
+            changed.mfl_code: (-4.0435, 39.6682),
+            999_999_999: (0.5, 35.0),  # Unknown MFL code
+        },
+        updated_by=updated_by,
+    )
+    assert updated == 1
+
+    changed.refresh_from_db()
+    assert (changed.lat, changed.lon) == (-4.0435, 39.6682)
+    assert changed.location.coords == pytest.approx((39.6682, -4.0435))
+    assert changed.updated_by == updated_by
+    unchanged.refresh_from_db()
+    assert unchanged.updated_by != updated_by
+
+
 def test_google_application_credentials():
     cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
     assert cred_path != ""
@@ -851,3 +919,64 @@ class UserFacilityAllotmentTest(TestCase):
         allotment.save()
 
         assert UserFacilityAllotment.get_facilities_for_allotment(allotment).count() == 50
+
+
+def test_facility_attachment_unchanged_image_is_not_revalidated():
+    facility = baker.make(Facility)
+    facility_attachment = baker.make(
+        FacilityAttachment,
+        content_type="text/plain",
+        data="org/common/facilityattachment/photo.png",  # Already stored
+        facility=facility,
+        organisation=facility.organisation,
+    )
+    facility_attachment = FacilityAttachment.objects.get(pk=facility_attachment.pk)
+    facility_attachment.content_type = "image/png"
+    facility_attachment.size = 1024
+    facility_attachment.aspect_ratio = "4:3"
+    with patch("fahari.common.models.base_models.get_image_dimensions") as get_dimensions:
+        facility_attachment.validate_image_size()
+        get_dimensions.assert_not_called()
+
+        # New attachments and changed files are always validated
+        get_dimensions.return_value = (None, None)
+        new_attachment = baker.prepare(
+            FacilityAttachment,
+            content_type="image/png",
+            data="org/common/facilityattachment/photo.png",
+            size=1024,
+            aspect_ratio="4:3",
+        )
+        facility_attachment.data = "org/common/facilityattachment/another_photo.png"
+        for attachment in (new_attachment, facility_attachment):
+            get_dimensions.reset_mock()
+            with pytest.raises(ValidationError) as e:
+                attachment.validate_image_size()
+            get_dimensions.assert_called_once_with(attachment.data)
+            assert "The attachment is not a valid image." in e.value.messages
+
+
+def test_facility_attachment_image_size_and_aspect_ratio_are_saved():
+    facility = baker.make(Facility)
+    facility_attachment = baker.make(
+        FacilityAttachment,
+        content_type="text/plain",
+        data="org/common/facilityattachment/notes.txt",
+        facility=facility,
+        organisation=facility.organisation,
+    )
+    facility_attachment = FacilityAttachment.objects.get(pk=facility_attachment.pk)
+    facility_attachment.content_type = "image/png"
+    facility_attachment.data = "org/common/facilityattachment/photo.png"
+    with patch(
+        "fahari.common.models.base_models.get_image_dimensions", return_value=(400, 300)
+    ) as get_dimensions, patch.object(FieldFile, "size", new_callable=PropertyMock) as size:
+        size.return_value = 2048
+        facility_attachment.save(update_fields=["content_type", "data"])
+        get_dimensions.reset_mock()
+        facility_attachment.save()
+        get_dimensions.assert_not_called()
+
+    facility_attachment.refresh_from_db()
+    assert facility_attachment.size == 2048
+    assert facility_attachment.aspect_ratio == "4:3"
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from fahari.common import outbox
+from fahari.common.models import OutboundEmail
+from fahari.common.outbox import (
+    MAX_DELIVERY_ATTEMPTS,
+    MAX_RETRY_BACKOFF,
+    RETRY_BACKOFF,
+    deliver_queued_emails,
+    get_email_template,
+    get_retry_backoff,
+    queue_email,
+)
+
+pytestmark = pytest.mark.django_db
+
+TEMPLATE_NAME = "emails/mjml/account_approved.mjml"
+
+
+def queue_test_email(**kwargs):
+    return queue_email(
+        subject="Fahari System Account Approved",
+        template_name=TEMPLATE_NAME,
+        context={"user": {"name": "Wanjiku Kamau"}},
+        **{"to": ["wanjiku@example.com"], **kwargs},
+    )
+
+
+def test_queue_email(mailoutbox, settings):
+    email = queue_test_email(reply_to=["support@example.com"])
+
+    assert not mailoutbox  # Nothing is sent until the worker delivers the email
+    assert email.status == OutboundEmail.Status.PENDING
+    assert email.from_email == settings.SERVER_EMAIL
+    assert "Wanjiku Kamau" in email.body
+    assert "<mj-" not in email.body
+    assert str(email) == "Fahari System Account Approved (pending)"
+    assert queue_test_email(to=[]) is None
+
+
+def test_deliver_queued_emails(mailoutbox):
+    emails = [queue_test_email() for _ in range(3)]
+    later = queue_test_email()
+    OutboundEmail.objects.filter(pk=later.pk).update(
+        next_attempt_at=timezone.now() + timedelta(hours=1)
+    )
+
+    assert deliver_queued_emails(batch_size=2) == (2, 0, 0)
+    assert deliver_queued_emails(batch_size=2) == (1, 0, 0)
+    assert deliver_queued_emails() == (0, 0, 0)
+
+    assert len(mailoutbox) == 3
+    message = mailoutbox[0]
+    assert message.subject == "Fahari System Account Approved"
+    assert message.to == ["wanjiku@example.com"]
+    assert message.content_subtype == "html"
+    for email in emails:
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.SENT
+        assert email.attempts == 1
+        assert email.sent_at is not None
+    assert OutboundEmail.objects.get(pk=later.pk).status == OutboundEmail.Status.PENDING
+
+
+def test_deliver_queued_emails_retries(mailoutbox):
+    email = queue_test_email()
+
+    with patch.object(EmailBackend, "send_messages", side_effect=ConnectionError("refused")):
+        assert deliver_queued_emails() == (0, 1, 0)
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.last_error == "ConnectionError: refused"
+        assert email.next_attempt_at > timezone.now() + RETRY_BACKOFF / 2
+
+        # The email is not retried before its backoff elapses
+        assert deliver_queued_emails() == (0, 0, 0)
+
+        OutboundEmail.objects.update(
+            attempts=MAX_DELIVERY_ATTEMPTS - 1, next_attempt_at=timezone.now()
+        )
+        assert deliver_queued_emails() == (0, 0, 1)
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.FAILED
+        assert email.attempts == MAX_DELIVERY_ATTEMPTS
+
+    assert deliver_queued_emails() == (0, 0, 0)
+    assert not mailoutbox
+
+
+def test_get_retry_backoff():
+    assert get_retry_backoff(1) == RETRY_BACKOFF
+    assert get_retry_backoff(3) == RETRY_BACKOFF * 4
+    assert get_retry_backoff(MAX_DELIVERY_ATTEMPTS * 4) == MAX_RETRY_BACKOFF
+
+
+def test_get_email_template_is_compiled_once():
+    get_email_template.cache_clear()
+    with patch.object(outbox, "mjml_render", wraps=outbox.mjml_render) as mjml_render:
+        queue_test_email()
+        queue_test_email()
+        assert mjml_render.call_count == 1
+
+    get_email_template.cache_clear()
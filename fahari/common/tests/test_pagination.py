@@ -0,0 +1,155 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_datatables.renderers import DatatablesRenderer
+
+from fahari.common.models import Facility, Organisation
+from fahari.common.pagination import (
+    KeysetPagination,
+    PinnedRecordPaginationMixin,
+    estimate_count,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+class PinnedRecordPagination(PinnedRecordPaginationMixin, PageNumberPagination):
+    page_size = 2
+
+
+def paginate(queryset, **query_params):
+    request = Request(APIRequestFactory().get("/", query_params))
+    return PinnedRecordPagination().paginate_queryset(queryset, request)
+
+
+@pytest.fixture
+def facilities():
+    organisation = baker.make(Organisation)
+    now = timezone.now()
+    return [
+        baker.make(Facility, organisation=organisation, updated=now - timedelta(days=days))
+        for days in range(5)
+    ]
+
+
+def test_pinned_record_pagination(facilities, django_assert_num_queries):
+    queryset = Facility.objects.order_by("-updated")
+    newest, _, _, oldest, _ = facilities
+
+    assert paginate(queryset) == facilities[:2]
+    assert paginate(queryset, combobox="not-a-uuid") == facilities[:2]
+
+    # A pinned record is merged into the first page only
+    with django_assert_num_queries(3):  # Count, page and pinned record
+        assert paginate(queryset, combobox=str(oldest.pk)) == [oldest, *facilities[:2]]
+    assert paginate(queryset, combobox=str(oldest.pk), page=2) == [facilities[2]]
+    with django_assert_num_queries(2):  # Count and page
+        assert paginate(queryset, bubble_record=str(facilities[1].pk)) == [
+            facilities[1],
+            newest,
+        ]
+
+    # Without a view, records excluded by the current filters are not pinned
+    filtered = queryset.exclude(pk=oldest.pk)
+    assert paginate(filtered, combobox=str(oldest.pk)) == facilities[:2]
+
+
+class SmallKeysetPagination(KeysetPagination):
+    page_size = 2
+
+
+def keyset_paginate(queryset, datatables=False, **query_params):
+    request = Request(APIRequestFactory().get("/", query_params))
+    if datatables:
+        request.accepted_renderer = DatatablesRenderer()
+    paginator = SmallKeysetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        return page, None
+    return page, paginator.get_paginated_response([record.pk for record in page]).data
+
+
+def cursor_of(link):
+    return parse_qs(urlparse(link).query)["cursor"][0]
+
+
+def test_keyset_pagination(facilities, django_assert_num_queries):
+    queryset = Facility.objects.filter(pk__in=[facility.pk for facility in facilities])
+
+    with django_assert_num_queries(3):  # Count estimate, count and page
+        page, data = keyset_paginate(queryset)
+    assert page == facilities[:2]
+    assert data["count"] == 5
+    assert not data["count_is_estimate"]
+    assert data["previous"] is None
+
+    page, data = keyset_paginate(queryset, cursor=cursor_of(data["next"]))
+    assert page == facilities[2:4]
+    page, data = keyset_paginate(queryset, cursor=cursor_of(data["next"]))
+    assert page == facilities[4:]
+    assert data["next"] is None
+
+    # Paginating backwards
+    page, data = keyset_paginate(queryset, cursor=cursor_of(data["previous"]))
+    assert page == facilities[2:4]
+    page, data = keyset_paginate(queryset, cursor=cursor_of(data["previous"]))
+    assert page == facilities[:2]
+    assert data["previous"] is None
+    page, data = keyset_paginate(queryset, cursor=cursor_of(data["next"]))
+    assert page == facilities[2:4]
+
+    # Pinned records are only merged into the first page
+    oldest = facilities[-1]
+    page, data = keyset_paginate(queryset, combobox=str(oldest.pk))
+    assert page == [oldest, *facilities[:2]]
+    page, _ = keyset_paginate(queryset, combobox=str(oldest.pk), cursor=cursor_of(data["next"]))
+    assert page == facilities[2:4]
+
+    assert keyset_paginate(queryset, page_size=10)[0] == facilities
+    assert keyset_paginate(queryset, page_size="x")[0] == facilities[:2]
+    for cursor in ("not-a-cursor", "W1tdLCBmYWxzZV0="):  # The latter has no position
+        with pytest.raises(NotFound):
+            keyset_paginate(queryset, cursor=cursor)
+
+
+def test_keyset_pagination_incompatible_ordering(facilities):
+    queryset = Facility.objects.filter(pk__in=[facility.pk for facility in facilities]).order_by(
+        "updated"
+    )
+
+    page, data = keyset_paginate(queryset, offset="x")
+    assert page == facilities[::-1][:2]
+    page, data = keyset_paginate(queryset, offset=parse_qs(urlparse(data["next"]).query)["offset"])
+    assert page == facilities[::-1][2:4]
+    assert parse_qs(urlparse(data["previous"]).query)["offset"] == ["0"]
+    with pytest.raises(NotFound):
+        keyset_paginate(queryset, cursor="W1siYSIsICJiIiwgImMiXSwgZmFsc2Vd")
+
+
+def test_keyset_pagination_counts(facilities, monkeypatch):
+    queryset = Facility.objects.filter(pk__in=[facility.pk for facility in facilities])
+    assert estimate_count(queryset) >= 1
+
+    monkeypatch.setattr(SmallKeysetPagination, "exact_count_threshold", 0)
+    _, data = keyset_paginate(queryset)
+    assert data["count_is_estimate"]
+    _, data = keyset_paginate(queryset, exact_count="true")
+    assert data["count"] == 5
+    assert not data["count_is_estimate"]
+
+
+def test_keyset_pagination_datatables(facilities):
+    queryset = Facility.objects.filter(pk__in=[facility.pk for facility in facilities])
+
+    page, data = keyset_paginate(queryset, datatables=True, start=2, length=2)
+    assert page == facilities[2:4]
+    assert data["recordsTotal"] == data["recordsFiltered"] == 5
+    assert data["data"] == [facility.pk for facility in facilities[2:4]]
+    assert keyset_paginate(queryset, datatables=True, start=2, length=-1)[0] is None
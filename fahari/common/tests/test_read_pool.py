@@ -0,0 +1,111 @@
+import asyncio
+import contextvars
+import threading
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from fahari.common.constants import WHITELIST_COUNTIES
+from fahari.common.models import Facility, UserFacilityAllotment
+from fahari.common.read_pool import ReadPool, ReadPoolSaturated, get_read_pool
+from fahari.sims.models import QuestionnaireResponses
+
+# The read pool's threads use their own connections, so the test data must be committed
+pytestmark = pytest.mark.django_db(transaction=True)
+
+request_id = contextvars.ContextVar("request_id")
+
+
+@pytest.fixture
+def api_client(user_with_all_permissions):
+    client = APIClient()
+    client.force_login(user_with_all_permissions)
+    return client
+
+
+def test_read_pool():
+    pool = ReadPool(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+        return threading.current_thread().name
+
+    async def run():
+        request_id.set("abc")
+        blocked = asyncio.ensure_future(pool.run(block))
+        queued = asyncio.ensure_future(pool.run(request_id.get))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        with pytest.raises(ReadPoolSaturated):
+            await pool.run(request_id.get)
+        release.set()
+        return await blocked, await queued
+
+    thread_name, context_value = asyncio.run(run())
+    assert thread_name.startswith("read-pool")
+    assert context_value == "abc"
+    # The slots are released once the reads complete
+    assert pool.slots.acquire(blocking=False) and pool.slots.acquire(blocking=False)
+    assert get_read_pool() is get_read_pool()
+
+
+def test_async_read_views(api_client, user_with_all_permissions):
+    user = user_with_all_permissions
+    baker.make(
+        UserFacilityAllotment,
+        allotment_type=UserFacilityAllotment.AllotmentType.BY_REGION.value,
+        counties=WHITELIST_COUNTIES,
+        organisation=user.organisation,
+        region_type=UserFacilityAllotment.RegionType.COUNTY.value,
+        user=user,
+    )
+    facility = baker.make(
+        Facility,
+        county=WHITELIST_COUNTIES[0],
+        is_fahari_facility=True,
+        name="Kanyakine Hospital",
+        operation_status="Operational",
+        organisation=user.organisation,
+    )
+    baker.make(QuestionnaireResponses, facility=facility, organisation=user.organisation)
+
+    for sync_url, async_url in (
+        (reverse("api:facility-list"), reverse("api:async-facility-list")),
+        (
+            reverse("api:facility-detail", kwargs={"pk": facility.pk}),
+            reverse("api:async-facility-detail", kwargs={"pk": facility.pk}),
+        ),
+        (reverse("api:dashboard-metrics"), reverse("api:async-dashboard-metrics")),
+        (
+            reverse("api:questionnaireresponses-list"),
+            reverse("api:async-questionnaireresponses-list"),
+        ),
+    ):
+        response = api_client.get(async_url)
+        assert response.status_code == 200, response.content
+        assert response.json() == api_client.get(sync_url).json()
+
+    response = api_client.get(reverse("api:async-facility-list"), data={"search": "Kanyakine"})
+    assert [result["name"] for result in response.json()["results"]] == [facility.name]
+    response = api_client.get(
+        reverse("api:async-facility-list"),
+        data={"search": "Kanyakine"},
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+    assert response.status_code == 304
+    assert api_client.get(reverse("api:async-dashboard-metrics")).json()["active_facility_count"]
+    assert APIClient().get(reverse("api:async-dashboard-metrics")).status_code == 403
+
+
+def test_async_read_view_saturated_pool(api_client):
+    pool = ReadPool(workers=1, max_pending=0)
+    pool.slots.acquire()
+
+    with patch("fahari.common.views.base_views.async_base_views.get_read_pool", return_value=pool):
+        response = api_client.get(reverse("api:async-facility-list"))
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
@@ -0,0 +1,108 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from PIL import Image
+
+from fahari.common.models import ImageRendition
+from fahari.common.renditions import (
+    MAX_RENDITION_ATTEMPTS,
+    generate_renditions,
+    get_image_urls,
+    get_rendition_name,
+    get_rendition_urls,
+    queue_renditions,
+)
+from fahari.common.templatetags.renditions import rendition_preview
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(location=str(tmp_path), base_url="/media/")
+
+
+def save_image(storage, name, size):
+    content = BytesIO()
+    Image.new("RGB", size, (255, 0, 0)).save(content, "jpeg")
+    return storage.save(name, ContentFile(content.getvalue()))
+
+
+def test_queue_renditions():
+    assert queue_renditions(["notes/a.jpg", "notes/a.jpg", "notes/b.PNG", "notes/c.pdf", ""]) == 2
+    assert queue_renditions(["notes/a.jpg"]) == 1  # Already queued, a no-op
+    assert ImageRendition.objects.count() == 2
+    assert str(ImageRendition.objects.get(source="notes/a.jpg")) == "notes/a.jpg (pending)"
+
+
+def test_get_rendition_name():
+    assert get_rendition_name("org/ops/notes/a.png", "web") == "renditions/web/org/ops/notes/a.jpg"
+
+
+def test_generate_renditions(storage):
+    wide = save_image(storage, "notes/wide.jpg", (2000, 1000))
+    small = save_image(storage, "notes/small.jpg", (100, 100))
+    queue_renditions([wide, small])
+
+    assert generate_renditions(batch_size=1, storage=storage) == (1, 0, 0)
+    assert generate_renditions(storage=storage) == (1, 0, 0)
+    assert generate_renditions(storage=storage) == (0, 0, 0)
+
+    rendition = ImageRendition.objects.get(source=wide)
+    assert rendition.status == ImageRendition.Status.READY
+    with storage.open(rendition.renditions["thumbnail"]) as thumbnail:
+        assert Image.open(thumbnail).size == (320, 160)
+    with storage.open(rendition.renditions["web"]) as web:
+        assert Image.open(web).size == (1600, 800)
+    with storage.open(ImageRendition.objects.get(source=small).renditions["web"]) as web:
+        assert Image.open(web).size == (100, 100)  # Images are never upscaled
+
+    urls = get_rendition_urls([wide, small, "notes/other.jpg", ""], storage=storage)
+    assert set(urls) == {wide, small}
+    assert urls[wide]["thumbnail"] == "/media/renditions/thumbnail/notes/wide.jpg"
+    assert get_rendition_urls([]) == {}
+
+
+def test_generate_renditions_failures(storage):
+    queue_renditions(["notes/missing.jpg"])
+
+    for _ in range(MAX_RENDITION_ATTEMPTS - 1):
+        assert generate_renditions(storage=storage) == (0, 1, 0)
+    assert generate_renditions(storage=storage) == (0, 0, 1)
+
+    rendition = ImageRendition.objects.get()
+    assert rendition.status == ImageRendition.Status.FAILED
+    assert rendition.attempts == MAX_RENDITION_ATTEMPTS
+    assert rendition.last_error.startswith("FileNotFoundError")
+    assert get_rendition_urls([rendition.source], storage=storage) == {}
+
+
+def test_get_image_urls(storage):
+    def field_file(name):
+        return FieldFile(None, FileField(storage=storage), name)
+
+    assert get_image_urls(field_file("")) == {}
+    assert get_image_urls(field_file("notes/a.pdf"), storage=storage) == {}
+
+    # The original is shown until the renditions are ready
+    image = field_file("notes/a.jpg")
+    queue_renditions([image.name])
+    urls = {"thumbnail": "/media/notes/a.jpg", "web": "/media/notes/a.jpg"}
+    assert get_image_urls(image, storage=storage) == urls
+    assert rendition_preview(image)["urls"] == urls
+
+    ImageRendition.objects.filter(source=image.name).update(
+        renditions={
+            "thumbnail": get_rendition_name(image.name, "thumbnail"),
+            "web": get_rendition_name(image.name, "web"),
+        },
+        status=ImageRendition.Status.READY,
+    )
+    assert get_image_urls(image, storage=storage) == {
+        "thumbnail": "/media/renditions/thumbnail/notes/a.jpg",
+        "web": "/media/renditions/web/notes/a.jpg",
+    }
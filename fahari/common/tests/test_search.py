@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection, transaction
+from model_bakery import baker
+
+from fahari.common.models import Facility, Organisation
+from fahari.common.search import (
+    get_search_query,
+    is_full_text_searchable,
+    search,
+    update_search_vectors,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def facilities():
+    organisation = baker.make(Organisation)
+    return [
+        baker.make(
+            Facility,
+            name=name,
+            mfl_code=mfl_code,
+            organisation=organisation,
+            registration_number=registration_number,
+        )
+        for name, mfl_code, registration_number in (
+            ("Kenyatta National Hospital", 13023, "PR-1234"),
+            ("Kangemi Health Centre", 13033, None),
+            ("Mbagathi District Hospital", 13074, "PR-5678"),
+        )
+    ]
+
+
+def test_get_search_query():
+    assert get_search_query("") is None
+    assert get_search_query(" -&!:* ") is None
+    assert get_search_query("Kenyatta") is not None
+
+
+def test_is_full_text_searchable():
+    assert is_full_text_searchable(Facility, ("name", "mfl_code", "registration_number"))
+    assert is_full_text_searchable(Facility, ("^name",))
+    assert not is_full_text_searchable(Facility, ())
+    assert not is_full_text_searchable(Facility, ("name", "county"))
+    assert not is_full_text_searchable(Organisation, ("organisation_name",))
+
+
+def test_search(facilities):
+    kenyatta, kangemi, mbagathi = facilities
+    queryset = Facility.objects.filter(pk__in=[facility.pk for facility in facilities])
+
+    assert set(search(queryset, "hosp")) == {kenyatta, mbagathi}
+    assert set(search(queryset, "kenyatta hosp")) == {kenyatta}
+    assert set(search(queryset, "13033")) == {kangemi}
+    assert set(search(queryset, "PR 5678")) == {mbagathi}
+    # Partial names are matched using the trigram index
+    assert set(search(queryset, "gathi")) == {mbagathi}
+    assert set(search(queryset, "&!")) == set(facilities)
+    assert not search(queryset, "Nairobi").exists()
+
+
+def test_search_uses_indexes(facilities):
+    queryset = search(Facility.objects.all(), "gathi")
+    assert "ILIKE" in str(queryset.query)
+
+    sql, params = queryset.query.sql_with_params()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Tiny tables are scanned regardless, unless scans are discouraged
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("EXPLAIN %s" % sql, params)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+    assert "common_facility_search_idx" in plan
+    assert "common_facility_name_trgm_idx" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_update_search_vectors(facilities):
+    kenyatta, _, _ = facilities
+    queryset = Facility.objects.filter(pk=kenyatta.pk)
+    queryset.update(mfl_code=99999)  # Bypasses `save`
+    assert not search(queryset, "99999").exists()
+
+    assert update_search_vectors(queryset) == 1
+    assert set(search(queryset, "99999")) == {kenyatta}
+
+    kenyatta.refresh_from_db()
+    kenyatta.registration_number = "PR-4321"
+    kenyatta.save()
+    assert set(search(queryset, "PR 4321")) == {kenyatta}
@@ -0,0 +1,198 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from PIL import Image
+from rest_framework.test import APIClient
+
+from fahari.common.models import ChunkedUpload, Facility, FacilityAttachment, ImageRendition
+from fahari.common.uploads import PartsStream, get_referenced_files, purge_stale_uploads
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def storage(settings):
+    settings.CHUNKED_UPLOAD_STORAGE = "django.core.files.storage.FileSystemStorage"
+    return FileSystemStorage()
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def make_image() -> bytes:
+    content = io.BytesIO()
+    Image.new("RGB", (64, 48), (255, 0, 0)).save(content, "png")
+    return content.getvalue()
+
+
+def put_part(client, upload_id, number, content):
+    return client.put(
+        reverse("api:chunkedupload-parts", kwargs={"pk": upload_id, "number": number}),
+        data=content,
+        content_type="application/octet-stream",
+    )
+
+
+def test_parts_stream(storage):
+    parts = [
+        (storage.save(f"parts/{n}", ContentFile(c)), len(c))
+        for n, c in enumerate([b"abc", b"defg", b"h"])
+    ]
+
+    with PartsStream(storage, parts) as stream:
+        assert stream.read() == b"abcdefgh"
+        assert stream.seek(2) == 2
+        assert stream.read(4) == b"cdef"
+        assert stream.seek(-1, io.SEEK_END) == 7
+        assert stream.read() == b"h"
+        assert stream.seek(-3, io.SEEK_CUR) == 5
+        assert stream.read(2) == b"fg"
+        assert b"".join(File(stream).chunks(chunk_size=3)) == b"abcdefgh"
+
+    with PartsStream(storage, [(parts[0][0], 5)]) as stream:
+        with pytest.raises(IOError):
+            stream.read()
+
+
+def test_chunked_upload(api_client, storage, django_capture_on_commit_callbacks):
+    image = make_image()
+    response = api_client.post(
+        reverse("api:chunkedupload-list"),
+        data={"filename": "delivery note.png", "content_type": "image/png", "size": len(image)},
+    )
+    assert response.status_code == 201, response.json()
+    upload_id = response.data["id"]
+    assert response.data["status"] == ChunkedUpload.Status.PENDING
+
+    # Parts can be uploaded in any order and retried
+    middle = len(image) // 2
+    assert put_part(api_client, upload_id, 2, image[middle:]).status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        assert put_part(api_client, upload_id, 1, b"corrupted").status_code == 200
+        response = put_part(api_client, upload_id, 1, image[:middle])
+    assert response.status_code == 200, response.json()
+    assert response.data["parts"] == {"1": middle, "2": len(image) - middle}
+    assert response.data["received_size"] == len(image)
+    assert len(storage.listdir(f"uploads/staging/{upload_id}")[1]) == 2
+
+    detail_url = reverse("api:chunkedupload-detail", kwargs={"pk": upload_id})
+    assert api_client.get(detail_url).data["parts"] == response.data["parts"]
+
+    complete_url = reverse("api:chunkedupload-complete", kwargs={"pk": upload_id})
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(complete_url)
+    assert response.status_code == 200, response.json()
+    assert response.data["status"] == ChunkedUpload.Status.COMPLETE
+    assert response.data["parts"] == {}
+    name = response.data["file"]
+    assert name == f"uploads/files/{upload_id}/delivery_note.png"
+    with storage.open(name) as uploaded:
+        assert uploaded.read() == image
+    assert storage.listdir(f"uploads/staging/{upload_id}")[1] == []
+    assert ImageRendition.objects.filter(source=name).exists()
+
+    # Completing an upload again, e.g. after a dropped response, is a no-op
+    assert api_client.post(complete_url).data["file"] == name
+    response = put_part(api_client, upload_id, 3, b"late")
+    assert response.status_code == 400
+    assert "The upload is already complete." in response.json()
+
+
+def test_chunked_upload_errors(api_client, user, storage, settings):
+    settings.CHUNKED_UPLOAD_MAX_PART_SIZE = 8
+    response = api_client.post(
+        reverse("api:chunkedupload-list"),
+        data={"filename": "notes.txt", "size": settings.CHUNKED_UPLOAD_MAX_SIZE + 1},
+    )
+    assert response.status_code == 400
+    assert "size" in response.json()
+
+    upload = baker.make(ChunkedUpload, filename="photo.jpg", size=12, created_by=user.pk)
+    complete_url = reverse("api:chunkedupload-complete", kwargs={"pk": upload.pk})
+
+    assert "No parts were uploaded." in api_client.post(complete_url).json()
+    assert "Part numbers start at 1." in put_part(api_client, upload.pk, 0, b"data").json()
+    assert "The part is empty." in put_part(api_client, upload.pk, 1, b"").json()
+    assert (
+        "A part can't be larger than 8 bytes."
+        in put_part(api_client, upload.pk, 1, b"9" * 9).json()
+    )
+    assert put_part(api_client, upload.pk, 3, b"12345678").status_code == 200
+    response = put_part(api_client, upload.pk, 4, b"12345678")
+    assert "The parts are larger than the size of the file." in response.json()
+    assert "The parts 1, 2 are missing." in api_client.post(complete_url).json()
+    assert put_part(api_client, upload.pk, 1, b"12").status_code == 200
+    assert put_part(api_client, upload.pk, 2, b"1").status_code == 200
+    assert "Received 11 of the 12 bytes of the file." in api_client.post(complete_url).json()
+    assert put_part(api_client, upload.pk, 2, b"12").status_code == 200
+    assert "The file is not a valid image." in api_client.post(complete_url).json()
+
+    # Other users' uploads can't be used
+    other_upload = baker.make(ChunkedUpload, filename="photo.jpg", size=12)
+    assert put_part(api_client, other_upload.pk, 1, b"12").status_code == 404
+
+
+def test_abort_chunked_upload(api_client, user, storage, django_capture_on_commit_callbacks):
+    upload = baker.make(ChunkedUpload, filename="notes.txt", size=4, created_by=user.pk)
+    assert put_part(api_client, upload.pk, 1, b"1234").status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(reverse("api:chunkedupload-detail", kwargs={"pk": upload.pk}))
+    assert response.status_code == 204
+    assert not ChunkedUpload.objects.filter(pk=upload.pk).exists()
+    assert storage.listdir(f"uploads/staging/{upload.pk}")[1] == []
+
+
+def test_purge_stale_uploads(storage, settings, django_capture_on_commit_callbacks):
+    settings.DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+    stale, active = baker.make(ChunkedUpload, 2, filename="notes.txt", size=4)
+    used, unused, recent = (
+        baker.make(
+            ChunkedUpload,
+            file=storage.save(f"uploads/files/{name}.png", ContentFile(make_image())),
+            status=ChunkedUpload.Status.COMPLETE,
+            size=4,
+        )
+        for name in ("used", "unused", "recent")
+    )
+    facility = baker.make(Facility)
+    baker.make(
+        FacilityAttachment,
+        content_type="image/png",
+        data=used.file,
+        facility=facility,
+        organisation=facility.organisation,
+    )
+    thumbnail = storage.save("renditions/thumbnail/unused.jpg", ContentFile(make_image()))
+    baker.make(
+        ImageRendition,
+        source=unused.file,
+        renditions={"thumbnail": thumbnail},
+        status=ImageRendition.Status.READY,
+    )
+    ChunkedUpload.objects.filter(pk__in=[stale.pk, used.pk, unused.pk]).update(
+        updated=timezone.now() - timedelta(days=3)
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert purge_stale_uploads(timedelta(days=2)) == 3
+    # The uploads of used files are deleted, but not the files
+    assert set(ChunkedUpload.objects.all()) == {active, recent}
+    assert not ImageRendition.objects.filter(source=unused.file).exists()
+    assert not storage.exists(unused.file)
+    assert not storage.exists(thumbnail)
+    assert storage.exists(used.file)
+
+    # Uploads are no longer abandoned once a record uses their files
+    assert get_referenced_files([used.file, recent.file, ""]) == {used.file}
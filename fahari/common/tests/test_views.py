@@ -83,3 +83,38 @@ def test_drf_excel_io_mixin_get_filter_form(rf, user_with_all_permissions):
     )(request=request)
 
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_administrative_units_view_counties(user_with_all_permissions, client):
+    client.force_login(user_with_all_permissions)
+    url = reverse("common:administrative_units", kwargs={"unit_type": "counties"})
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert {"id": "Nairobi", "text": "Nairobi"} in response.json()["results"]
+    assert "max-age=86400" in response["Cache-Control"]
+
+
+def test_administrative_units_view_by_parent(user_with_all_permissions, client):
+    client.force_login(user_with_all_permissions)
+    url = reverse("common:administrative_units", kwargs={"unit_type": "wards"})
+    response = client.get(url, {"parent": ["Dagoretti North", "Kajiado North"]})
+    assert response.status_code == status.HTTP_200_OK
+    wards = [ward["id"] for ward in response.json()["results"]]
+    assert "Kilimani" in wards
+    assert "Ngong" in wards
+    assert "Korogocho" not in wards
+
+
+def test_administrative_units_view_non_approved_user(client, django_user_model):
+    non_approved_user = baker.make(django_user_model, email="juha@kalulu.com", is_approved=False)
+    client.force_login(non_approved_user)
+    url = reverse("common:administrative_units", kwargs={"unit_type": "counties"})
+    response = client.get(url)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_administrative_units_view_unknown_unit_type(user_with_all_permissions, client):
+    client.force_login(user_with_all_permissions)
+    url = reverse("common:administrative_units", kwargs={"unit_type": "villages"})
+    response = client.get(url)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,301 @@
+"""Chunked, resumable uploads of large files.
+
+Clients on unreliable networks upload a file in parts: they initiate a
+`ChunkedUpload`, upload its parts, in any order and retrying only the parts
+that failed, and then complete it. Parts are staged in the upload storage
+and, on completion, streamed one after the other into the assembled file,
+so neither the whole file nor a whole part is ever held in memory. The id
+of a completed upload can then be given as the value of a file field, see
+`fahari.common.serializers.ChunkedUploadFileField`.
+"""
+import io
+import tempfile
+from datetime import timedelta
+from typing import IO, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import Storage, get_storage_class
+from django.db import transaction
+from django.db.models import FileField
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import ChunkedUpload
+from .renditions import delete_renditions, is_image_name, queue_renditions
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+STAGING_DIRECTORY = "uploads/staging"
+
+UPLOADS_DIRECTORY = "uploads/files"
+
+
+# =============================================================================
+# STREAMS
+# =============================================================================
+
+
+class PartsStream(io.RawIOBase):
+    """A read-only stream over the concatenated contents of the given stored parts.
+
+    Only one part is open at a time, so the stream can be handed to any
+    storage that reads, and seeks, a file object as it saves it.
+    """
+
+    def __init__(self, storage: Storage, parts: Sequence[Tuple[str, int]]):
+        super().__init__()
+        self.storage = storage
+        self.parts = list(parts)
+        self.size = sum(size for _, size in self.parts)
+        self._position = 0
+        self._part: Optional[File] = None
+        self._part_index: Optional[int] = None
+
+    def _close_part(self) -> None:
+        if self._part is not None:
+            self._part.close()
+        self._part = self._part_index = None
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Return the index of the part holding the given position and the offset in that part."""
+        for index, (_, size) in enumerate(self.parts):
+            if position < size:
+                return index, position
+            position -= size
+        return len(self.parts), 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset != self._position:
+            self._close_part()
+            self._position = max(offset, 0)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        """Fill the given buffer from as many parts as needed, i.e. reads are never short."""
+        count = 0
+        while count < len(buffer):
+            index, offset = self._locate(self._position)
+            if index >= len(self.parts):
+                break
+            if index != self._part_index:
+                self._close_part()
+                self._part = self.storage.open(self.parts[index][0], "rb")
+                self._part.seek(offset)
+                self._part_index = index
+
+            name, size = self.parts[index]
+            data = self._part.read(min(len(buffer) - count, size - offset))  # type: ignore
+            if not data:
+                raise IOError("The part %s is shorter than expected." % name)
+            buffer[count : count + len(data)] = data  # noqa: E203
+            count += len(data)
+            self._position += len(data)
+        return count
+
+    def close(self) -> None:
+        self._close_part()
+        super().close()
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def get_upload_storage() -> Storage:
+    """Return the storage of the staged parts and the assembled files.
+
+    It is configured with the `CHUNKED_UPLOAD_STORAGE` setting, which
+    defaults to the default file storage.
+    """
+
+    return get_storage_class(settings.CHUNKED_UPLOAD_STORAGE)()
+
+
+def get_part_name(upload: ChunkedUpload, number: int) -> str:
+    """Return the storage name of the given part of the given upload."""
+
+    return "%s/%s/%d" % (STAGING_DIRECTORY, upload.pk, number)
+
+
+def _delete_files(storage: Storage, names: List[str]) -> None:
+    for name in names:
+        storage.delete(name)
+
+
+def save_part(
+    upload: ChunkedUpload, number: int, stream: IO[bytes], storage: Optional[Storage] = None
+) -> ChunkedUpload:
+    """Stage the given part of the given upload, replacing any earlier copy of the part.
+
+    The part is spooled to a temporary file, which stays in memory only for
+    small parts, while it is read from the given stream.
+
+    :return: The upload with the part recorded.
+    """
+
+    storage = storage or get_upload_storage()
+    if number < 1:
+        raise ValidationError("Part numbers start at 1.")
+    if upload.status != ChunkedUpload.Status.PENDING:
+        raise ValidationError("The upload is already complete.")
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as part:
+        size = 0
+        for chunk in iter(lambda: stream.read(COPY_CHUNK_SIZE), b""):
+            size += len(chunk)
+            if size > settings.CHUNKED_UPLOAD_MAX_PART_SIZE:
+                raise ValidationError(
+                    "A part can't be larger than %d bytes." % settings.CHUNKED_UPLOAD_MAX_PART_SIZE
+                )
+            part.write(chunk)
+        if not size:
+            raise ValidationError("The part is empty.")
+        name = storage.save(get_part_name(upload, number), File(part))
+
+    with transaction.atomic():
+        # Parts may be uploaded concurrently, lock the upload to record them
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        replaced = upload.parts.pop(str(number), None)
+        if upload.status != ChunkedUpload.Status.PENDING:
+            storage.delete(name)
+            raise ValidationError("The upload is already complete.")
+        if upload.received_size + size > upload.size:
+            storage.delete(name)
+            raise ValidationError("The parts are larger than the size of the file.")
+        upload.parts[str(number)] = {"name": name, "size": size}
+        upload.updated = timezone.now()
+        upload.save()
+        if replaced:
+            transaction.on_commit(lambda: storage.delete(replaced["name"]))
+    return upload
+
+
+def complete_upload(upload: ChunkedUpload, storage: Optional[Storage] = None) -> ChunkedUpload:
+    """Assemble the staged parts of the given upload into a single file.
+
+    Completing an upload that is already complete, e.g. when a client
+    retries after losing the response, is a no-op.
+
+    :return: The completed upload.
+    """
+
+    storage = storage or get_upload_storage()
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status == ChunkedUpload.Status.COMPLETE:
+            return upload
+
+        numbers = sorted(int(number) for number in upload.parts)
+        if not numbers:
+            raise ValidationError("No parts were uploaded.")
+        missing = sorted(set(range(1, numbers[-1])).difference(numbers))
+        if missing:
+            raise ValidationError("The parts %s are missing." % ", ".join(map(str, missing)))
+        if upload.received_size != upload.size:
+            raise ValidationError(
+                "Received %d of the %d bytes of the file." % (upload.received_size, upload.size)
+            )
+
+        parts = [(upload.parts[str(n)]["name"], upload.parts[str(n)]["size"]) for n in numbers]
+        with PartsStream(storage, parts) as stream:
+            if is_image_name(upload.filename):
+                # Only the header is read, the image is only decoded when it's rendered
+                width, height = get_image_dimensions(stream)
+                if width is None or height is None:
+                    raise ValidationError("The file is not a valid image.")
+            name = "%s/%s/%s" % (UPLOADS_DIRECTORY, upload.pk, get_valid_filename(upload.filename))
+            upload.file = storage.save(name, File(stream, name=upload.filename))
+
+        upload.status = ChunkedUpload.Status.COMPLETE
+        upload.parts = {}
+        upload.updated = timezone.now()
+        upload.save()
+        queue_renditions([upload.file])
+        staged = [name for name, _ in parts]
+        transaction.on_commit(lambda: _delete_files(storage, staged))
+    return upload
+
+
+def delete_upload(upload: ChunkedUpload, storage: Optional[Storage] = None) -> None:
+    """Delete the given upload and its staged parts, but not its assembled file."""
+
+    storage = storage or get_upload_storage()
+    staged = [part["name"] for part in upload.parts.values()]
+    upload.delete()
+    transaction.on_commit(lambda: _delete_files(storage, staged))
+
+
+def get_referenced_files(names: Iterable[str]) -> Set[str]:
+    """Return the given storage names that are the value of a file field of any record.
+
+    One query is made per file field, regardless of the number of names.
+    """
+
+    names = set(names)
+    referenced: Set[str] = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            unreferenced = names.difference(referenced)
+            if isinstance(field, FileField) and unreferenced:
+                referenced.update(
+                    model._base_manager.filter(**{"%s__in" % field.name: unreferenced})
+                    .order_by()
+                    .values_list(field.name, flat=True)
+                    .distinct()
+                )
+    return referenced
+
+
+def purge_stale_uploads(max_age: timedelta, storage: Optional[Storage] = None) -> int:
+    """Delete the stale uploads, together with the files that were abandoned.
+
+    Pending uploads are abandoned when they haven't received a part in the
+    given time, along with their staged parts. Completed uploads are
+    abandoned when no record references their file the given time after
+    they were completed, along with their file and its renditions. The
+    uploads of referenced files are deleted too, but their files are kept,
+    so that they are not locked and checked again by the next purge. The
+    stale uploads are locked with `SKIP LOCKED`, so that several instances
+    can purge uploads concurrently.
+
+    :return: The number of deleted uploads.
+    """
+
+    storage = storage or get_upload_storage()
+    with transaction.atomic():
+        stale = list(
+            ChunkedUpload.objects.select_for_update(skip_locked=True).filter(
+                updated__lt=timezone.now() - max_age
+            )
+        )
+        completed = [upload for upload in stale if upload.status == ChunkedUpload.Status.COMPLETE]
+        referenced = get_referenced_files(upload.file for upload in completed if upload.file)
+        for upload in stale:
+            delete_upload(upload, storage)
+
+        files = [upload.file for upload in stale if upload.file and upload.file not in referenced]
+        delete_renditions(files)
+        transaction.on_commit(lambda: _delete_files(storage, files))
+    return len(stale)
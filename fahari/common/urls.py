@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    AdministrativeUnitsView,
     FacilityCreateView,
     FacilityDeleteView,
     FacilityUpdateView,
@@ -17,6 +18,11 @@ from .views import (
 
 app_name = "common"
 urlpatterns = [
+    path(
+        "administrative_units/<unit_type>",
+        view=AdministrativeUnitsView.as_view(),
+        name="administrative_units",
+    ),
     path("facilities", view=FacilityView.as_view(), name="facilities"),
     path(
         "facility_create",
@@ -1,25 +1,47 @@
 from .administrative_unit_utils import (
+    AdministrativeUnitsIndex,
+    LazyFieldChoices,
+    build_administrative_units_index,
+    get_administrative_units_index,
     get_constituencies,
     get_constituencies_for_county,
     get_counties,
+    get_county_for_sub_county,
     get_sub_counties,
     get_sub_counties_for_county,
+    get_sub_counties_for_ward,
     get_wards,
     get_wards_for_sub_county,
     has_constituency,
     has_sub_county,
     has_ward,
 )
+from .mfl_api_utils import (
+    MFLTransport,
+    RequestsMFLTransport,
+    get_mfl_transport,
+    iter_mfl_records,
+)
 
 __all__ = [
+    "AdministrativeUnitsIndex",
+    "LazyFieldChoices",
+    "MFLTransport",
+    "RequestsMFLTransport",
+    "build_administrative_units_index",
+    "get_administrative_units_index",
     "get_constituencies",
     "get_constituencies_for_county",
     "get_counties",
+    "get_county_for_sub_county",
+    "get_mfl_transport",
     "get_sub_counties",
     "get_sub_counties_for_county",
+    "get_sub_counties_for_ward",
     "get_wards",
     "get_wards_for_sub_county",
     "has_constituency",
     "has_sub_county",
     "has_ward",
+    "iter_mfl_records",
 ]
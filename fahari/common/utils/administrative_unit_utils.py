@@ -1,6 +1,24 @@
-from functools import lru_cache
+from collections import defaultdict
+from functools import cached_property, lru_cache
 from itertools import chain
-from typing import Collection, Dict, Iterable, Optional, Tuple, cast
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
 from ..constants import ADMINISTRATIVE_UNITS
 
@@ -10,6 +28,150 @@ _CONSTITUENCIES = "Constituencies"
 _SUB_COUNTIES = "Sub Counties"
 
 
+class AdministrativeUnitsIndex(NamedTuple):
+    """An immutable, pre-computed index of the administrative units hierarchy.
+
+    The index is made up of hash maps from each administrative unit to it's
+    owning unit(s) and from each unit to it's child units. This allows
+    membership and ownership checks to be performed in constant time instead
+    of scanning the administrative unit choices.
+    """
+
+    counties: Tuple[str, ...]
+    """All the counties in the order they were declared."""
+    constituency_to_county: Mapping[str, str]
+    """A mapping of each constituency to it's owning county."""
+    county_to_constituencies: Mapping[str, FrozenSet[str]]
+    """A mapping of each county to it's constituencies."""
+    county_to_sub_counties: Mapping[str, FrozenSet[str]]
+    """A mapping of each county to it's sub-counties."""
+    sub_county_to_county: Mapping[str, str]
+    """A mapping of each sub-county to it's owning county."""
+    sub_county_to_wards: Mapping[str, Tuple[str, ...]]
+    """A mapping of each sub-county to it's wards in the order they were declared."""
+    ward_to_sub_counties: Mapping[str, FrozenSet[str]]
+    """A mapping of each ward to it's owning sub-counties.
+
+    Ward names are not unique across sub-counties, hence the many valued mapping.
+    """
+
+
+class LazyFieldChoices(Sequence[FieldChoice]):
+    """A sequence of field choices that are only loaded when first accessed.
+
+    This can be used in place of a `Collection` of choices when declaring
+    model fields so that the choices are not materialized when a model is
+    imported.
+    """
+
+    def __init__(self, loader: Callable[[], Collection[FieldChoice]]):
+        self._loader = loader
+
+    @cached_property
+    def _choices(self) -> Tuple[FieldChoice, ...]:
+        return tuple(self._loader())
+
+    def __contains__(self, choice: object) -> bool:
+        return choice in self._choices
+
+    def __getitem__(self, index):
+        return self._choices[index]
+
+    def __iter__(self) -> Iterator[FieldChoice]:
+        return iter(self._choices)
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+    def __repr__(self) -> str:
+        return "%s(%s)" % (self.__class__.__name__, getattr(self._loader, "__name__", "-"))
+
+
+def build_administrative_units_index(
+    administrative_units: Mapping[str, Mapping[str, Any]]
+) -> AdministrativeUnitsIndex:
+    """Build and return an `AdministrativeUnitsIndex` from the given administrative units.
+
+    When a sub-county or constituency is declared in more than one county,
+    the first county to declare it is treated as the owning county.
+
+    :param administrative_units: A mapping of counties to their constituencies
+           and sub-counties. This should have the same structure as
+           `fahari.common.constants.ADMINISTRATIVE_UNITS`.
+
+    :return: An immutable index of the given administrative units.
+    """
+
+    constituency_to_county: Dict[str, str] = {}
+    county_to_constituencies: Dict[str, FrozenSet[str]] = {}
+    county_to_sub_counties: Dict[str, FrozenSet[str]] = {}
+    sub_county_to_county: Dict[str, str] = {}
+    sub_county_to_wards: Dict[str, Tuple[str, ...]] = {}
+    ward_to_sub_counties: DefaultDict[str, Set[str]] = defaultdict(set)
+
+    for county, county_admin_units in administrative_units.items():
+        constituencies = tuple(county_admin_units.get(_CONSTITUENCIES, tuple()))
+        sub_counties = cast(
+            Mapping[str, Collection[str]], county_admin_units.get(_SUB_COUNTIES, dict())
+        )
+        county_to_constituencies[county] = frozenset(constituencies)
+        county_to_sub_counties[county] = frozenset(sub_counties)
+        for constituency in constituencies:
+            constituency_to_county.setdefault(constituency, county)
+        for sub_county, wards in sub_counties.items():
+            if sub_county in sub_county_to_county:
+                continue
+            sub_county_to_county[sub_county] = county
+            sub_county_to_wards[sub_county] = tuple(wards)
+            for ward in wards:
+                ward_to_sub_counties[ward].add(sub_county)
+
+    return AdministrativeUnitsIndex(
+        counties=tuple(administrative_units),
+        constituency_to_county=MappingProxyType(constituency_to_county),
+        county_to_constituencies=MappingProxyType(county_to_constituencies),
+        county_to_sub_counties=MappingProxyType(county_to_sub_counties),
+        sub_county_to_county=MappingProxyType(sub_county_to_county),
+        sub_county_to_wards=MappingProxyType(sub_county_to_wards),
+        ward_to_sub_counties=MappingProxyType(
+            {ward: frozenset(owners) for ward, owners in ward_to_sub_counties.items()}
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_administrative_units_index() -> AdministrativeUnitsIndex:
+    """Return the `AdministrativeUnitsIndex` of the Fahari ya Jamii Project.
+
+    The index is built once, on first access, from `ADMINISTRATIVE_UNITS`.
+
+    :return: An immutable index of the administrative units involved in the
+             Fahari ya Jamii Project.
+    """
+    return build_administrative_units_index(ADMINISTRATIVE_UNITS)
+
+
+def get_county_for_sub_county(sub_county: str) -> Optional[str]:
+    """Return the county that owns the given sub-county.
+
+    :param sub_county: The sub-county whose owning county to return.
+
+    :return: The owning county or `None` if the given sub-county doesn't exist.
+    """
+    return get_administrative_units_index().sub_county_to_county.get(sub_county)
+
+
+def get_sub_counties_for_ward(ward: str) -> FrozenSet[str]:
+    """Return the sub-counties that own a ward with the given name.
+
+    :param ward: The ward whose owning sub-counties to return.
+
+    :return: A set of the owning sub-counties or an empty set if the given
+             ward doesn't exist.
+    """
+    return get_administrative_units_index().ward_to_sub_counties.get(ward, frozenset())
+
+
 def _sorted_field_choices(choices: Iterable[FieldChoice]) -> Collection[FieldChoice]:
     # Sort by the display value rather than the storage value. This way, the choices
     # appear sorted on the select DOM component of the user interface.
@@ -109,19 +271,7 @@ def get_wards_for_sub_county(sub_county: str) -> Collection[FieldChoice]:
              sub-county or an empty Collection if the provided sub-county
              doesn't exist.
     """
-    owning_county: Optional[str] = None
-    for county in get_counties():
-        if (sub_county, sub_county) in get_sub_counties_for_county(county[0]):
-            owning_county = county[0]
-            break
-
-    if owning_county is None:
-        return tuple()
-
-    sub_counties = cast(
-        Dict[str, Collection[str]], ADMINISTRATIVE_UNITS[owning_county][_SUB_COUNTIES]
-    )
-    wards = sub_counties[sub_county]
+    wards = get_administrative_units_index().sub_county_to_wards.get(sub_county, tuple())
     return _sorted_field_choices((ward, ward) for ward in wards)
 
 
@@ -142,9 +292,10 @@ def has_constituency(county: str, constituency: str) -> bool:
 
     :raise ValueError: If the given county is not part of the FYJ program.
     """
-    if county not in ADMINISTRATIVE_UNITS:
+    county_constituencies = get_administrative_units_index().county_to_constituencies
+    if county not in county_constituencies:
         raise ValueError('county "{}" does not exist'.format(county))
-    return (constituency, constituency) in get_constituencies_for_county(county)
+    return constituency in county_constituencies[county]
 
 
 def has_sub_county(county: str, sub_county: str) -> bool:
@@ -164,9 +315,10 @@ def has_sub_county(county: str, sub_county: str) -> bool:
 
     :raise ValueError: If the given county is not part of the FYJ program.
     """
-    if county not in ADMINISTRATIVE_UNITS:
+    county_sub_counties = get_administrative_units_index().county_to_sub_counties
+    if county not in county_sub_counties:
         raise ValueError('county "{}" does not exist'.format(county))
-    return (sub_county, sub_county) in get_sub_counties_for_county(county)
+    return sub_county in county_sub_counties[county]
 
 
 def has_ward(sub_county: str, ward: str) -> bool:
@@ -187,6 +339,7 @@ def has_ward(sub_county: str, ward: str) -> bool:
     :raise ValueError: If the given sub-county doesn't belong to a county in
            the FYJ program.
     """
-    if (sub_county, sub_county) not in get_sub_counties():
+    sub_county_wards = get_administrative_units_index().sub_county_to_wards
+    if sub_county not in sub_county_wards:
         raise ValueError('sub county "{}" does not exist'.format(sub_county))
-    return (ward, ward) in get_wards_for_sub_county(sub_county)
+    return sub_county in get_sub_counties_for_ward(ward)
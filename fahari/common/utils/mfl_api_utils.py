@@ -0,0 +1,143 @@
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Mapping, Optional
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MFLRecord = Mapping[str, Any]
+"""A facility record as returned by the Kenya Master Health Facilities List API."""
+
+MFLPage = Mapping[str, Any]
+"""A page of facility records as returned by the Kenya Master Health Facilities List API."""
+
+
+# =============================================================================
+# TRANSPORTS
+# =============================================================================
+
+
+class MFLTransport(metaclass=ABCMeta):
+    """Fetches pages of facility records from the Kenya Master Health Facilities List API.
+
+    Implementations must be safe to use from multiple threads at once as
+    pages are fetched concurrently.
+    """
+
+    def __init__(self, url: str, token: str, pool_size: int, page_size: int, timeout: float):
+        self.url = url
+        self.token = token
+        self.pool_size = pool_size
+        self.page_size = page_size
+        self.timeout = timeout
+
+    def close(self) -> None:
+        """Release any resources held by this transport."""
+        ...
+
+    @abstractmethod
+    def get_page(self, page: int) -> MFLPage:
+        """Fetch and return the given page of facility records.
+
+        The returned page should include the `total_pages` available and the
+        page's facility records under `results`.
+        """
+        ...
+
+
+class RequestsMFLTransport(MFLTransport):
+    """A `MFLTransport` that re-uses pooled connections from a `requests.Session`.
+
+    Failed requests caused by connection errors or server errors are retried
+    with an exponential backoff.
+    """
+
+    fields = "id,code,name,lat,long"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_maxsize=self.pool_size, max_retries=retries)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {"Accept": "application/json", "Authorization": f"Bearer {self.token}"}
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get_page(self, page: int) -> MFLPage:
+        response = self.session.get(
+            self.url,
+            params={"fields": self.fields, "page": page, "page_size": self.page_size},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def get_mfl_transport(
+    url: Optional[str] = None, pool_size: int = 8, page_size: int = 500, timeout: float = 30
+) -> MFLTransport:
+    """Create and return an instance of the configured `MFLTransport`.
+
+    :param url: The API url to fetch the facility records from. Defaults to
+        the configured url.
+    :param pool_size: The maximum number of connections to keep open.
+    :param page_size: The number of facility records to fetch per page.
+    :param timeout: The number of seconds to wait for a page to be fetched.
+
+    :return: A new `MFLTransport` instance.
+    """
+    config: Mapping[str, Any] = settings.MFL_API
+    try:
+        transport_class = import_string(config["TRANSPORT"])
+    except ImportError as exp:
+        raise ImproperlyConfigured(
+            "Cannot import the MFL API transport from the following dotted path %s"
+            % config["TRANSPORT"]
+        ) from exp
+
+    return transport_class(
+        url=url or config["URL"],
+        token=config["TOKEN"],
+        pool_size=pool_size,
+        page_size=page_size,
+        timeout=timeout,
+    )
+
+
+def iter_mfl_records(transport: MFLTransport, max_workers: int = 8) -> Iterator[MFLRecord]:
+    """Fetch and yield all the facility records available from the given transport.
+
+    The first page is fetched to learn the total number of pages after
+    which the remaining pages are fetched concurrently. The records are
+    yielded in page order.
+
+    :param transport: The transport to fetch the facility records with.
+    :param max_workers: The maximum number of pages to fetch concurrently.
+
+    :return: An iterator of the fetched facility records.
+    """
+    first_page = transport.get_page(1)
+    yield from first_page["results"]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = executor.map(transport.get_page, range(2, first_page["total_pages"] + 1))
+        for page in pages:
+            yield from page["results"]
@@ -1,3 +1,4 @@
+from .async_base_views import async_read_view
 from .drf_base_views import BaseView
 
-__all__ = ["BaseView"]
+__all__ = ["BaseView", "async_read_view"]
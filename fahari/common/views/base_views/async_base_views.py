@@ -0,0 +1,53 @@
+from functools import wraps
+from typing import Awaitable, Callable
+
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from fahari.common.read_pool import ReadPoolSaturated, get_read_pool
+
+READ_POOL_RETRY_AFTER = 1
+
+
+def _render(view: Callable[..., HttpResponse], request: HttpRequest, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if not isinstance(response, Response):  # e.g. a 304 to a conditional request
+        return response
+
+    # Hand back a plain response, Django would otherwise call `render` again
+    # on its sync thread, which is what serving the view from the pool avoids
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        rendered[header] = value
+    rendered.cookies = response.cookies
+    return rendered
+
+
+def async_read_view(view: Callable[..., Response]) -> Callable[..., Awaitable[HttpResponse]]:
+    """Serve the given sync, read only, DRF view asynchronously from the read pool.
+
+    The view, including its authentication, permission checks, queries and
+    rendering, runs in a thread of the read pool, see
+    `fahari.common.read_pool`, so it never blocks the event loop nor waits
+    for Django's sync thread. The view is not wrapped in a transaction as it
+    only reads. When the read pool is saturated, the view is not run and a
+    503 response is returned instead.
+    """
+
+    @transaction.non_atomic_requests
+    @wraps(view)
+    async def async_view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            return await get_read_pool().run(_render, view, request, *args, **kwargs)
+        except ReadPoolSaturated:
+            response = JsonResponse(
+                {"detail": "The server is busy, please try again shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response["Retry-After"] = str(READ_POOL_RETRY_AFTER)
+            return response
+
+    return async_view
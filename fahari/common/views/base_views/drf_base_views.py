@@ -1,4 +1,12 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
@@ -12,8 +20,22 @@ class BaseView(ModelViewSet, AuditSerializerExcelIOMixin):
 
     This view's `create` method has been extended to support the creation of
     a single or multiple records.
+
+    Reads support conditional requests. List responses carry an `ETag`
+    derived from the counts computed by the paginator and the pk and
+    `updated` timestamp of each record of the page, and detail responses an
+    `ETag` and a `Last-Modified` header derived from the record's `updated`
+    timestamp. The `updated` timestamps of the related records embedded in
+    the responses, given as forward lookups in
+    `conditional_related_lookups`, are part of the validators too. A client
+    whose copy is still current gets an empty 304 response, determined
+    without serializing any record. Views whose responses also change in
+    other ways, e.g. with related records that have no `updated` timestamp,
+    should disable this with `conditional_requests`.
     """
 
+    conditional_requests = True
+    conditional_related_lookups: Sequence[str] = ()
     excel_io_class = AuditSerializerExcelIO
 
     def create(self, request, *args, **kwargs):
@@ -31,3 +53,132 @@ class BaseView(ModelViewSet, AuditSerializerExcelIOMixin):
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def list(self, request, *args, **kwargs):
+        """List the matching records, or respond with a 304 if the client's copy is current."""
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        records = page if page is not None else list(queryset)
+        etag = None
+        if self.conditional_requests:
+            # Deleted records change the counts or the records of the page
+            related_updated = self.get_related_updated(records)
+            etag = self.get_etag(
+                request,
+                self.get_paginator_counts(),
+                [
+                    (record.pk, record.updated, related_updated.get(record.pk))
+                    for record in records
+                ],
+            )
+            not_modified = self.get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+        serializer = self.get_serializer(records, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        return self.add_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a record, or respond with a 304 if the client's copy is current."""
+
+        instance = self.get_object()
+        etag = last_modified = None
+        if self.conditional_requests:
+            related_updated = self.get_related_updated([instance]).get(instance.pk, ())
+            etag = self.get_etag(request, instance.pk, instance.updated, related_updated)
+            last_modified = max(
+                updated for updated in (instance.updated, *related_updated) if updated
+            )
+            not_modified = self.get_not_modified_response(request, etag, last_modified)
+            if not_modified:
+                return not_modified
+
+        response = Response(self.get_serializer(instance).data)
+        return self.add_validators(response, etag, last_modified)
+
+    def get_paginator_counts(self) -> Tuple[Any, ...]:
+        """Return the counts that the paginator computed while paginating the current request.
+
+        These are reused as validators, so that no other counting is needed.
+        """
+
+        paginator = self.paginator
+        page = getattr(paginator, "page", None)
+        return (
+            getattr(paginator, "count", None),
+            getattr(paginator, "total_count", None),
+            getattr(paginator, "has_more", None),
+            page.paginator.count if page is not None else None,
+        )
+
+    def get_related_updated(self, records: List[Any]) -> Dict[Any, Tuple[Any, ...]]:
+        """Return the `updated` timestamps of the embedded related records, keyed by record pk.
+
+        The timestamps of all the given records are fetched with a single
+        query, and only for views with `conditional_related_lookups`.
+        """
+
+        if not (self.conditional_related_lookups and records):
+            return {}
+
+        lookups = ["%s__updated" % lookup for lookup in self.conditional_related_lookups]
+        related_updated = (
+            type(records[0])
+            ._base_manager.filter(pk__in=[record.pk for record in records])
+            .values_list("pk", *lookups)
+        )
+        return {pk: tuple(updated) for pk, *updated in related_updated}
+
+    def get_etag(self, request: Request, *validators: Any) -> str:
+        """Return a weak ETag of the given validators and of the requested representation.
+
+        The representation varies with the user, e.g. through their
+        allotted facilities, the negotiated media type and the query
+        parameters, e.g. the filters, page and fields.
+        """
+
+        key = repr(
+            (
+                request.user.pk,
+                request.accepted_media_type,
+                sorted(request.query_params.lists()),
+                validators,
+            )
+        )
+        return 'W/"%s"' % hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def get_not_modified_response(
+        self, request: Request, etag: str, last_modified: Optional[datetime] = None
+    ) -> Optional[HttpResponse]:
+        """Return a 304, or a 412, response if the request's preconditions say so."""
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        return response and self.add_validators(response, etag, last_modified)
+
+    def add_validators(
+        self,
+        response: HttpResponse,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+    ) -> HttpResponse:
+        """Add the given validators to the given response.
+
+        Clients must revalidate their copies on every use, so that they
+        never show stale records.
+        """
+
+        if etag:
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
@@ -1,6 +1,16 @@
-from .drf_common_views import FacilityViewSet, SystemViewSet, UserFacilityViewSet
+from .drf_common_views import (
+    ChunkedUploadViewSet,
+    DashboardMetricsView,
+    FacilityViewSet,
+    SystemViewSet,
+    UserFacilityViewSet,
+    async_dashboard_metrics_view,
+    async_facility_detail_view,
+    async_facility_list_view,
+)
 from .vanilla_common_views import (
     AboutView,
+    AdministrativeUnitsView,
     FacilityCreateView,
     FacilityDeleteView,
     FacilityUpdateView,
@@ -18,6 +28,9 @@ from .vanilla_common_views import (
 
 __all__ = [
     "AboutView",
+    "AdministrativeUnitsView",
+    "ChunkedUploadViewSet",
+    "DashboardMetricsView",
     "FacilityCreateView",
     "FacilityDeleteView",
     "FacilityUpdateView",
@@ -34,4 +47,7 @@ __all__ = [
     "UserFacilityAllotmentUpdateView",
     "UserFacilityAllotmentView",
     "UserFacilityViewSet",
+    "async_dashboard_metrics_view",
+    "async_facility_detail_view",
+    "async_facility_list_view",
 ]
@@ -1,13 +1,26 @@
-from fahari.common.dashboard import get_fahari_facilities_queryset
+import io
+
+from django.core.exceptions import ValidationError
+from rest_framework import mixins, serializers
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import GenericViewSet
+
+from fahari.common.dashboard import get_dashboard_metrics, get_fahari_facilities_queryset
 from fahari.common.filters import FacilityFilter, SystemFilter, UserFacilityAllotmentFilter
-from fahari.common.models import System, UserFacilityAllotment
+from fahari.common.models import ChunkedUpload, System, UserFacilityAllotment
+from fahari.common.permissions import CanViewDashboard
 from fahari.common.serializers import (
+    ChunkedUploadSerializer,
     FacilitySerializer,
     SystemSerializer,
     UserFacilityAllotmentSerializer,
 )
+from fahari.common.uploads import complete_upload, delete_upload, save_part
 
-from ..base_views import BaseView
+from ..base_views import BaseView, async_read_view
 
 
 class FacilityViewSet(BaseView):
@@ -36,6 +49,71 @@ class UserFacilityViewSet(BaseView):
         "user__name", "user__username", "-updated", "-created"
     )
     serializer_class = UserFacilityAllotmentSerializer
+    # The names of the users are embedded, users have no update timestamp
+    conditional_requests = False
     filterset_class = UserFacilityAllotmentFilter
     ordering_fields = ("user__name", "user__username", "allotment_type")
     search_fields = ("allotment_type", "user__name", "user__username")
+
+
+class ChunkedUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """Upload large files in parts, see `fahari.common.uploads`.
+
+    An upload is initiated with a POST of the file's name and size, each
+    part is PUT, as the raw request body, to `parts/<number>/` and the
+    upload is then completed with a POST to `complete/`. Retrieving an
+    upload lists the parts that were received, so an interrupted upload can
+    be resumed, and deleting it aborts it.
+    """
+
+    queryset = ChunkedUpload.objects.all()
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = (IsAuthenticated,)
+    filter_backends = ()
+    pagination_class = None
+
+    def get_queryset(self):
+        """Limit the uploads to those of the requesting user."""
+        return super().get_queryset().filter(created_by=self.request.user.pk)
+
+    @action(detail=True, methods=["PUT"], url_path=r"parts/(?P<number>[0-9]+)")
+    def parts(self, request, pk=None, number=None):
+        """Stage a part of the upload, replacing any earlier copy of the part."""
+        upload = self.get_object()
+        try:
+            upload = save_part(upload, int(number), request.stream or io.BytesIO())
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=["POST"])
+    def complete(self, request, pk=None):
+        """Assemble the staged parts of the upload into the uploaded file."""
+        try:
+            upload = complete_upload(self.get_object())
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+        return Response(self.get_serializer(upload).data)
+
+    def perform_destroy(self, instance):
+        delete_upload(instance)
+
+
+class DashboardMetricsView(APIView):
+    """Return the dashboard summaries of the requesting user's organisation."""
+
+    permission_classes = (CanViewDashboard,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_dashboard_metrics(request.user))
+
+
+# Async read endpoints for the busiest lookups, see `async_read_view`
+async_facility_list_view = async_read_view(FacilityViewSet.as_view({"get": "list"}))
+async_facility_detail_view = async_read_view(FacilityViewSet.as_view({"get": "retrieve"}))
+async_dashboard_metrics_view = async_read_view(DashboardMetricsView.as_view())
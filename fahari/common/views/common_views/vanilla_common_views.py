@@ -1,15 +1,21 @@
+from itertools import chain
+
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, TemplateView, UpdateView
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.generic import CreateView, DeleteView, TemplateView, UpdateView, View
 
-from fahari.common.dashboard import (
-    get_active_facility_count,
-    get_active_user_count,
-    get_appointments_mtd,
-    get_open_ticket_count,
-)
+from fahari.common.dashboard import get_dashboard_metrics
 from fahari.common.forms import FacilityForm, SystemForm, UserFacilityAllotmentForm
 from fahari.common.models import Facility, System, UserFacilityAllotment
+from fahari.common.utils import (
+    get_constituencies_for_county,
+    get_counties,
+    get_sub_counties_for_county,
+    get_wards_for_sub_county,
+)
 
 from ..mixins import ApprovedMixin, BaseFormMixin
 
@@ -24,11 +30,7 @@ class HomeView(LoginRequiredMixin, ApprovedMixin, TemplateView):
         context["selected"] = "dashboard"  # id of selected page
 
         # dashboard summaries
-        user = self.request.user
-        context["active_facility_count"] = get_active_facility_count(user)
-        context["open_ticket_count"] = get_open_ticket_count(user)
-        context["user_count"] = get_active_user_count(user)
-        context["appointments_mtd"] = get_appointments_mtd(user)
+        context.update(get_dashboard_metrics(self.request.user))
         return context
 
 
@@ -43,6 +45,37 @@ class AboutView(LoginRequiredMixin, ApprovedMixin, TemplateView):
         return context
 
 
+class AdministrativeUnitsView(LoginRequiredMixin, ApprovedMixin, View):
+    """Return the administrative units belonging to the given parent units as JSON.
+
+    The parent units are provided using the `parent` query parameter which
+    can be repeated to request the units of multiple parents. Counties don't
+    have a parent unit and as such, the `parent` query parameter is ignored
+    when requesting counties.
+    """
+
+    permission_required = "common.view_facility"
+    unit_loaders = {
+        "constituencies": get_constituencies_for_county,
+        "sub_counties": get_sub_counties_for_county,
+        "wards": get_wards_for_sub_county,
+    }
+
+    @method_decorator(cache_control(max_age=60 * 60 * 24, private=True))
+    def get(self, request, *args, **kwargs):
+        unit_type = kwargs["unit_type"]
+        if unit_type == "counties":
+            choices = get_counties()
+        elif unit_type in self.unit_loaders:
+            loader = self.unit_loaders[unit_type]
+            parents = request.GET.getlist("parent")
+            choices = tuple(chain.from_iterable(loader(parent) for parent in parents))
+        else:
+            raise Http404('Unknown administrative unit type "%s"' % unit_type)
+
+        return JsonResponse({"results": [{"id": value, "text": text} for value, text in choices]})
+
+
 class FacilityContextMixin:
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)  # type: ignore
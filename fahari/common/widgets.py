@@ -31,3 +31,41 @@ class MultiSearchableComboBox(forms.SelectMultiple):
         # functionality.
         base_attrs.update({"data-live-search": "true"})
         return super().build_attrs(base_attrs, extra_attrs)
+
+
+class RemoteChoicesMixin:
+    """Render only the selected choices of a combo box and load the rest on demand.
+
+    The rest of the choices are fetched from `choices_url`, filtered by the
+    values of the `parent_field` of the same form, whenever the parent field
+    changes. This is suitable for combo boxes with too many options to render
+    at once.
+    """
+
+    def __init__(self, choices_url, parent_field, attrs=None, choices=()):
+        super().__init__(attrs, choices)  # type: ignore
+        self.choices_url = choices_url
+        self.parent_field = parent_field
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        base_attrs.update(
+            {"data-choices_url": str(self.choices_url), "data-parent_field": self.parent_field}
+        )
+        return super().build_attrs(base_attrs, extra_attrs)  # type: ignore
+
+    def optgroups(self, name, value, attrs=None):
+        # Only render the blank and the selected choices
+        choices = self.choices  # type: ignore
+        self.choices = [choice for choice in choices if choice[0] in ("", *value)]
+        try:
+            return super().optgroups(name, value, attrs)  # type: ignore
+        finally:
+            self.choices = choices
+
+
+class RemoteSearchableComboBox(RemoteChoicesMixin, SearchableComboBox):
+    """A combo box with search capabilities whose choices are loaded on demand."""
+
+
+class RemoteMultiSearchableComboBox(RemoteChoicesMixin, MultiSearchableComboBox):
+    """A multi-valued combo box with search capabilities whose choices are loaded on demand."""
@@ -8,7 +8,7 @@ from django.db.models.fields.related import RelatedField
 from django.utils import timezone
 
 from fahari.common.models import AbstractBase
-from fahari.common.utils.administrative_unit_utils import get_counties
+from fahari.common.utils import LazyFieldChoices, get_counties
 from fahari.ops.models import StockReceiptVerification
 from fahari.utils.excel_utils.google_sheets_excel_utils import read_spreadsheet
 
@@ -164,7 +164,7 @@ class AbstractGoogleSheetToDjangoModelAdapter(AbstractBase):
 class StockVerificationReceiptsAdapter(AbstractGoogleSheetToDjangoModelAdapter):
     """Metadata about stock verification reports data ingest."""
 
-    county = models.CharField(max_length=65, choices=get_counties(), unique=True)
+    county = models.CharField(max_length=65, choices=LazyFieldChoices(get_counties), unique=True)
 
     def save(self, *args, **kwargs):
         """Override the default behaviour to make sure that target model is set correctly.
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.9 on 2022-01-27 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ops', '0035_delete_sitementorship'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facilitysystemticket',
+            index=models.Index(condition=models.Q(('active', True), ('resolved__isnull', True)), fields=['organisation'], name='ops_ticket_open_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyupdate',
+            index=models.Index(condition=models.Q(('active', True)), fields=['organisation', 'date'], name='ops_dailyupdate_org_date_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.9 on 2022-01-28 10:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_search_vector(apps, schema_editor):
+    FacilitySystemTicket = apps.get_model('ops', 'FacilitySystemTicket')
+    vectors = (
+        FacilitySystemTicket.objects.filter(pk=OuterRef('pk'))
+        .annotate(
+            computed_search_vector=(
+                SearchVector('facility_system__facility__name', config='simple', weight='A')
+                + SearchVector('facility_system__system__name', config='simple', weight='B')
+            )
+        )
+        .values('computed_search_vector')[:1]
+    )
+    FacilitySystemTicket.objects.update(search_vector=Subquery(vectors))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ops', '0036_auto_20220127_0841'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facilitysystemticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='facilitysystemticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ops_ticket_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,8 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.utils import IntegrityError, InternalError, ProgrammingError
@@ -163,8 +165,14 @@ class FacilitySystemTicket(AbstractBase):
     resolved = models.DateTimeField(null=True, blank=True)
     resolved_by = models.TextField(null=True, blank=True)
     resolve_note = models.TextField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
+    broadcast_facility_lookup = "facility_system__facility"
     model_validators = ["validate_resolved"]
+    search_vector_fields = {
+        "facility_system__facility__name": "A",
+        "facility_system__system__name": "B",
+    }
 
     @property
     def is_open(self):
@@ -205,6 +213,14 @@ class FacilitySystemTicket(AbstractBase):
         permissions = [
             ("can_resolve_ticket", "Can Resolve Ticket"),
         ]
+        indexes = [
+            models.Index(
+                fields=["organisation"],
+                name="ops_ticket_open_org_idx",
+                condition=models.Q(active=True, resolved__isnull=True),
+            ),
+            GinIndex(fields=["search_vector"], name="ops_ticket_search_idx"),
+        ]
 
 
 class ActivityLog(AbstractBase):
@@ -277,6 +293,8 @@ class DailyUpdate(AbstractBase):
     ipt_new_adults = models.IntegerField(default=0)
     ipt_new_paeds = models.IntegerField(default=0)
 
+    broadcast_facility_lookup = "facility"
+
     def get_absolute_url(self):
         update_url = reverse_lazy("ops:daily_update_update", kwargs={"pk": self.pk})
         return update_url
@@ -300,6 +318,13 @@ class DailyUpdate(AbstractBase):
             "facility",
             "date",
         )
+        indexes = [
+            models.Index(
+                fields=["organisation", "date"],
+                name="ops_dailyupdate_org_date_idx",
+                condition=models.Q(active=True),
+            )
+        ]
 
 
 class Commodity(AbstractBase):
@@ -361,6 +386,7 @@ class StockReceiptVerification(AbstractBase):
     comments = models.TextField()
 
     model_validators = ["check_pack_size_is_valid_for_selected_commodity"]
+    rendition_fields = ("delivery_note_image",)
 
     def check_pack_size_is_valid_for_selected_commodity(self):
         """Ensure that the selected pack size is valid for the selected commodity."""
@@ -461,6 +487,8 @@ class FacilityNetworkStatus(AbstractBase):
     has_network = models.BooleanField(default=True)
     has_internet = models.BooleanField(default=True)
 
+    broadcast_facility_lookup = "facility"
+
     def __str__(self) -> str:
         return "Facility: %s, Has network: %s, Has internet: %s" % (
             self.facility.name,
@@ -548,6 +576,8 @@ class SecurityIncidence(AbstractBase):
     reported_on = models.DateField(default=timezone.datetime.today, editable=False)
     reported_by = models.ForeignKey(User, on_delete=models.PROTECT, null=True, blank=True)
 
+    broadcast_facility_lookup = "facility"
+
     def __str__(self) -> str:
         return f"Facility: {self.facility.name}, Security incidence: {self.title}"
 
@@ -616,6 +646,8 @@ class WeeklyProgramUpdate(AbstractBase):
     )
     date = models.DateField(default=timezone.datetime.today)
 
+    rendition_fields = ("attachment",)
+
     def __str__(self) -> str:
         return f"Weekly update: {self.title}, assigned persons {self.assigned_persons}"
 
@@ -1,6 +1,11 @@
 from rest_framework import serializers
 
-from fahari.common.serializers import BaseSerializer, FacilitySerializer, SystemSerializer
+from fahari.common.serializers import (
+    BaseSerializer,
+    FacilitySerializer,
+    RenditionsMixin,
+    SystemSerializer,
+)
 
 from .models import (
     ActivityLog,
@@ -51,7 +56,7 @@ class FacilitySystemTicketSerializer(BaseSerializer):
         fields = "__all__"
 
 
-class StockReceiptVerificationSerializer(BaseSerializer):
+class StockReceiptVerificationSerializer(RenditionsMixin, BaseSerializer):
 
     facility_data = FacilitySerializer(source="facility", read_only=True)
     commodity_data = CommoditySerializer(source="commodity", read_only=True)
@@ -63,6 +68,9 @@ class StockReceiptVerificationSerializer(BaseSerializer):
     class Meta(BaseSerializer.Meta):
         model = StockReceiptVerification
         fields = "__all__"
+        datatables_always_serialize = BaseSerializer.Meta.datatables_always_serialize + (
+            "renditions",
+        )
 
 
 class ActivityLogSerializer(BaseSerializer):
@@ -90,7 +98,7 @@ class TimeSheetSerializer(BaseSerializer):
         fields = "__all__"
 
 
-class WeeklyProgramUpdateSerializer(BaseSerializer):
+class WeeklyProgramUpdateSerializer(RenditionsMixin, BaseSerializer):
     operation_area_display = serializers.ReadOnlyField(source="get_operation_area_display")
     status_display = serializers.ReadOnlyField(source="get_status_display")
     date = serializers.DateField(format="%d/%m/%Y", required=False)
@@ -98,6 +106,9 @@ class WeeklyProgramUpdateSerializer(BaseSerializer):
     class Meta(BaseSerializer.Meta):
         model = WeeklyProgramUpdate
         fields = "__all__"
+        datatables_always_serialize = BaseSerializer.Meta.datatables_always_serialize + (
+            "renditions",
+        )
 
 
 class WeeklyProgramUpdateCommentSerializer(BaseSerializer):
@@ -1,6 +1,6 @@
 import json
 import random
-from datetime import date
+from datetime import date, timedelta
 from os.path import join
 
 from django.conf import settings
@@ -12,7 +12,7 @@ from model_bakery import baker
 from rest_framework.test import APITestCase
 
 from fahari.common.constants import WHITELIST_COUNTIES
-from fahari.common.models import Facility, System
+from fahari.common.models import ChunkedUpload, Facility, ImageRendition, System
 from fahari.common.tests.test_api import LoggedInMixin
 from fahari.ops.forms import FacilitySystemTicketForm, WeeklyProgramUpdateCommentForm
 from fahari.ops.models import (
@@ -220,6 +220,21 @@ class FacilitySystemTicketViewsetTest(LoggedInMixin, APITestCase):
         details = [a["details"] for a in response.data["results"]]
         assert instance.details in details
 
+    def test_retrieve_search(self):
+        instance = baker.make(
+            FacilitySystemTicket,
+            facility_system=self.facility_system,
+            details=fake.text(),
+            raised_by=fake.name(),
+            organisation=self.global_organisation,
+        )
+        for search in (self.facility.name, self.system.name, "no such ticket"):
+            response = self.client.get(self.url_list, {"search": search})
+            assert response.status_code == 200, response.json()
+
+            details = [a["details"] for a in response.data["results"]]
+            assert (instance.details in details) == (search != "no such ticket"), search
+
     def test_patch_system(self):
         instance = baker.make(
             FacilitySystemTicket,
@@ -382,6 +397,64 @@ class StockReceiptsViewsetTest(LoggedInMixin, APITestCase):
         facilities = [a["facility"] for a in response.data["results"]]
         assert instance.facility.pk in facilities
 
+    def test_create_with_chunked_upload(self):
+        upload, document, other_users_upload = (
+            baker.make(
+                ChunkedUpload,
+                created_by=created_by,
+                file=name,
+                organisation=self.global_organisation,
+                status=ChunkedUpload.Status.COMPLETE,
+            )
+            for created_by, name in (
+                (self.user.pk, "uploads/files/a/delivery_note.jpg"),
+                (self.user.pk, "uploads/files/b/delivery_note.pdf"),
+                (None, "uploads/files/c/delivery_note.jpg"),
+            )
+        )
+        data = {
+            "facility": self.facility.pk,
+            "commodity": self.commodity.pk,
+            "delivery_note_number": fake.name()[:63],
+            "quantity_received": "10.0",
+            "batch_number": fake.name()[:63],
+            "comments": fake.text(),
+            "delivery_note_image": str(upload.pk),
+        }
+        response = self.client.post(self.url_list, data)
+        assert response.status_code == 201, response.json()
+        instance = StockReceiptVerification.objects.get(pk=response.data["id"])
+        assert instance.delivery_note_image.name == upload.file
+
+        for invalid_upload in (document, other_users_upload):
+            data["delivery_note_image"] = str(invalid_upload.pk)
+            response = self.client.post(self.url_list, data)
+            assert response.status_code == 400, response.json()
+            assert "delivery_note_image" in response.json()
+
+    def test_retrieve_renditions(self):
+        instances = baker.make(
+            StockReceiptVerification,
+            3,
+            facility=self.facility,
+            organisation=self.global_organisation,
+            delivery_note_image=iter(["notes/a.jpg", "notes/b.jpg", ""]),
+        )
+        baker.make(
+            ImageRendition,
+            source="notes/a.jpg",
+            status=ImageRendition.Status.READY,
+            renditions={"thumbnail": "renditions/thumbnail/notes/a.jpg"},
+        )
+        baker.make(ImageRendition, source="notes/b.jpg", status=ImageRendition.Status.PENDING)
+
+        response = self.client.get(self.url_list)
+        assert response.status_code == 200, response.json()
+        renditions = {result["id"]: result["renditions"] for result in response.data["results"]}
+        assert set(renditions[str(instances[0].pk)]["delivery_note_image"]) == {"thumbnail"}
+        assert renditions[str(instances[1].pk)] == {}
+        assert renditions[str(instances[2].pk)] == {}
+
     def test_patch(self):
         instance = baker.make(
             StockReceiptVerification,
@@ -466,6 +539,14 @@ class StockReceiptsFormTest(LoggedInMixin, TestCase):
                 302,
             )
 
+        # The renditions of the delivery note are generated off the request path
+        instance = StockReceiptVerification.objects.get(
+            delivery_note_number=data["delivery_note_number"]
+        )
+        assert ImageRendition.objects.get(source=instance.delivery_note_image.name).status == (
+            ImageRendition.Status.PENDING
+        )
+
     def test_update(self):
         instance = baker.make(
             StockReceiptVerification,
@@ -707,6 +788,29 @@ class DailyUpdateViewsetTest(LoggedInMixin, APITestCase):
         assert response.status_code == 200, response.json()
         assert response.data["active"] == edit["active"]
 
+    def test_conditional_requests(self):
+        instance = baker.make(
+            DailyUpdate,
+            facility=self.facility,
+            organisation=self.global_organisation,
+        )
+        url_detail = reverse(self.detail_url_name, kwargs={"pk": instance.pk})
+        etag = self.client.get(self.url_list)["ETag"]
+        response = self.client.get(url_detail)
+        detail_etag, last_modified = response["ETag"], response["Last-Modified"]
+        assert self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert self.client.get(url_detail, HTTP_IF_NONE_MATCH=detail_etag).status_code == 304
+
+        # Updating the facility changes the facility name embedded in the responses
+        Facility.objects.filter(pk=self.facility.pk).update(
+            name="Renamed Facility", updated=timezone.now() + timedelta(minutes=1)
+        )
+        assert self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        response = self.client.get(url_detail, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == 200
+        assert response.data["facility_name"] == "Renamed Facility"
+        assert response["Last-Modified"] != last_modified
+
     def test_put(self):
         instance = baker.make(
             DailyUpdate,
@@ -10,6 +10,7 @@ from django.views.generic import CreateView, DeleteView, TemplateView, UpdateVie
 from django.views.generic.detail import SingleObjectMixin, SingleObjectTemplateResponseMixin
 from django.views.generic.edit import FormMixin, ProcessFormView
 
+from fahari.common.pagination import KeysetPagination
 from fahari.common.views import ApprovedMixin, BaseFormMixin, BaseView, FormContextMixin
 from fahari.misc.forms import ImportStockVerificationReceiptsForm
 
@@ -130,6 +131,7 @@ class FacilitySystemDeleteView(
 class FacilitySystemViewSet(BaseView):
     queryset = FacilitySystem.objects.active()
     serializer_class = FacilitySystemSerializer
+    conditional_related_lookups = ("facility", "system")
     filterset_class = FacilitySystemFilter
     ordering_fields = (
         "facility__name",
@@ -224,6 +226,11 @@ class FacilitySystemTicketResolveView(
 class FacilitySystemTicketViewSet(BaseView):
     queryset = FacilitySystemTicket.objects.active()
     serializer_class = FacilitySystemTicketSerializer
+    conditional_related_lookups = (
+        "facility_system",
+        "facility_system__facility",
+        "facility_system__system",
+    )
     filterset_class = FacilitySystemTicketFilter
     ordering_fields = (
         "facility_system__facility__name",
@@ -289,6 +296,7 @@ class StockReceiptVerificationViewSet(BaseView):
     queryset = StockReceiptVerification.objects.active()
     serializer_class = StockReceiptVerificationSerializer
     filterset_class = StockReceiptVerificationFilter
+    pagination_class = KeysetPagination
     ordering_fields = (
         "facility__name",
         "-expiry_date",
@@ -299,6 +307,8 @@ class StockReceiptVerificationViewSet(BaseView):
         "comments",
     )
     facility_field_lookup = "facility"
+    # The renditions of the delivery notes become ready after the records are saved
+    conditional_requests = False
 
 
 class ActivityLogContextMixin:
@@ -389,6 +399,7 @@ class DailyUpdateDeleteView(
 class DailyUpdateViewSet(BaseView):
     queryset = DailyUpdate.objects.active()
     serializer_class = DailyUpdateSerializer
+    conditional_related_lookups = ("facility",)
     filterset_class = DailyUpdateFilter
     ordering_fields = (
         "-date",
@@ -448,6 +459,8 @@ class TimeSheetApproveView(TimeSheetContextMixin, TemplateView):
 class TimeSheetViewSet(BaseView):
     queryset = TimeSheet.objects.active()
     serializer_class = TimeSheetSerializer
+    # The names of the staff and approvers are embedded, users have no update timestamp
+    conditional_requests = False
     filterset_class = TimeSheetFilter
     ordering_fields = (
         "-date",
@@ -526,6 +539,8 @@ class WeeklyProgramUpdateViewSet(BaseView):
         "operation_area",
         "status",
     )
+    # The renditions of the attachments become ready after the records are saved
+    conditional_requests = False
 
 
 class WeeklyProgramUpdateCommentsContextMixin:
@@ -593,6 +608,8 @@ class WeeklyProgramUpdateCommentsViewSet(BaseView):
     )
     filterset_class = WeeklyProgramUpdateCommentsFilter
     serializer_class = WeeklyProgramUpdateCommentsReadSerializer
+    # The embedded weekly updates carry renditions that become ready after they are saved
+    conditional_requests = False
     search_fields = (
         "weekly_update",
         "comment",
@@ -685,6 +702,7 @@ class UoMDeleteView(UoMContextMixin, BaseFormMixin, DeleteView):
 class UoMViewSet(BaseView):
     queryset = UoM.objects.active()
     serializer_class = UoMSerializer
+    conditional_related_lookups = ("category",)
     filterset_class = UoMFilter
     ordering_fields = ("name",)
     serializer_fields = ("name",)
@@ -771,6 +789,7 @@ class FacilityNetworkStatusDeleteView(NetworkStatusMixin, BaseFormMixin, FormMix
 class FacilityNetworkStatusViewSet(BaseView):
     queryset = FacilityNetworkStatus.objects.active()
     serializer_class = FacilityNetworkStatusSerializer
+    conditional_related_lookups = ("facility",)
     filterset_class = FacilityNetworkStatusFilter
     ordering_fields = (
         "facility__name",
@@ -821,6 +840,7 @@ class FacilityDeviceDeleteView(FacilityDevicesMixin, BaseFormMixin, FormContextM
 class FacilityDeviceViewSet(BaseView):
     queryset = FacilityDevice.objects.active()
     serializer_class = FacilityDeviceSerializer
+    conditional_related_lookups = ("facility",)
     filterset_class = FacilityDeviceFilter
     ordering_fields = (
         "facility__name",
@@ -878,6 +898,7 @@ class FacilityDeviceRequestDeleteView(
 class FacilityDeviceRequestViewSet(BaseView):
     queryset = FacilityDeviceRequest.objects.active()
     serializer_class = FacilityDeviceRequestSerializer
+    conditional_related_lookups = ("facility",)
     filterset_class = FacilityDeviceRequestFilter
     ordering_fields = (
         "facility__name",
@@ -939,6 +960,7 @@ class SecurityIncidenceDeleteView(
 class SecurityIncidenceViewSet(BaseView):
     queryset = SecurityIncidence.objects.active()
     serializer_class = SecurityIncidenceSerializer
+    conditional_related_lookups = ("facility",)
     filterset_class = SecurityIncidenceFilter
     ordering_fields = (
         "facility__name",
@@ -0,0 +1,466 @@
+"""Cross-response analytics for the answers to questionnaires.
+
+The answers to all questionnaires are held in an in-memory, columnar frame
+that is loaded once per process and then refreshed incrementally, i.e. only
+the answers saved since the last refresh are fetched and merged in. Saving
+or deleting answers, and changing the questions, questionnaire responses
+or facilities that they belong to, bumps *analytics versions* in the shared
+cache once the changes commit and the frame is only refreshed when these
+versions change. Answers are aggregated per question code, optionally
+grouped by county, facility, period and questionnaire, and the aggregates
+are memoized until the frame next changes.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import Workbook
+
+from .models import Question, QuestionAnswer, QuestionnaireResponses
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DIMENSIONS = ("county", "facility", "period", "questionnaire")
+"""The dimensions that answers can be grouped and filtered by."""
+
+MAX_MEMOIZED_AGGREGATES = 256
+
+ANSWERS_VERSION_CACHE_KEY = "sims:analytics_version:answers"
+"""Bumped whenever an answer is saved."""
+
+ANSWER_DIMENSIONS_VERSION_CACHE_KEY = "sims:analytics_version:dimensions"
+"""Bumped whenever a question, questionnaire responses or facility changes."""
+
+ANSWER_DELETIONS_VERSION_CACHE_KEY = "sims:analytics_version:deletions"
+"""Bumped whenever an answer is deleted."""
+
+ANSWERS_WATERMARK_OVERLAP = timedelta(hours=1)
+"""How far back before the last refresh saved answers are fetched again.
+
+Answers are saved, and their `answered_on` set, before the request that
+saves them commits. This must be longer than the longest request, see the
+Cloud Run request timeout in cloudbuild.yaml.
+"""
+
+_FRAME_FIELDS = ("pk", "question", "questionnaire_response", "is_not_applicable", "response")
+
+Aggregate = Dict[str, Any]
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def get_period(date: datetime) -> str:
+    """Return the quarter that the given date falls in, e.g. "2022-Q1"."""
+
+    date = timezone.localtime(date)
+    return "%d-Q%d" % (date.year, (date.month - 1) // 3 + 1)
+
+
+def to_analytics_value(answer_type: str, content: Any) -> Any:
+    """Convert the content of an answer's response to a value that can be aggregated.
+
+    Contents that are missing or that cannot be converted are returned as
+    `None` and are ignored during aggregation.
+    """
+
+    if content is None:
+        return None
+    try:
+        if answer_type == Question.AnswerTypes.YES_NO.value:
+            return bool(content)
+        if answer_type in (Question.AnswerTypes.INTEGER.value, Question.AnswerTypes.REAL.value):
+            return float(content)
+        if answer_type == Question.AnswerTypes.FRACTION.value:
+            return float(content[0]), float(content[1])
+        if answer_type == Question.AnswerTypes.SELECT_MULTIPLE.value:
+            return tuple(content)
+        if answer_type == Question.AnswerTypes.SELECT_ONE.value:
+            return str(content)
+    except (IndexError, TypeError, ValueError):
+        return None
+    return None
+
+
+def _aggregate_numbers(values: Sequence[Any]) -> Aggregate:
+    if not values:
+        return {"sum": None, "mean": None, "min": None, "max": None}
+    total = sum(values)
+    return {"sum": total, "mean": total / len(values), "min": min(values), "max": max(values)}
+
+
+def _aggregate_fractions(values: Sequence[Any]) -> Aggregate:
+    numerator = sum(value[0] for value in values)
+    denominator = sum(value[1] for value in values)
+    return {
+        "numerator": numerator,
+        "denominator": denominator,
+        "ratio": numerator / denominator if denominator else None,
+    }
+
+
+def _aggregate_options(values: Sequence[Any]) -> Aggregate:
+    options: Counter = Counter()
+    for value in values:
+        options.update(value if isinstance(value, tuple) else (value,))
+    return {"options": dict(options)}
+
+
+def _aggregate_yes_no(values: Sequence[Any]) -> Aggregate:
+    yes = sum(values)
+    return {
+        "yes": yes,
+        "no": len(values) - yes,
+        "yes_ratio": yes / len(values) if values else None,
+    }
+
+
+_AGGREGATORS: Mapping[str, Callable[[Sequence[Any]], Aggregate]] = {
+    Question.AnswerTypes.FRACTION.value: _aggregate_fractions,
+    Question.AnswerTypes.INTEGER.value: _aggregate_numbers,
+    Question.AnswerTypes.REAL.value: _aggregate_numbers,
+    Question.AnswerTypes.SELECT_MULTIPLE.value: _aggregate_options,
+    Question.AnswerTypes.SELECT_ONE.value: _aggregate_options,
+    Question.AnswerTypes.YES_NO.value: _aggregate_yes_no,
+}
+
+
+# =============================================================================
+# CHANGE VERSIONS
+# =============================================================================
+
+
+def _bump(cache_key: str) -> None:
+    try:
+        cache.incr(cache_key)
+    except ValueError:  # The key is missing
+        cache.set(cache_key, 1, None)
+
+
+def bump_analytics_version_on_commit(cache_key: str) -> None:
+    """Bump the given analytics version once the current transaction commits.
+
+    Bumping earlier would let a concurrent refresh miss the changes while
+    recording the new version as seen.
+
+    :param cache_key: One of `ANSWERS_VERSION_CACHE_KEY`,
+           `ANSWER_DIMENSIONS_VERSION_CACHE_KEY` or
+           `ANSWER_DELETIONS_VERSION_CACHE_KEY`.
+    """
+
+    transaction.on_commit(partial(_bump, cache_key))
+
+
+def get_analytics_versions() -> Tuple[int, int, int]:
+    """Return the current answers, answer dimensions and answer deletions versions.
+
+    The versions are read from the shared cache in one round trip.
+    """
+
+    keys = (
+        ANSWERS_VERSION_CACHE_KEY,
+        ANSWER_DIMENSIONS_VERSION_CACHE_KEY,
+        ANSWER_DELETIONS_VERSION_CACHE_KEY,
+    )
+    versions = cache.get_many(keys)
+    answers, dimensions, deletions = (versions.get(key, 0) for key in keys)
+    return answers, dimensions, deletions
+
+
+# =============================================================================
+# ANSWERS FRAME
+# =============================================================================
+
+
+class AnswersFrame:
+    """A columnar, in-memory table of the answers to all questionnaires.
+
+    Each column is a list holding a single attribute of every answer, rows
+    are indexed by answer pk and by question. The dimensions of the answers,
+    e.g. the county of their facility, are looked up from separate question
+    and questionnaire responses tables so that changes to them don't require
+    the answers to be fetched again. Instances are safe to share between
+    threads.
+    """
+
+    columns = ("content", "is_not_applicable", "question", "questionnaire_response")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.data: Dict[str, List[Any]] = {column: [] for column in self.columns}
+        self.rows_by_pk: Dict[Any, int] = {}
+        self.rows_by_question: Dict[Any, List[int]] = defaultdict(list)
+        # The question code and answer type of each question
+        self.questions: Dict[Any, Tuple[str, str]] = {}
+        self.questions_by_code: Dict[str, List[Any]] = defaultdict(list)
+        # The county, facility, period and questionnaire of each questionnaire responses
+        self.responses: Dict[Any, Tuple[str, str, str, str]] = {}
+        self.watermark: Optional[datetime] = None
+        self.analytics_versions: Optional[Tuple[int, int, int]] = None
+        self._aggregates: Dict[Tuple, List[Aggregate]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows_by_pk)
+
+    def aggregate(
+        self,
+        question_code: str,
+        group_by: Sequence[str] = (),
+        responses: Optional[FrozenSet[Any]] = None,
+        **filters: Any,
+    ) -> List[Aggregate]:
+        """Aggregate the answers to the question with the given question code.
+
+        Every aggregate includes the values of the `group_by` dimensions, the
+        number of answers (`count`) and the number of non-applicable answers
+        (`not_applicable`). The rest of the entries depend on the question's
+        answer type:
+
+        * yes_no: `yes`, `no` and `yes_ratio`.
+        * int and real: `sum`, `mean`, `min` and `max`.
+        * fraction: the summed `numerator` and `denominator` and their `ratio`.
+        * select_one and select_multiple: the count of each selected option
+          under `options`.
+
+        :param question_code: The question code of the question whose
+               answers are to be aggregated.
+        :param group_by: The dimensions to group the answers by.
+        :param responses: If given, only aggregate the answers belonging to
+               these questionnaire responses.
+        :param filters: Dimension values that answers must have in order to
+               be aggregated, e.g. `county="Nairobi"`.
+
+        :return: The aggregates, ordered by their `group_by` values.
+        """
+
+        unknown_dimensions = set(group_by).union(filters).difference(DIMENSIONS)
+        if unknown_dimensions:
+            raise ValueError("Unknown dimensions: %s." % ", ".join(sorted(unknown_dimensions)))
+
+        key = (
+            self.version,
+            question_code,
+            tuple(group_by),
+            responses,
+            tuple(sorted(filters.items())),
+        )
+        with self._lock:
+            if key not in self._aggregates:
+                if len(self._aggregates) >= MAX_MEMOIZED_AGGREGATES:
+                    self._aggregates.clear()
+                self._aggregates[key] = self._aggregate(
+                    question_code, group_by, responses, filters
+                )
+            return self._aggregates[key]
+
+    def refresh(self) -> None:
+        """Bring this frame up to date with the answers in the database.
+
+        Nothing but the analytics versions, a single cache lookup, is read
+        unless the versions changed since the last refresh. Then, the answers
+        saved within `ANSWERS_WATERMARK_OVERLAP` of the last refresh are
+        fetched and merged in. The overlap covers answers that were saved
+        before, but committed after, the last refresh. The questions and
+        questionnaire responses tables are reloaded if their dimensions
+        changed and the frame is rebuilt from scratch if answers have been
+        deleted.
+        """
+
+        # Read the versions before the data so that changes committed in
+        # between bump the versions again and are picked up next time.
+        versions = get_analytics_versions()
+        with self._lock:
+            if versions == self.analytics_versions:
+                return
+            if self.analytics_versions is not None and self.analytics_versions[2] != versions[2]:
+                self._reset()
+            previous_versions = self.analytics_versions
+
+            now = timezone.now()
+            answers = QuestionAnswer.objects.all()
+            if self.watermark is not None:
+                answers = answers.filter(
+                    answered_on__gte=self.watermark - ANSWERS_WATERMARK_OVERLAP
+                )
+            questions, responses = self._merge(answers.values_list(*_FRAME_FIELDS))
+            changed = bool(questions)
+            # The dimensions are loaded after the answers so that the
+            # questions and responses of all the merged answers are included.
+            if (
+                previous_versions is None
+                or previous_versions[1] != versions[1]
+                or not questions.issubset(self.questions)
+                or not responses.issubset(self.responses)
+            ):
+                self._load_dimensions()
+                changed = True
+            if changed:
+                self.version += 1
+            self.watermark = now
+            self.analytics_versions = versions
+
+    def _aggregate(
+        self,
+        question_code: str,
+        group_by: Sequence[str],
+        responses: Optional[FrozenSet[Any]],
+        filters: Mapping[str, Any],
+    ) -> List[Aggregate]:
+        data = self.data
+        question_pks = self.questions_by_code.get(question_code, ())
+        groups: Dict[Tuple, List[int]] = defaultdict(list)
+        for row in chain.from_iterable(self.rows_by_question.get(pk, ()) for pk in question_pks):
+            response = data["questionnaire_response"][row]
+            if responses is not None and response not in responses:
+                continue
+            dimensions = dict(zip(DIMENSIONS, self.responses[response]))
+            if any(dimensions[dimension] != value for dimension, value in filters.items()):
+                continue
+            groups[tuple(dimensions[dimension] for dimension in group_by)].append(row)
+
+        results: List[Aggregate] = []
+        for group, rows in sorted(groups.items(), key=lambda item: tuple(map(str, item[0]))):
+            answer_types = [self.questions[data["question"][row]][1] for row in rows]
+            values = [
+                value
+                for value in (
+                    to_analytics_value(answer_type, data["content"][row])
+                    for answer_type, row in zip(answer_types, rows)
+                    if not data["is_not_applicable"][row]
+                )
+                if value is not None
+            ]
+            result: Aggregate = {
+                **dict(zip(group_by, group)),
+                "question_code": question_code,
+                "count": len(rows),
+                "not_applicable": sum(data["is_not_applicable"][row] for row in rows),
+            }
+            aggregator = _AGGREGATORS.get(answer_types[0])
+            if aggregator is not None:
+                result.update(aggregator(values))
+            results.append(result)
+
+        return results
+
+    def _load_dimensions(self) -> None:
+        """Load the question and questionnaire responses tables."""
+
+        self.questions = {
+            pk: (question_code, answer_type)
+            for pk, question_code, answer_type in Question.objects.values_list(
+                "pk", "question_code", "answer_type"
+            )
+        }
+        self.questions_by_code = defaultdict(list)
+        for pk, (question_code, _) in self.questions.items():
+            self.questions_by_code[question_code].append(pk)
+        self.responses = {
+            pk: (county, str(facility), get_period(start_date), str(questionnaire))
+            for pk, county, facility, start_date, questionnaire in (
+                QuestionnaireResponses.objects.values_list(
+                    "pk", "facility__county", "facility", "start_date", "questionnaire"
+                )
+            )
+        }
+
+    def _merge(self, rows: Iterable[Tuple]) -> Tuple[Set[Any], Set[Any]]:
+        """Insert or update the given answer rows.
+
+        :return: The questions and the questionnaire responses of the
+                 inserted or changed answers.
+        """
+
+        data = self.data
+        questions: Set[Any] = set()
+        responses: Set[Any] = set()
+        for pk, question, questionnaire_response, is_not_applicable, response in rows:
+            values = {
+                "content": (response or {}).get("content"),
+                "is_not_applicable": is_not_applicable,
+                "question": question,
+                "questionnaire_response": questionnaire_response,
+            }
+            row = self.rows_by_pk.get(pk)
+            if row is None:
+                row = self.rows_by_pk[pk] = len(data["question"])
+                for column, value in values.items():
+                    data[column].append(value)
+                self.rows_by_question[question].append(row)
+            elif all(data[column][row] == value for column, value in values.items()):
+                # Unchanged, e.g. fetched again because of the watermark overlap
+                continue
+            else:
+                if data["question"][row] != question:
+                    self.rows_by_question[data["question"][row]].remove(row)
+                    self.rows_by_question[question].append(row)
+                for column, value in values.items():
+                    data[column][row] = value
+            questions.add(question)
+            responses.add(questionnaire_response)
+
+        return questions, responses
+
+
+_answers_frame = AnswersFrame()
+
+
+def get_answers_frame() -> AnswersFrame:
+    """Return this process's answers frame, refreshed with the latest answers."""
+
+    _answers_frame.refresh()
+    return _answers_frame
+
+
+def aggregates_to_workbook(aggregates: Sequence[Aggregate]) -> Workbook:
+    """Return a workbook with the given aggregates laid out one per row.
+
+    Selected options are spread out into an "option: <name>" column each.
+    """
+
+    header: List[str] = []
+    rows: List[Dict[str, Any]] = []
+    for aggregate in aggregates:
+        row = {key: value for key, value in aggregate.items() if key != "options"}
+        row.update(
+            ("option: %s" % option, count)
+            for option, count in aggregate.get("options", {}).items()
+        )
+        header.extend(column for column in row if column not in header)
+        rows.append(row)
+
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Analytics"
+    worksheet.append(header)
+    for row in rows:
+        worksheet.append([row.get(column) for column in header])
+    return workbook
@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from django.db import models
 
@@ -22,7 +22,8 @@ class AnswerTypeValidityChecker(metaclass=ABCMeta):
     interface defines a single method, `self.is_valid_answer_value()` and a
     single property `self.valid_answer_query_expression` that are used to
     check an answer's validity before an answer is saved and after an answer
-    is saved respectively.
+    is saved respectively. The method `self.is_valid_answer_response()`
+    applies the post save check to an answer in memory.
     """
 
     @property
@@ -47,6 +48,23 @@ class AnswerTypeValidityChecker(metaclass=ABCMeta):
         """
         ...
 
+    def is_valid_answer_response(
+        self, response: Mapping[str, Any], is_not_applicable: bool
+    ) -> bool:
+        """Check a saved answer's validity in memory.
+
+        This must agree with `self.valid_answer_query_expression`. Unlike
+        `self.is_valid_answer_value()`, blank answers are not valid unless
+        they are marked as non applicable.
+
+        :param response: The response of the answer whose validity is to be checked.
+        :param is_not_applicable: Indicates whether the answer is marked as non applicable.
+
+        :return: `True` if the answer is valid and `False` otherwise.
+        """
+
+        return is_not_applicable or response.get("content") is not None
+
 
 class FractionAnswerTypeValidityChecker(AnswerTypeValidityChecker):
     """Utility used to check if an answer is valid for fraction answer types."""
@@ -73,6 +91,17 @@ class FractionAnswerTypeValidityChecker(AnswerTypeValidityChecker):
 
         return True
 
+    def is_valid_answer_response(
+        self, response: Mapping[str, Any], is_not_applicable: bool
+    ) -> bool:
+        content = response.get("content")
+        return is_not_applicable or (
+            type(content) in (list, tuple)
+            and len(content) > 1
+            and content[0] is not None
+            and content[1] is not None
+        )
+
 
 class IntegerAnswerTypeValidityChecker(AnswerTypeValidityChecker):
     """Utility used to check if an answer is valid for integer answer types."""
@@ -95,6 +124,11 @@ class NoneAnswerTypeValidityChecker(AnswerTypeValidityChecker):
     def is_valid_answer_value(self, answer_value: Any, is_not_applicable: bool) -> bool:
         return answer_value is None
 
+    def is_valid_answer_response(
+        self, response: Mapping[str, Any], is_not_applicable: bool
+    ) -> bool:
+        return is_not_applicable or ("content" in response and response["content"] is None)
+
 
 class RealAnswerTypeValidityChecker(AnswerTypeValidityChecker):
     """Utility used to check if an answer is valid for real *(numbers)* answer types."""
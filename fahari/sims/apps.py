@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SimsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "fahari.sims"
+
+    def ready(self):
+        import fahari.sims.signals  # noqa F401
@@ -0,0 +1,38 @@
+"""Recompute and store the validity of the responses of question answers."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from fahari.sims.models import QuestionAnswer
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recompute and store the validity of the responses of question answers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--questionnaire",
+            help="Only backfill the answers to the questionnaire with the given id.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The number of answers to read and write per query.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        answers = QuestionAnswer.objects.all()
+        if options["questionnaire"]:
+            answers = answers.filter(
+                questionnaire_response__questionnaire=options["questionnaire"]
+            )
+        refreshed = answers.refresh_validity(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed the validity of {refreshed} answers in {elapsed:.2f}s.")
+        )
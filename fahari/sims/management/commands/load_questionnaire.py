@@ -0,0 +1,497 @@
+"""Load a questionnaire, its question groups and questions from a JSON file."""
+import json
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypedDict,
+    Union,
+)
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from fahari.common.models import Organisation
+from fahari.sims.analytics import (
+    ANSWER_DIMENSIONS_VERSION_CACHE_KEY,
+    bump_analytics_version_on_commit,
+)
+from fahari.sims.models import Question, QuestionAnswer, QuestionGroup, Questionnaire
+from fahari.users.models import User, default_organisation
+
+DEFAULT_BATCH_SIZE = 500
+
+DEFAULT_SOURCE = settings.ROOT_DIR / "data" / "service_delivery_questionnaire.json"
+
+# The fields compared to decide whether an existing question group or
+# question has changed.
+QUESTION_GROUP_FIELDS = ("parent_id", "precedence", "precedence_display_type")
+
+QUESTION_FIELDS = (
+    "answer_type",
+    "metadata",
+    "parent_id",
+    "precedence",
+    "precedence_display_type",
+    "query",
+    "question_group_id",
+)
+
+# The fields that determine the precedence "slot" an element occupies in its container.
+POSITION_FIELDS = {"parent_id", "precedence", "question_group_id"}
+
+PRECEDENCE_DISPLAY_TYPES = Literal["bullet", "numbered_td", "lower_case_letters_tcb"]
+
+Element = Union[Question, QuestionGroup]
+
+
+class QuestionData(TypedDict):
+    """The structure of a question dictionary."""
+
+    answer_type: str
+    children: Sequence["QuestionData"]  # type: ignore
+    metadata: Dict[str, Any]
+    precedence: int
+    precedence_display_type: Optional[PRECEDENCE_DISPLAY_TYPES]
+    query: str
+    question_code: str
+
+
+class QuestionGroupData(TypedDict):
+    """The structure of a question group dictionary."""
+
+    children: Sequence["QuestionGroupData"]  # type: ignore
+    precedence: int
+    precedence_display_type: Optional[PRECEDENCE_DISPLAY_TYPES]
+    questions: Sequence[QuestionData]
+    title: str
+
+
+class QuestionnaireData(TypedDict):
+    """The structure of a questionnaire dictionary."""
+
+    name: str
+    questionnaire_type: str
+    question_groups: Sequence[QuestionGroupData]
+
+
+class QuestionnaireLoadResult(NamedTuple):
+    """A summary of the changes made to the question groups and questions of a questionnaire."""
+
+    questionnaire: Questionnaire
+    created: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+
+class QuestionnaireLoader:
+    """Create or update a questionnaire from its JSON representation.
+
+    The whole questionnaire tree is built and validated in memory before
+    anything is written. New question groups and questions are then inserted
+    one tree level at a time using `bulk_create`, the changed ones are
+    updated using `bulk_update` and the ones missing from the data are
+    deleted.
+
+    Question groups are matched with existing ones by their title paths and
+    questions by their question codes, so that re-importing an edited
+    questionnaire only applies the differences.
+    """
+
+    def __init__(
+        self, organisation: Organisation, user_pk=None, batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self.organisation = organisation
+        self.user_pk = user_pk
+        self.batch_size = batch_size
+        self.now = timezone.now()
+        self.errors: List[str] = []
+        self.created: Dict[Type[Element], List[List[Element]]] = {QuestionGroup: [], Question: []}
+        self.changed: Dict[Type[Element], List[Element]] = {QuestionGroup: [], Question: []}
+        self.changed_fields: Dict[Type[Element], Set[str]] = {
+            QuestionGroup: {"updated", "updated_by"},
+            Question: {"updated", "updated_by"},
+        }
+        self.moved: Dict[Type[Element], Set[Any]] = {QuestionGroup: set(), Question: set()}
+        self.max_precedence = 0
+        self.unchanged = 0
+
+    def load(self, data: QuestionnaireData) -> QuestionnaireLoadResult:
+        """Create or update a questionnaire from the given data.
+
+        A `ValidationError` listing all the problems found is raised if the
+        data is not valid, in which case nothing is written.
+        """
+
+        try:
+            questionnaire = self._build(data)
+        except KeyError as exp:
+            raise ValidationError('The entry "%s" is missing from the data.' % exp.args[0])
+        if self.errors:
+            raise ValidationError(self.errors)
+
+        removed_groups = [
+            group for path, group in self.existing_groups.items() if path not in self.groups
+        ]
+        removed_questions = [
+            question
+            for code, question in self.existing_questions.items()
+            if code not in self.questions
+        ]
+        with transaction.atomic():
+            if questionnaire._state.adding or self.questionnaire_type_changed:
+                questionnaire.updated_by = self.user_pk
+                questionnaire.save()
+
+            self.moved[QuestionGroup].update(group.pk for group in removed_groups)
+            self.moved[Question].update(question.pk for question in removed_questions)
+            self._vacate_moved_positions(QuestionGroup)
+            self._vacate_moved_positions(Question)
+            self._write(QuestionGroup)
+            self._write(Question)
+            Question.objects.filter(pk__in=[q.pk for q in removed_questions]).delete()
+            QuestionGroup.objects.filter(pk__in=[g.pk for g in removed_groups]).delete()
+
+            # Run the metadata processors that `Question.save()` would have run
+            Question.run_many(
+                [*(q for level in self.created[Question] for q in level), *self.changed[Question]]
+            )
+            if "answer_type" in self.changed_fields[Question]:
+                QuestionAnswer.objects.filter(
+                    question__in=[q.pk for q in self.changed[Question]]
+                ).refresh_validity(self.batch_size)
+                # `bulk_update()` skips the signals that bump the analytics versions
+                bump_analytics_version_on_commit(ANSWER_DIMENSIONS_VERSION_CACHE_KEY)
+            result = QuestionnaireLoadResult(
+                questionnaire=questionnaire,
+                created=sum(len(level) for levels in self.created.values() for level in levels),
+                updated=sum(len(elements) for elements in self.changed.values()),
+                deleted=len(removed_groups) + len(removed_questions),
+                unchanged=self.unchanged,
+            )
+
+        return result
+
+    def _build(self, data: QuestionnaireData) -> Questionnaire:
+        """Build and validate the questionnaire tree in memory."""
+
+        questionnaire = Questionnaire.objects.filter(
+            name=data["name"], organisation=self.organisation
+        ).first() or Questionnaire(
+            name=data["name"], organisation=self.organisation, created_by=self.user_pk
+        )
+        self.questionnaire_type_changed = (
+            questionnaire.questionnaire_type != data["questionnaire_type"]
+        )
+        questionnaire.questionnaire_type = data["questionnaire_type"]
+        self.existing_groups: Dict[Tuple[str, ...], QuestionGroup] = {}
+        self.existing_questions: Dict[str, Question] = {}
+        if not questionnaire._state.adding:
+            self.existing_groups = self._get_question_groups_by_path(questionnaire)
+            self.existing_questions = Question.objects.for_questionnaire(questionnaire).in_bulk(
+                field_name="question_code"
+            )
+        self.groups: Dict[Tuple[str, ...], QuestionGroup] = {}
+        self.questions: Dict[str, Question] = {}
+
+        self._check_precedences('Questionnaire "%s"' % data["name"], data["question_groups"])
+        for group_data in data["question_groups"]:
+            self._build_question_group(group_data, questionnaire, None, ())
+        self._check_question_codes(questionnaire)
+        self._check_dependencies()
+        self._check_removed_questions()
+        return questionnaire
+
+    def _build_question_group(
+        self,
+        data: QuestionGroupData,
+        questionnaire: Questionnaire,
+        parent: Optional[QuestionGroup],
+        parent_path: Tuple[str, ...],
+    ) -> None:
+        path = (*parent_path, data["title"])
+        label = 'Question group "%s"' % " / ".join(path)
+        if path in self.groups:
+            self.errors.append("%s: A question group with this title already exists." % label)
+            return
+
+        group = self._build_element(
+            QuestionGroup,
+            self.existing_groups.get(path),
+            {
+                "parent_id": parent.pk if parent else None,
+                "precedence": data["precedence"],
+                "precedence_display_type": data.get("precedence_display_type"),
+            },
+            len(parent_path),
+            label,
+            questionnaire=questionnaire,
+            title=data["title"],
+        )
+        self.groups[path] = group
+        self._check_precedences(label, data["children"])
+        self._check_precedences(label, data["questions"])
+        for child_data in data["children"]:
+            self._build_question_group(child_data, questionnaire, group, path)
+        for question_data in data["questions"]:
+            self._build_question(question_data, group, None, 0)
+
+    def _build_question(
+        self,
+        data: QuestionData,
+        question_group: QuestionGroup,
+        parent: Optional[Question],
+        depth: int,
+    ) -> None:
+        code = data["question_code"]
+        label = 'Question "%s"' % code
+        if code in self.questions:
+            self.errors.append("%s: A question with this question code already exists." % label)
+            return
+
+        question = self._build_element(
+            Question,
+            self.existing_questions.get(code),
+            {
+                "answer_type": data["answer_type"],
+                "metadata": data["metadata"],
+                "parent_id": parent.pk if parent else None,
+                "precedence": data["precedence"],
+                "precedence_display_type": data.get("precedence_display_type"),
+                "query": data["query"],
+                "question_group_id": question_group.pk,
+            },
+            depth,
+            label,
+            question_code=code,
+        )
+        self.questions[code] = question
+        self._check_precedences(label, data["children"])
+        for child_data in data["children"]:
+            self._build_question(child_data, question_group, question, depth + 1)
+
+    def _build_element(
+        self,
+        model: Type[Element],
+        existing: Optional[Element],
+        values: Dict[str, Any],
+        depth: int,
+        label: str,
+        **identity,
+    ) -> Element:
+        """Create a new element or apply the given values to an existing one."""
+
+        self.max_precedence = max(self.max_precedence, values["precedence"])
+        if existing is None:
+            element = model(
+                organisation=self.organisation,
+                created=self.now,
+                created_by=self.user_pk,
+                updated=self.now,
+                updated_by=self.user_pk,
+                **identity,
+                **values,
+            )
+            while len(self.created[model]) <= depth:
+                self.created[model].append([])
+            self.created[model][depth].append(element)
+        else:
+            element = existing
+            self.max_precedence = max(self.max_precedence, element.precedence)
+            changed = {
+                field for field, value in values.items() if getattr(element, field) != value
+            }
+            if not changed:
+                self.unchanged += 1
+                return element
+            for field in changed:
+                setattr(element, field, values[field])
+            element.updated = self.now
+            element.updated_by = self.user_pk
+            self.changed[model].append(element)
+            self.changed_fields[model].update(changed)
+            if changed & POSITION_FIELDS:
+                self.moved[model].add(element.pk)
+
+        try:
+            element.clean_fields(
+                exclude=("organisation", "parent", "question_group", "questionnaire")
+            )
+        except ValidationError as error:
+            self.errors.extend(
+                "%s: %s: %s" % (label, field, "; ".join(messages))
+                for field, messages in error.message_dict.items()
+            )
+        return element
+
+    def _check_precedences(self, label: str, children_data: Sequence[Mapping[str, Any]]) -> None:
+        """Ensure that the given sibling elements have unique precedences."""
+
+        precedences = [child_data["precedence"] for child_data in children_data]
+        if len(set(precedences)) != len(precedences):
+            self.errors.append("%s: The precedences of its children must be unique." % label)
+
+    def _check_question_codes(self, questionnaire: Questionnaire) -> None:
+        """Ensure that the question codes are not used by the questions of other questionnaires."""
+
+        for code in (
+            Question.objects.filter(question_code__in=self.questions.keys())
+            .exclude(question_group__questionnaire=questionnaire.pk)
+            .values_list("question_code", flat=True)
+        ):
+            self.errors.append(
+                'Question "%s": The question code is used by another questionnaire.' % code
+            )
+
+    def _check_dependencies(self) -> None:
+        """Ensure that `depends_on` metadata refers to questions in the same questionnaire."""
+
+        for code, question in self.questions.items():
+            depends_on = (question.metadata or {}).get("depends_on")
+            if depends_on is not None and depends_on not in self.questions:
+                self.errors.append(
+                    'Question "%s": The question it depends on, "%s", does not exist.'
+                    % (code, depends_on)
+                )
+
+    def _check_removed_questions(self) -> None:
+        """Ensure that none of the questions to be removed have been answered."""
+
+        for code in (
+            QuestionAnswer.objects.filter(
+                question__in=[
+                    question.pk
+                    for question_code, question in self.existing_questions.items()
+                    if question_code not in self.questions
+                ]
+            )
+            .values_list("question__question_code", flat=True)
+            .distinct()
+        ):
+            self.errors.append('Question "%s": Answered questions cannot be removed.' % code)
+
+    def _get_question_groups_by_path(
+        self, questionnaire: Questionnaire
+    ) -> Dict[Tuple[str, ...], QuestionGroup]:
+        """Return the existing question groups of a questionnaire keyed by their title paths."""
+
+        groups = QuestionGroup.objects.for_questionnaire(questionnaire).in_bulk()
+
+        def get_path(group: QuestionGroup) -> Tuple[str, ...]:
+            parent = groups.get(group.parent_id)
+            return (*(get_path(parent) if parent else ()), group.title)
+
+        return {get_path(group): group for group in groups.values()}
+
+    def _vacate_moved_positions(self, model: Type[Element]) -> None:
+        """Move the elements that change position or are removed out of the way.
+
+        The precedences of these elements are shifted past every precedence
+        in use so that inserting or moving elements into their slots doesn't
+        violate the unique precedence constraints mid-way.
+        """
+
+        if self.moved[model]:
+            model.objects.filter(pk__in=self.moved[model]).update(
+                precedence=models.F("precedence") + self.max_precedence + 1
+            )
+
+    def _write(self, model: Type[Element]) -> None:
+        """Insert the new elements level by level and update the changed ones."""
+
+        for level in self.created[model]:
+            model.objects.bulk_create(level, batch_size=self.batch_size)
+        model.objects.bulk_update(
+            self.changed[model], sorted(self.changed_fields[model]), batch_size=self.batch_size
+        )
+
+
+def load_questionnaire_data(
+    data: QuestionnaireData,
+    organisation: Organisation,
+    user_pk=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> QuestionnaireLoadResult:
+    """Create or update a questionnaire from the given data.
+
+    :param data: The questionnaire data to load.
+    :param organisation: The organisation that the questionnaire belongs to.
+    :param user_pk: The pk of the user performing the load.
+    :param batch_size: The maximum number of elements to write per query.
+
+    :return: A summary of the changes made.
+    """
+
+    return QuestionnaireLoader(organisation, user_pk, batch_size).load(data)
+
+
+class Command(BaseCommand):
+    help = "Create or update a questionnaire from a JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source",
+            nargs="?",
+            default=str(DEFAULT_SOURCE),
+            help="The path of the questionnaire JSON file to load.",
+        )
+        parser.add_argument(
+            "--organisation",
+            help="The id of the organisation that the questionnaire belongs to.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of question groups or questions to write per query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            organisation = Organisation.objects.get(
+                pk=options["organisation"] or default_organisation()
+            )
+        except (Organisation.DoesNotExist, ValidationError):
+            raise CommandError("The given organisation does not exist.")
+        user = User.objects.filter(is_staff=True).order_by("date_joined").first()
+
+        try:
+            with open(options["source"]) as source:
+                data = json.load(source)
+        except FileNotFoundError:
+            raise CommandError('The file "%s" does not exist.' % options["source"])
+
+        start = time.perf_counter()
+        try:
+            result = load_questionnaire_data(
+                data,
+                organisation,
+                user_pk=user.pk if user else None,
+                batch_size=options["batch_size"],
+            )
+        except ValidationError as error:
+            raise CommandError(
+                "The questionnaire is not valid:\n%s" % "\n".join(error.messages)
+            ) from error
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Loaded the questionnaire "{result.questionnaire}" in {elapsed:.2f}s: '
+                f"{result.created} created, {result.updated} updated, "
+                f"{result.deleted} deleted, {result.unchanged} unchanged."
+            )
+        )
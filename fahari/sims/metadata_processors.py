@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import json
 from abc import ABCMeta
 from functools import lru_cache
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -21,6 +34,14 @@ from .exceptions import (
 if TYPE_CHECKING:
     from .models import Question, QuestionAnswer, QuestionConstraints, QuestionMetadata
 
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+ConstraintErrors = Mapping[str, Sequence[str]]
+"""A mapping of the names of failed constraints to their error messages."""
+
+
 # =============================================================================
 # HELPERS
 # =============================================================================
@@ -89,6 +110,36 @@ def get_registered_constraint_checkers_by_activation_mode(
     return checkers_by_activation_mode
 
 
+@lru_cache(maxsize=1024)
+def _compile_constraint_checks(constraints_json: str) -> Sequence[ConstraintCheck]:
+    """Compile the given JSON encoded constraints into a sequence of constraint checks.
+
+    The constraints are JSON encoded so that they can be used as a cache key.
+    """
+
+    constraints: QuestionConstraints = json.loads(constraints_json)
+    on_constraint_checkers = get_registered_constraint_checkers_by_activation_mode(
+        ConstraintCheckActivationModes.ON
+    )
+    off_constraint_checkers = get_registered_constraint_checkers_by_activation_mode(
+        ConstraintCheckActivationModes.OFF
+    )
+    checks: List[ConstraintCheck] = [
+        ConstraintCheck(constraint_name, constraints[constraint_name], checker)  # type: ignore
+        for constraint_name, checkers in on_constraint_checkers.items()
+        if constraint_name in constraints
+        for checker in checkers
+    ]
+    checks.extend(
+        ConstraintCheck(constraint_name, None, checker)
+        for constraint_name, checkers in off_constraint_checkers.items()
+        if constraint_name not in constraints
+        for checker in checkers
+    )
+
+    return tuple(checks)
+
+
 # =============================================================================
 # METADATA PROCESSORS
 # =============================================================================
@@ -129,12 +180,93 @@ class AbstractQuestionMetadataProcessor(MetadataEntryProcessor["Question"], meta
         return self._metadata_entry_name
 
 
+class ConstraintCheck(NamedTuple):
+    """A constraint checker bound to the constraint value it checks answer values against."""
+
+    constraint_name: str
+    constraint_value: Any
+    checker: ConstraintChecker
+
+    def __call__(self, answer_value: Any) -> Optional[str]:
+        """Check the given answer value and return an error message if the check fails."""
+
+        try:
+            self.checker.check(self.constraint_name, self.constraint_value, answer_value)
+        except ConstraintCheckError as exp:
+            return str(exp)
+        return None
+
+
 class ConstraintsCheckMetadataProcessor(AbstractQuestionAnswerMetadataProcessor):
-    """An entry processor that runs constraint checks on a question answer instances."""
+    """An entry processor that runs constraint checks on a question answer instances.
+
+    The constraints metadata of a question is compiled into a flat sequence
+    of `ConstraintCheck`s, a check plan, which is cached against the
+    constraints themselves. Changing a question's constraints therefore
+    results in a new plan being compiled while answers to questions with
+    identical constraints share the same plan.
+    """
 
     def __init__(self):
         super().__init__("constraints", False)
 
+    def check(self, constraints: QuestionConstraints, answer_value: Any) -> ConstraintErrors:
+        """Check the given answer value against the given constraints.
+
+        :param constraints: The constraints metadata of the question answered.
+        :param answer_value: The answer value to check.
+
+        :return: A mapping of the names of the failed constraints to their
+                 error messages. This is empty if all the checks pass.
+        """
+
+        return self._run_check_plan(self.compile(constraints), answer_value)
+
+    def check_many(self, answers: Iterable[QuestionAnswer]) -> List[ConstraintErrors]:
+        """Check the values of the given answers against their questions' constraints.
+
+        A check plan is compiled at most once per question. Answers that this
+        processor would skip, i.e. non-applicable answers and answers to
+        questions without constraints, pass all checks. The answers'
+        questions should be loaded beforehand to avoid a query per answer.
+
+        :param answers: The answers to check.
+
+        :return: The failed constraint checks of each answer, in the order of
+                 the given answers.
+        """
+
+        plans: Dict[Any, Sequence[ConstraintCheck]] = {}
+        results: List[ConstraintErrors] = []
+        for answer in answers:
+            if answer.is_not_applicable and not self.run_on_non_applicable_answers:
+                results.append({})
+                continue
+            if answer.question_id not in plans:
+                metadata = answer.question.metadata or {}
+                plans[answer.question_id] = (
+                    self.compile(metadata[self.metadata_entry_name])
+                    if self.metadata_entry_name in metadata
+                    else ()
+                )
+            results.append(
+                self._run_check_plan(
+                    plans[answer.question_id], self.retrieve_value_from_answer(answer)
+                )
+            )
+
+        return results
+
+    def compile(self, constraints: QuestionConstraints) -> Sequence[ConstraintCheck]:
+        """Return the check plan for the given constraints.
+
+        The plan consists of the checks for the registered "ON" checkers whose
+        constraint is present in the given constraints followed by the checks
+        for the registered "OFF" checkers whose constraint is absent.
+        """
+
+        return _compile_constraint_checks(json.dumps(constraints, sort_keys=True))
+
     def process(
         self, metadata_entry_value: QuestionConstraints, metadata_container: QuestionAnswer
     ) -> None:
@@ -145,31 +277,7 @@ class ConstraintsCheckMetadataProcessor(AbstractQuestionAnswerMetadataProcessor)
         """
 
         answer_value: Any = self.retrieve_value_from_answer(metadata_container)
-        errors: Dict[str, Sequence[str]] = {}
-        off_constraint_checkers = get_registered_constraint_checkers_by_activation_mode(
-            ConstraintCheckActivationModes.OFF
-        )
-        on_constraint_checkers = get_registered_constraint_checkers_by_activation_mode(
-            ConstraintCheckActivationModes.ON
-        )
-
-        # Run constraint checkers with an "ON" activation mode
-        self._run_constraint_checkers(
-            on_constraint_checkers,
-            lambda constraint_name, constraints_meta: constraint_name in constraints_meta,  # noqa
-            metadata_entry_value,
-            answer_value,
-            errors,
-        )
-        # Run constraint checkers with an "OFF" activation mode
-        self._run_constraint_checkers(
-            off_constraint_checkers,
-            lambda constraint_name, constraints_meta: constraint_name
-            not in constraints_meta,  # noqa
-            metadata_entry_value,
-            answer_value,
-            errors,
-        )
+        errors = self.check(metadata_entry_value, answer_value)
         if errors:
             error_message = ", ".join(chain.from_iterable(errors.values()))
             raise QuestionAnswerMetadataProcessingError(
@@ -190,49 +298,16 @@ class ConstraintsCheckMetadataProcessor(AbstractQuestionAnswerMetadataProcessor)
         return answer.response.get("content")
 
     @staticmethod
-    def _run_constraint_checkers(
-        constraint_checkers: Dict[str, Sequence[ConstraintChecker]],
-        applicability_filter: Callable[[str, QuestionConstraints], bool],
-        constraints_meta: QuestionConstraints,
-        answer_value: Any,
-        errors_dict: Dict[str, Sequence[str]],
-    ) -> None:
-        """Execute all the provided constraint checkers if they are applicable.
+    def _run_check_plan(plan: Sequence[ConstraintCheck], answer_value: Any) -> ConstraintErrors:
+        """Run the checks in the given plan against the given answer value."""
 
-        The `applicability_filter` predicate is used to determine which
-        checkers qualify for execution.
-        """
+        errors: Dict[str, List[str]] = {}
+        for check in plan:
+            error = check(answer_value)
+            if error is not None:
+                errors.setdefault(check.constraint_name, []).append(error)
 
-        CCMP = ConstraintsCheckMetadataProcessor  # noqa
-        for constraint_name, checkers in constraint_checkers.items():
-            if not applicability_filter(constraint_name, constraints_meta):
-                continue
-            constraint_value = constraints_meta.get(constraint_name)  # noqa
-            check_errors = CCMP._run_constraint_checkers_for_answer_value(
-                checkers, answer_value, constraint_name, constraint_value
-            )
-            if check_errors:
-                constraint_errors: List[str] = list(errors_dict.get(constraint_name, []))
-                constraint_errors.extend(check_errors)
-                errors_dict[constraint_name] = constraint_errors
-
-    @staticmethod
-    def _run_constraint_checkers_for_answer_value(
-        constraint_checkers: Sequence[ConstraintChecker],
-        answer_value: Any,
-        constraint_name: str,
-        constraint_value: Any,
-    ) -> Sequence[str]:
-        """Execute the given constraint checkers for the given answer value."""
-
-        constraint_check_errors: List[str] = []
-        for checker in constraint_checkers:
-            try:
-                checker.check(constraint_name, constraint_value, answer_value)
-            except ConstraintCheckError as exp:
-                constraint_check_errors.append(str(exp))
-
-        return constraint_check_errors
+        return errors
 
 
 class DenominatorValueExistIfDenominatorNonEditable(AbstractQuestionMetadataProcessor):
@@ -271,15 +346,23 @@ class DependentQuestionExistsMetadataProcessor(AbstractQuestionMetadataProcessor
     def process(self, metadata_entry_value: Any, metadata_container: Question) -> None:
         """Ensure that the dependent on question does indeed exist."""
 
+        self.process_many([(metadata_entry_value, metadata_container)])
+
+    def process_many(self, entries: Sequence[Tuple[Any, Question]]) -> None:
+        """Ensure that the dependent on questions exist, using a single query."""
+
         from .models import Question
 
-        try:
-            dependent_question_code = metadata_container.metadata["depends_on"]
-            Question.objects.get(question_code=dependent_question_code)
-        except Question.DoesNotExist:
-            err_message = (
-                'Question with question_code "%s" does not exist' % dependent_question_code  # noqa
-            )
-            raise QuestionMetadataProcessingError(
-                self.metadata_entry_name, metadata_entry_value, metadata_container, err_message
-            )
+        existing_question_codes = set(
+            Question.objects.filter(
+                question_code__in={question_code for question_code, _ in entries}
+            ).values_list("question_code", flat=True)
+        )
+        for dependent_question_code, question in entries:
+            if dependent_question_code not in existing_question_codes:
+                err_message = (
+                    'Question with question_code "%s" does not exist' % dependent_question_code
+                )
+                raise QuestionMetadataProcessingError(
+                    self.metadata_entry_name, dependent_question_code, question, err_message
+                )
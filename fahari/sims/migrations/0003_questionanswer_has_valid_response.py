@@ -0,0 +1,53 @@
+# Generated by Django 3.2.9 on 2022-01-26 09:12
+
+from django.db import migrations, models
+
+# The post save validity checks of each answer type, inlined from
+# `fahari.sims.answer_type_validity_checkers` as they were when this
+# migration was written.
+IS_VALID_ANSWER = models.Q(is_not_applicable=True) | ~models.Q(response__content=None)
+
+VALID_ANSWER_QUERY_EXPRESSIONS = {
+    'fraction': models.Q(is_not_applicable=True) | (
+        ~models.Q(response__content__0=None) & ~models.Q(response__content__1=None)
+    ),
+    'int': IS_VALID_ANSWER,
+    'none': models.Q(is_not_applicable=True) | models.Q(response__content=None),
+    'real': IS_VALID_ANSWER,
+    'select_one': IS_VALID_ANSWER,
+    'select_multiple': IS_VALID_ANSWER,
+    'text': IS_VALID_ANSWER,
+    'yes_no': IS_VALID_ANSWER,
+}
+
+
+def backfill_has_valid_response(apps, schema_editor):
+    QuestionAnswer = apps.get_model('sims', 'QuestionAnswer')
+    for answer_type, expression in VALID_ANSWER_QUERY_EXPRESSIONS.items():
+        QuestionAnswer.objects.filter(question__answer_type=answer_type).update(
+            has_valid_response=models.Case(
+                models.When(expression, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sims', '0002_auto_20220109_1606'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionanswer',
+            name='has_valid_response',
+            field=models.BooleanField(default=False, editable=False, help_text='Indicates that the response is valid for the answer type of the attached question. This is computed on save.'),
+        ),
+        migrations.AddIndex(
+            model_name='questionanswer',
+            index=models.Index(fields=['questionnaire_response', 'has_valid_response'], name='sims_answer_response_valid_idx'),
+        ),
+        migrations.RunPython(backfill_has_valid_response, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.9 on 2022-01-27 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sims', '0003_questionanswer_has_valid_response'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['question_group', 'precedence'], name='sims_question_group_prec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questionnaireresponses',
+            index=models.Index(condition=models.Q(('active', True)), fields=['organisation', '-updated', '-created'], name='sims_responses_org_recent_idx'),
+        ),
+    ]
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from numbers import Number
 from typing import Any, Dict, List, Literal, Optional, Sequence, TypedDict, Union, cast
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
 from django.urls import reverse_lazy
 from django.utils import timezone
 
@@ -16,6 +17,8 @@ from .answer_type_validity_checkers import (
     DEFAULT_ANSWER_TYPE_VALIDITY_CHECKERS,
     AnswerTypeValidityChecker,
 )
+from .exceptions import QuestionAnswerMetadataProcessingError, QuestionMetadataProcessingError
+from .metadata_processors import AbstractQuestionAnswerMetadataProcessor
 
 # =============================================================================
 # CONSTANTS
@@ -75,22 +78,62 @@ class QuestionMetadata(TypedDict):
     value_non_editable: Optional[bool]
 
 
+_ANCESTORS_SQL = """
+WITH RECURSIVE ancestors ({pk}, {parent}) AS (
+    SELECT node.{pk}, node.{parent} FROM {table} node WHERE node.{pk} = %s
+    UNION
+    SELECT node.{pk}, node.{parent} FROM {table} node
+    INNER JOIN ancestors ON node.{pk} = ancestors.{parent}
+)
+SELECT {parent} FROM ancestors WHERE {parent} IS NOT NULL
+"""
+
+_DEPTH_SQL = """
+(WITH RECURSIVE ancestors ({pk}, {parent}) AS (
+    SELECT node.{pk}, node.{parent} FROM {table} node WHERE node.{pk} = {table}.{parent}
+    UNION
+    SELECT node.{pk}, node.{parent} FROM {table} node
+    INNER JOIN ancestors ON node.{pk} = ancestors.{parent}
+)
+SELECT COUNT(*) FROM ancestors)
+"""
+
+_DESCENDANTS_SQL = """
+WITH RECURSIVE descendants ({pk}) AS (
+    SELECT node.{pk} FROM {table} node WHERE node.{parent} = %s
+    UNION
+    SELECT node.{pk} FROM {table} node
+    INNER JOIN descendants ON node.{parent} = descendants.{pk}
+)
+SELECT {pk} FROM descendants
+"""
+
+
 # =============================================================================
 # HELPERS
 # =============================================================================
 
 
-@lru_cache(maxsize=None)
-def _get_combined_answer_validity_expression() -> Any:
-    cases = (
-        models.When(
-            question__answer_type=answer_type.value,  # noqa
-            then=answer_type.answer_type_validity_checker.valid_answer_query_expression,  # noqa
-        )
-        for answer_type in Question.AnswerTypes
+def _get_hierarchy_sql(model: Any, sql_template: str) -> str:
+    """Render the given recursive hierarchy query template for the given `ChildrenMixin` model.
+
+    Using `UNION` instead of `UNION ALL` in the templates guarantees that the
+    recursive queries terminate even in the presence of cycles.
+    """
+
+    quote_name = connection.ops.quote_name
+    return sql_template.format(
+        parent=quote_name(model._meta.get_field("parent").column),
+        pk=quote_name(model._meta.pk.column),
+        table=quote_name(model._meta.db_table),
     )
 
-    return models.Case(*cases, output_field=models.BooleanField())
+
+class _SubqueryCount(models.Subquery):
+    """Return the number of rows returned by a subquery."""
+
+    template = "(SELECT COUNT(*) FROM (%(subquery)s) _count)"
+    output_field = models.IntegerField()
 
 
 # =============================================================================
@@ -99,11 +142,41 @@ def _get_combined_answer_validity_expression() -> Any:
 
 
 class ChildrenMixinQuerySet(models.QuerySet):
+    def ancestors_of(self, element: "ChildrenMixin") -> models.QuerySet:
+        """Return a queryset of the parent, grandparent, etc, elements of the given element.
+
+        The ancestors are resolved in a single query using a recursive CTE.
+        """
+
+        ancestors_sql = _get_hierarchy_sql(self.model, _ANCESTORS_SQL)
+        return self.filter(pk__in=RawSQL(ancestors_sql, (element.pk,)))
+
+    def annotate_with_depth(self) -> models.QuerySet:
+        """Annotate each element with it's depth in the hierarchy as `stats_depth`.
+
+        Top level elements, that is elements without a parent, have a depth
+        of 0, their children a depth of 1 and so on.
+        """
+
+        depth_sql = _get_hierarchy_sql(self.model, _DEPTH_SQL)
+        return self.annotate(
+            stats_depth=RawSQL(depth_sql, (), output_field=models.PositiveIntegerField())
+        )
+
     def by_precedence(self) -> models.QuerySet:
         """Return a queryset of elements ordered by precedence."""
 
         return self.order_by("precedence")
 
+    def descendants_of(self, element: "ChildrenMixin") -> models.QuerySet:
+        """Return a queryset of the children, grandchildren, etc, elements of the given element.
+
+        The descendants are resolved in a single query using a recursive CTE.
+        """
+
+        descendants_sql = _get_hierarchy_sql(self.model, _DESCENDANTS_SQL)
+        return self.filter(pk__in=RawSQL(descendants_sql, (element.pk,)))
+
     def parents_only(self) -> models.QuerySet:
         """Return a queryset consisting of only parent elements."""
 
@@ -163,17 +236,7 @@ class QuestionQuerySet(AbstractBaseQuerySet["Question"], ChildrenMixinQuerySet):
     def for_question(self, question: "Question") -> "QuestionQuerySet":
         """Return all the sub-questions and nested sub-questions belonging to a given question."""
 
-        # TODO: Optimize this implementation
-        def visit(questions: "QuestionQuerySet") -> "QuestionQuerySet":
-            for _question in questions:
-                if _question.is_parent:
-                    questions = questions.union(
-                        visit(_question.sub_questions.all())  # type: ignore
-                    )
-
-            return questions
-
-        return visit(self.filter(parent=question))
+        return cast(QuestionQuerySet, self.descendants_of(question))
 
     def for_question_group(self, question_group: "QuestionGroup") -> "QuestionQuerySet":
         """Return all the questions belonging to the given question groups.
@@ -195,16 +258,45 @@ class QuestionAnswerQuerySet(AbstractBaseQuerySet["QuestionAnswer"]):  # noqa
     def invalid(self) -> "QuestionAnswerQuerySet":
         """Return a queryset composed of answers without valid responses."""
 
-        return self.annotate(valid=_get_combined_answer_validity_expression()).filter(  # noqa
-            valid=False
-        )  # type: ignore
+        return self.filter(has_valid_response=False)
+
+    def refresh_validity(self, batch_size: int = 1000) -> int:
+        """Recompute and store the validity of each answer in this queryset.
+
+        The stored validity of an answer goes stale when the answer is written
+        without calling `save()`, e.g. using `update()`, or when the answer
+        type of its question changes.
+
+        :param batch_size: The number of answers to read and write per query.
+
+        :return: The number of answers whose stored validity was changed.
+        """
+
+        stale: List["QuestionAnswer"] = []
+        refreshed = 0
+        answers = self.select_related("question").only(
+            "has_valid_response",
+            "is_not_applicable",
+            "question",
+            "question__answer_type",
+            "response",
+        )
+        for answer in answers.iterator(chunk_size=batch_size):
+            is_valid = answer.get_response_validity()
+            if answer.has_valid_response != is_valid:
+                answer.has_valid_response = is_valid
+                stale.append(answer)
+            if len(stale) >= batch_size:
+                self.model.objects.bulk_update(stale, ["has_valid_response"])
+                refreshed += len(stale)
+                stale = []
+        self.model.objects.bulk_update(stale, ["has_valid_response"])
+        return refreshed + len(stale)
 
     def valid(self) -> "QuestionAnswerQuerySet":
         """Return a queryset composed of only answers with valid responses."""
 
-        return self.annotate(valid=_get_combined_answer_validity_expression()).filter(  # noqa
-            valid=True
-        )  # type: ignore
+        return self.filter(has_valid_response=True)
 
 
 class QuestionGroupQuerySet(AbstractBaseQuerySet["QuestionGroup"], ChildrenMixinQuerySet):  # noqa
@@ -278,6 +370,63 @@ class QuestionGroupQuerySet(AbstractBaseQuerySet["QuestionGroup"], ChildrenMixin
 class QuestionnaireResponsesQuerySet(AbstractBaseQuerySet["QuestionnaireResponses"]):  # noqa
     """QuerySet for the QuestionnaireResponses model."""
 
+    def annotate_with_stats(self) -> "QuestionnaireResponsesQuerySet":
+        """Annotate each questionnaire responses with use-full completion stats.
+
+        The stats added are:
+            * stats_answered_questions_count
+            * stats_is_complete
+            * stats_progress
+            * stats_questions_count
+
+        The facility and questionnaire of each questionnaire responses are
+        also fetched as part of the same query. This method exists as an
+        optimization when listing questionnaire responses to avoid making
+        several queries for each of the listed questionnaire responses.
+        """
+
+        questions_count = _SubqueryCount(
+            Question.objects.filter(question_group__questionnaire=models.OuterRef("questionnaire"))
+            .order_by()
+            .values("pk")
+        )
+        answered_questions_count = _SubqueryCount(
+            QuestionAnswer.objects.filter(
+                question__question_group__questionnaire=models.OuterRef("questionnaire"),
+                questionnaire_response=models.OuterRef("pk"),
+            )
+            .valid()
+            .order_by()
+            .values("pk")
+        )
+
+        return (
+            self.select_related("facility", "questionnaire")  # type: ignore
+            .annotate(
+                stats_answered_questions_count=answered_questions_count,
+                stats_questions_count=questions_count,
+            )
+            .annotate(
+                stats_is_complete=models.Case(
+                    models.When(
+                        finish_date__isnull=False,
+                        stats_answered_questions_count=models.F("stats_questions_count"),
+                        then=models.Value(True),
+                    ),
+                    default=models.Value(False),
+                    output_field=models.BooleanField(),
+                ),
+                stats_progress=models.Case(
+                    models.When(stats_questions_count=0, then=models.Value(0.0)),
+                    default=(
+                        Cast("stats_answered_questions_count", models.FloatField())
+                        / Cast("stats_questions_count", models.FloatField())
+                    ),
+                    output_field=models.FloatField(),
+                ),
+            )
+        )
+
     def draft(self) -> "QuestionnaireResponsesQuerySet":
         """Return a queryset containing responses that have *not* being fully filled."""
 
@@ -341,6 +490,16 @@ class QuestionManager(AbstractBaseManager):
 
         return self.get_queryset().annotate_with_stats(responses)
 
+    def ancestors_of(self, element: "Question") -> "QuestionQuerySet":
+        """Return a queryset of the ancestors of the given question."""
+
+        return self.get_queryset().ancestors_of(element)
+
+    def annotate_with_depth(self) -> "QuestionQuerySet":
+        """Annotate each question with it's depth in the hierarchy as `stats_depth`."""
+
+        return self.get_queryset().annotate_with_depth()
+
     def answerable(self) -> "QuestionQuerySet":
         """Return a queryset containing questions that accept none "none" answers."""
 
@@ -356,6 +515,11 @@ class QuestionManager(AbstractBaseManager):
 
         return self.get_queryset().by_precedence()
 
+    def descendants_of(self, element: "Question") -> "QuestionQuerySet":
+        """Return a queryset of the descendants of the given question."""
+
+        return self.get_queryset().descendants_of(element)
+
     def for_question(self, question: "Question") -> "QuestionQuerySet":
         """Return all the sub-questions and nested sub-questions belonging to a given question."""
 
@@ -389,6 +553,11 @@ class QuestionAnswerManager(AbstractBaseManager):
 
         return self.get_queryset().invalid()
 
+    def refresh_validity(self, batch_size: int = 1000) -> int:
+        """Recompute and store the validity of each answer."""
+
+        return self.get_queryset().refresh_validity(batch_size)
+
     def valid(self) -> QuestionAnswerQuerySet:
         """Return a queryset composed of only answers with valid responses."""
 
@@ -414,6 +583,16 @@ class QuestionGroupManager(AbstractBaseManager):
 
         return self.get_queryset().annotate_with_stats(responses)
 
+    def ancestors_of(self, element: "QuestionGroup") -> "QuestionGroupQuerySet":
+        """Return a queryset of the ancestors of the given question group."""
+
+        return self.get_queryset().ancestors_of(element)
+
+    def annotate_with_depth(self) -> "QuestionGroupQuerySet":
+        """Annotate each question group with it's depth in the hierarchy as `stats_depth`."""
+
+        return self.get_queryset().annotate_with_depth()
+
     def answered_for_responses(
         self, responses: "QuestionnaireResponses"
     ) -> "QuestionGroupQuerySet":
@@ -431,6 +610,11 @@ class QuestionGroupManager(AbstractBaseManager):
 
         return self.get_queryset().by_precedence()
 
+    def descendants_of(self, element: "QuestionGroup") -> "QuestionGroupQuerySet":
+        """Return a queryset of the descendants of the given question group."""
+
+        return self.get_queryset().descendants_of(element)
+
     def for_questionnaire(self, questionnaire: "Questionnaire") -> QuestionGroupQuerySet:
         """Return a queryset containing all the question groups in the given questionnaire."""
 
@@ -443,6 +627,23 @@ class QuestionGroupManager(AbstractBaseManager):
 class QuestionnaireResponsesManager(AbstractBaseManager):
     """Manager for the QuestionnaireResponses model."""
 
+    def annotate_with_stats(self) -> QuestionnaireResponsesQuerySet:
+        """Annotate each questionnaire responses with use-full completion stats.
+
+        The stats added are:
+            * stats_answered_questions_count
+            * stats_is_complete
+            * stats_progress
+            * stats_questions_count
+
+        The facility and questionnaire of each questionnaire responses are
+        also fetched as part of the same query. This method exists as an
+        optimization when listing questionnaire responses to avoid making
+        several queries for each of the listed questionnaire responses.
+        """
+
+        return self.get_queryset().annotate_with_stats()
+
     def draft(self) -> QuestionnaireResponsesQuerySet:
         """Return a queryset containing responses that have not being fully filled."""
 
@@ -505,6 +706,14 @@ class ChildrenMixin(models.Model):
         ),
     )
 
+    model_validators = ["check_parent_is_not_a_descendant"]
+
+    @property
+    def ancestors(self) -> models.QuerySet["ChildrenMixin"]:  # noqa
+        """Return all the parent, grandparent, etc, elements of this instance."""
+
+        return self.__class__.objects.ancestors_of(self)  # type: ignore
+
     @property
     def children(self) -> models.QuerySet["ChildrenMixin"]:  # noqa
         """Return all the child elements for whose this instance is the parent."""
@@ -513,6 +722,18 @@ class ChildrenMixin(models.Model):
         related_query: models.QuerySet[ChildrenMixin] = getattr(self, related_field_name)
         return related_query.all()
 
+    @property
+    def depth(self) -> int:
+        """Return the depth of this instance in it's hierarchy, top level elements are at 0."""
+
+        return self.ancestors.count()
+
+    @property
+    def descendants(self) -> models.QuerySet["ChildrenMixin"]:  # noqa
+        """Return all the children, grandchildren, etc, elements of this instance."""
+
+        return self.__class__.objects.descendants_of(self)  # type: ignore
+
     @property
     def is_parent(self) -> bool:
         """Return true if this instance contains child instances."""
@@ -521,6 +742,18 @@ class ChildrenMixin(models.Model):
         related_query: models.QuerySet = getattr(self, related_field_name)
         return related_query.exists()
 
+    def check_parent_is_not_a_descendant(self) -> None:
+        """Ensure that this instance is not moved under itself or any of it's descendants."""
+
+        parent_id = self.parent_id  # type: ignore
+        if parent_id is None or self._state.adding:
+            return
+        if parent_id == self.pk or self.descendants.filter(pk=parent_id).exists():
+            raise ValidationError(
+                {"parent": "An element cannot be a child of itself or of its descendants."},
+                code="invalid",
+            )
+
     class Meta:
         abstract = True
         constraints = [
@@ -598,6 +831,9 @@ class Question(AbstractBase, ChildrenMixin, MetadataProcessor):
 
     objects = QuestionManager()
 
+    # Protected properties
+    _loaded_answer_type: Optional[str] = None  # The answer type as loaded from the database
+
     @property
     def is_answerable(self) -> bool:
         """Return true if this question accepts non "none" answers."""
@@ -624,27 +860,56 @@ class Question(AbstractBase, ChildrenMixin, MetadataProcessor):
         """
 
         if self.is_parent:
-            sub_questions: QuestionQuerySet = Question.objects.for_question(self)
-            return not sub_questions.difference(
-                Question.objects.answered_for_responses(responses)
-            ).exists()
+            return (
+                not Question.objects.for_question(self)
+                .exclude(pk__in=responses.answers.valid().values("question"))  # type: ignore
+                .exists()
+            )
 
         return responses.answers.filter(question=self).exists()  # noqa
 
     def run_metadata_entry_processor(self, processor: MetadataEntryProcessor["Question"]) -> None:
-        from .exceptions import QuestionMetadataProcessingError
+        self.run_metadata_entry_processor_many(processor, [self])
+
+    @classmethod
+    def run_metadata_entry_processor_many(
+        cls, processor: MetadataEntryProcessor["Question"], instances: Sequence["Question"]
+    ) -> None:
+        """Run the given metadata entry processor on the given questions at once."""
 
         try:
-            metadata_entry_value: Any = self.metadata[processor.metadata_entry_name]
-            processor.process(metadata_entry_value, self)
+            processor.process_many(
+                [
+                    (question.metadata[processor.metadata_entry_name], question)
+                    for question in instances
+                ]
+            )
         except QuestionMetadataProcessingError as exp:
             raise ValidationError({"metadata": str(exp)}, code="invalid") from exp
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Extend the base implementation to also remember the loaded answer type."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_answer_type = instance.__dict__.get("answer_type")
+        return instance
+
     def save(self, *args, **kwargs):
-        """Extend the base implementation to also run metadata processors before save."""
+        """Extend the base implementation to also run metadata processors before save.
+
+        If the answer type of this question changed since it was loaded, the
+        stored validity of its answers is also refreshed after save.
+        """
 
+        answer_type_changed = (
+            not self._state.adding and self._loaded_answer_type != self.answer_type
+        )
         self.run()  # Run metadata processors before save
         super().save(*args, **kwargs)
+        self._loaded_answer_type = self.answer_type
+        if answer_type_changed:
+            self.answers.all().refresh_validity()  # type: ignore
 
     def __str__(self) -> str:
         return self.query
@@ -658,6 +923,11 @@ class Question(AbstractBase, ChildrenMixin, MetadataProcessor):
                 condition=models.Q(parent__isnull=True),
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["question_group", "precedence"], name="sims_question_group_prec_idx"
+            )
+        ]
 
 
 class QuestionGroup(AbstractBase, ChildrenMixin):
@@ -793,6 +1063,14 @@ class QuestionAnswer(AbstractBase, MetadataProcessor):
         help_text="Indicates that answer is not applicable for the attached question.",
     )
     response = models.JSONField(default=dict)
+    has_valid_response = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text=(
+            "Indicates that the response is valid for the answer type of the "
+            "attached question. This is computed on save."
+        ),
+    )
     answered_on = models.DateTimeField(auto_now=True, editable=False)
     comments = models.TextField(null=True, blank=True)
 
@@ -812,8 +1090,24 @@ class QuestionAnswer(AbstractBase, MetadataProcessor):
         answer_type: Question.AnswerTypes = next(
             filter(lambda at: at.value == self.question.answer_type, Question.AnswerTypes)
         )
-        return answer_type.answer_type_validity_checker.is_valid_answer_value(
-            self.response.get("content"), self.is_not_applicable
+        return bool(
+            answer_type.answer_type_validity_checker.is_valid_answer_value(
+                self.response.get("content"), self.is_not_applicable
+            )
+        )
+
+    def get_response_validity(self) -> bool:
+        """Return true if the response of this answer counts as an answer once saved.
+
+        Unlike `is_valid`, which checks a response before it is saved, blank
+        responses are only valid when the answer is marked as non applicable.
+        This agrees with the `valid_answer_query_expression` of the question's
+        answer type and is what `has_valid_response` stores.
+        """
+
+        answer_type = Question.AnswerTypes(self.question.answer_type)
+        return answer_type.answer_type_validity_checker.is_valid_answer_response(
+            self.response, self.is_not_applicable
         )
 
     def ensure_answer_response_is_valid(self) -> None:
@@ -838,21 +1132,38 @@ class QuestionAnswer(AbstractBase, MetadataProcessor):
     ) -> None:
         """Run the given metadata entry processor."""
 
-        from .exceptions import QuestionAnswerMetadataProcessingError
-        from .metadata_processors import AbstractQuestionAnswerMetadataProcessor as Qmp
+        self.run_metadata_entry_processor_many(processor, [self])
+
+    @classmethod
+    def run_metadata_entry_processor_many(
+        cls,
+        processor: MetadataEntryProcessor["QuestionAnswer"],
+        instances: Sequence["QuestionAnswer"],
+    ) -> None:
+        """Run the given metadata entry processor on the given answers at once."""
 
         # Skip QuestionAnswer MetadataProcessor not designed to be run on non-applicable answers
-        if isinstance(processor, Qmp) and (
-            self.is_not_applicable and not processor.run_on_non_applicable_answers
+        if isinstance(processor, AbstractQuestionAnswerMetadataProcessor) and (
+            not processor.run_on_non_applicable_answers
         ):
-            return
+            instances = [answer for answer in instances if not answer.is_not_applicable]
 
         try:
-            metadata_entry_value: Any = self.question.metadata[processor.metadata_entry_name]
-            processor.process(metadata_entry_value, self)
-        except QuestionAnswerMetadataProcessingError as exp:  # pragma: no cover
+            processor.process_many(
+                [
+                    (answer.question.metadata[processor.metadata_entry_name], answer)
+                    for answer in instances
+                ]
+            )
+        except QuestionAnswerMetadataProcessingError as exp:
             raise ValidationError({"question": str(exp.args[0])}, code="invalid") from exp
 
+    def save(self, *args, **kwargs):
+        """Extend the base implementation to also store the validity of the response."""
+
+        self.has_valid_response = self.get_response_validity()
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return "Facility: %s, Question: %s, Response: %s" % (
             self.questionnaire_response.facility.name,
@@ -867,6 +1178,12 @@ class QuestionAnswer(AbstractBase, MetadataProcessor):
                 name="unique_together_question_and_questionnaire_response",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["questionnaire_response", "has_valid_response"],
+                name="sims_answer_response_valid_idx",
+            )
+        ]
 
 
 class QuestionnaireResponses(AbstractBase):
@@ -929,3 +1246,12 @@ class QuestionnaireResponses(AbstractBase):
             self.questionnaire.name,
             str(bool(self.finish_date is not None)),
         )
+
+    class Meta(AbstractBase.Meta):
+        indexes = [
+            models.Index(
+                fields=["organisation", "-updated", "-created"],
+                name="sims_responses_org_recent_idx",
+                condition=models.Q(active=True),
+            )
+        ]
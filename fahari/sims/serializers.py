@@ -5,6 +5,23 @@ from fahari.common.serializers import BaseSerializer, FacilitySerializer
 from .models import QuestionAnswer, QuestionGroup, Questionnaire, QuestionnaireResponses
 
 
+class _AnnotatedReadOnlyField(serializers.ReadOnlyField):
+    """A read-only field that prefers the given annotation, when present, over it's source.
+
+    This allows expensive model properties to be replaced with queryset
+    annotations when serializing many instances at once.
+    """
+
+    def __init__(self, annotation: str, **kwargs):
+        self.annotation = annotation
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if hasattr(instance, self.annotation):
+            return getattr(instance, self.annotation)
+        return super().get_attribute(instance)
+
+
 class QuestionAnswerSerializer(BaseSerializer):
     is_valid = serializers.BooleanField(read_only=True)
 
@@ -29,11 +46,13 @@ class QuestionnaireResponsesSerializer(BaseSerializer):
 
     facility_data = FacilitySerializer(source="facility", read_only=True)
     questionnaire_data = QuestionnaireSerializer(source="questionnaire", read_only=True)
-    is_complete = serializers.BooleanField(read_only=True)
-    progress = serializers.FloatField(read_only=True)
-    questions_count = serializers.ReadOnlyField(source="questions.count", read_only=True)
-    answered_question_count = serializers.ReadOnlyField(
-        source="answered_questions.count", read_only=True
+    is_complete = _AnnotatedReadOnlyField(annotation="stats_is_complete")
+    progress = _AnnotatedReadOnlyField(annotation="stats_progress")
+    questions_count = _AnnotatedReadOnlyField(
+        annotation="stats_questions_count", source="questions.count"
+    )
+    answered_question_count = _AnnotatedReadOnlyField(
+        annotation="stats_answered_questions_count", source="answered_questions.count"
     )
     start_date = serializers.DateTimeField(format="%d %b %Y, %I:%M:%S %p", read_only=True)
     finish_date = serializers.DateTimeField(
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from fahari.common.models import Facility
+
+from .analytics import (
+    ANSWER_DELETIONS_VERSION_CACHE_KEY,
+    ANSWER_DIMENSIONS_VERSION_CACHE_KEY,
+    ANSWERS_VERSION_CACHE_KEY,
+    bump_analytics_version_on_commit,
+)
+from .models import Question, QuestionAnswer, QuestionnaireResponses
+
+
+@receiver(post_save, sender=QuestionAnswer)
+def answer_saved_handler(sender, **kwargs):
+    """Let the answers frames of all processes know that an answer was saved."""
+    bump_analytics_version_on_commit(ANSWERS_VERSION_CACHE_KEY)
+
+
+@receiver(post_delete, sender=QuestionAnswer)
+def answer_deleted_handler(sender, **kwargs):
+    """Let the answers frames of all processes know that an answer was deleted."""
+    bump_analytics_version_on_commit(ANSWER_DELETIONS_VERSION_CACHE_KEY)
+
+
+@receiver(post_save, sender=Facility)
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=QuestionnaireResponses)
+@receiver(post_delete, sender=Facility)
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=QuestionnaireResponses)
+def answer_dimensions_changed_handler(sender, **kwargs):
+    """Let the answers frames of all processes know that the dimensions of answers changed."""
+    bump_analytics_version_on_commit(ANSWER_DIMENSIONS_VERSION_CACHE_KEY)
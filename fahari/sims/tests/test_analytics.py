@@ -0,0 +1,236 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+
+from fahari.common.models import Facility
+from fahari.sims.analytics import (
+    ANSWERS_VERSION_CACHE_KEY,
+    AnswersFrame,
+    aggregates_to_workbook,
+    bump_analytics_version_on_commit,
+    get_analytics_versions,
+    get_answers_frame,
+    get_period,
+    to_analytics_value,
+)
+from fahari.sims.models import Question, QuestionAnswer, QuestionnaireResponses
+
+from .test_models import _CommonTestCase
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_period():
+    assert get_period(timezone.make_aware(datetime(2022, 1, 31))) == "2022-Q1"
+    assert get_period(timezone.make_aware(datetime(2022, 12, 1))) == "2022-Q4"
+
+
+def test_to_analytics_value():
+    assert to_analytics_value("yes_no", True) is True
+    assert to_analytics_value("int", "3") == 3.0
+    assert to_analytics_value("real", 2.5) == 2.5
+    assert to_analytics_value("fraction", [1, 4]) == (1.0, 4.0)
+    assert to_analytics_value("select_one", "A") == "A"
+    assert to_analytics_value("select_multiple", ["A", "B"]) == ("A", "B")
+    assert to_analytics_value("text", "Some text") is None
+    assert to_analytics_value("int", None) is None
+    assert to_analytics_value("int", "not a number") is None
+    assert to_analytics_value("fraction", [1]) is None
+
+
+def test_aggregates_to_workbook():
+    workbook = aggregates_to_workbook(
+        [
+            {"county": "Kajiado", "count": 2, "options": {"A": 2}},
+            {"county": "Nairobi", "count": 1, "options": {"B": 1}},
+        ]
+    )
+
+    rows = list(workbook.active.iter_rows(values_only=True))
+    assert rows == [
+        ("county", "count", "option: A", "option: B"),
+        ("Kajiado", 2, 2, None),
+        ("Nairobi", 1, None, 1),
+    ]
+
+
+class AnswersFrameTest(_CommonTestCase):
+    """Tests for the `AnswersFrame` class."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.facility2 = baker.make(
+            Facility, county="Nairobi", organisation=self.organisation, sub_county="Westlands"
+        )
+        self.responses2 = baker.make(
+            QuestionnaireResponses,
+            facility=self.facility2,
+            organisation=self.organisation,
+            questionnaire=self.questionnaire,
+        )
+        self.answers = [
+            self.make_answer(self.question1, self.responses, True),
+            self.make_answer(self.question1, self.responses2, False),
+            self.make_answer(self.question3, self.responses, 4),
+            self.make_answer(self.question3, self.responses2, 8),
+        ]
+        self.frame = AnswersFrame()
+        self.frame.refresh()
+
+    def make_answer(self, question, responses, content, **kwargs) -> QuestionAnswer:
+        return baker.make(
+            QuestionAnswer,
+            organisation=self.organisation,
+            question=question,
+            questionnaire_response=responses,
+            response={"content": content},
+            **kwargs,
+        )
+
+    def test_aggregate(self) -> None:
+        """Test that answers are aggregated according to their question's answer type."""
+
+        assert len(self.frame) == 4
+        assert self.frame.aggregate(self.question1.question_code) == [
+            {
+                "question_code": self.question1.question_code,
+                "count": 2,
+                "not_applicable": 0,
+                "yes": 1,
+                "no": 1,
+                "yes_ratio": 0.5,
+            }
+        ]
+        by_county = self.frame.aggregate(self.question3.question_code, ["county"])
+        assert [(a["county"], a["count"], a["sum"], a["mean"]) for a in by_county] == [
+            ("Kajiado", 1, 4.0, 4.0),
+            ("Nairobi", 1, 8.0, 8.0),
+        ]
+        assert self.frame.aggregate(self.question3.question_code, county="Nairobi")[0]["max"] == 8
+        only_responses = self.frame.aggregate(
+            self.question3.question_code, responses=frozenset([self.responses.pk])
+        )
+        assert only_responses[0]["count"] == 1
+        assert self.frame.aggregate("unknown") == []
+        with pytest.raises(ValueError, match="Unknown dimensions: sub_county."):
+            self.frame.aggregate(self.question3.question_code, ["sub_county"])
+
+    def test_aggregate_answer_types(self) -> None:
+        """Test the aggregates of the different answer types."""
+
+        fraction = baker.make(
+            Question,
+            answer_type=Question.AnswerTypes.FRACTION.value,
+            organisation=self.organisation,
+            precedence=4,
+            question_group=self.question_group1,
+        )
+        select_multiple = baker.make(
+            Question,
+            answer_type=Question.AnswerTypes.SELECT_MULTIPLE.value,
+            organisation=self.organisation,
+            precedence=5,
+            question_group=self.question_group1,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_answer(fraction, self.responses, [1, 4])
+            self.make_answer(fraction, self.responses2, [2, 4])
+            self.make_answer(select_multiple, self.responses, ["A", "B"])
+            self.make_answer(select_multiple, self.responses2, None, is_not_applicable=True)
+            self.make_answer(self.question4, self.responses, "Some text")
+        self.frame.refresh()
+
+        fractions = self.frame.aggregate(fraction.question_code)[0]
+        assert (fractions["numerator"], fractions["denominator"]) == (3.0, 8.0)
+        assert fractions["ratio"] == 0.375
+        options = self.frame.aggregate(select_multiple.question_code)[0]
+        assert options["options"] == {"A": 1, "B": 1}
+        assert options["not_applicable"] == 1
+        assert self.frame.aggregate(self.question4.question_code)[0]["count"] == 1
+
+    def test_refresh(self) -> None:
+        """Test that the frame is refreshed incrementally."""
+
+        version = self.frame.version
+        aggregates = self.frame.aggregate(self.question3.question_code)
+        assert self.frame.aggregate(self.question3.question_code) is aggregates
+
+        # Only the analytics versions are read while they are unchanged
+        with self.assertNumQueries(0):
+            self.frame.refresh()
+        assert self.frame.version == version
+
+        # Answers that are fetched again but haven't changed are ignored
+        with self.captureOnCommitCallbacks(execute=True):
+            self.answers[0].save()
+        self.frame.refresh()
+        assert self.frame.version == version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.answers[2].response = {"content": 10}
+            self.answers[2].save()
+        self.frame.refresh()
+        assert self.frame.version > version
+        assert self.frame.aggregate(self.question3.question_code)[0]["sum"] == 18
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.answers[3].delete()
+        self.frame.refresh()
+        assert len(self.frame) == 3
+        assert self.frame.aggregate(self.question3.question_code)[0]["sum"] == 10
+
+    def test_refresh_late_commits(self) -> None:
+        """Test that answers committed after a refresh that they predate are merged."""
+
+        answer = self.make_answer(self.question3, self.responses2, 16)
+        # The answer was saved, but not committed, before the last refresh
+        QuestionAnswer.objects.filter(pk=answer.pk).update(
+            answered_on=self.frame.watermark - timedelta(minutes=30)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_analytics_version_on_commit(ANSWERS_VERSION_CACHE_KEY)
+        self.frame.refresh()
+
+        assert len(self.frame) == 5
+        assert self.frame.aggregate(self.question3.question_code)[0]["sum"] == 28
+
+    def test_refresh_dimension_changes(self) -> None:
+        """Test that changes to the dimensions of answers are picked up."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.facility2.county = "Mombasa"
+            self.facility2.save()
+        self.frame.refresh()
+
+        by_county = self.frame.aggregate(self.question3.question_code, ["county"])
+        assert [(a["county"], a["sum"]) for a in by_county] == [
+            ("Kajiado", 4.0),
+            ("Mombasa", 8.0),
+        ]
+
+        # Answers to questions that the frame doesn't know of yet
+        question = baker.make(
+            Question,
+            answer_type=Question.AnswerTypes.INTEGER.value,
+            organisation=self.organisation,
+            precedence=4,
+            question_group=self.question_group1,
+        )
+        versions = get_analytics_versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_answer(question, self.responses, 2)
+        assert get_analytics_versions()[1] == versions[1]
+        self.frame.refresh()
+        assert self.frame.aggregate(question.question_code)[0]["sum"] == 2
+
+    def test_get_answers_frame(self) -> None:
+        """Test that the shared frame is refreshed on access."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.answers[0].save()
+        frame = get_answers_frame()
+        assert frame is get_answers_frame()
+        responses = frozenset([self.responses.pk])
+        assert frame.aggregate(self.question1.question_code, responses=responses)[0]["yes"] == 1
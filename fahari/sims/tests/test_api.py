@@ -1,10 +1,13 @@
 import uuid
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 from model_bakery import baker
 
-from fahari.common.models import Facility
+from fahari.common.constants import WHITELIST_COUNTIES
+from fahari.common.models import Facility, Organisation
 from fahari.common.tests.test_api import LoggedInMixin
 from fahari.sims.models import (
     ChildrenMixin,
@@ -187,6 +190,78 @@ class QuestionnaireResponsesViewSetTest(LoggedInMixin):
         assert response.status_code == 200, response.json()
         assert response.data["count"] >= 1, response.json()  # noqa
 
+    def test_list_makes_a_constant_number_of_queries(self) -> None:
+        url = reverse("api:questionnaireresponses-list")
+        with CaptureQueriesContext(connection) as one_responses_queries:
+            response = self.client.get(url)
+        assert response.status_code == 200, response.json()
+
+        baker.make(
+            QuestionnaireResponses,
+            5,
+            facility=self.facility,
+            organisation=self.global_organisation,
+            questionnaire=self.questionnaire,
+        )
+        with CaptureQueriesContext(connection) as many_responses_queries:
+            response = self.client.get(url)
+        assert response.status_code == 200, response.json()
+        assert len(many_responses_queries) == len(one_responses_queries)
+
+        results = {result["id"]: result for result in response.data["results"]}
+        listed = results[str(self.responses.pk)]
+        assert listed["questions_count"] == 4
+        assert listed["answered_question_count"] == 0
+        assert listed["progress"] == 0.0
+        assert not listed["is_complete"]
+
+    def test_list_counts_leave_out_the_stats(self) -> None:
+        url = reverse("api:questionnaireresponses-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            assert response.status_code == 200, response.json()
+            response = self.client.get(url, data={"exact_count": "true"})
+            assert response.status_code == 200, response.json()
+
+        counts = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(("EXPLAIN", "SELECT COUNT(*)"))
+        ]
+        assert any(sql.startswith("EXPLAIN") for sql in counts)
+        assert any(sql.startswith("SELECT COUNT(*)") for sql in counts)
+        for sql in counts:
+            assert "sims_questionanswer" not in sql
+
+    def test_list_datatables_counts(self) -> None:
+        other_organisation = baker.make(Organisation)
+        baker.make(
+            QuestionnaireResponses,
+            3,
+            facility=baker.make(Facility, county="Kajiado", organisation=other_organisation),
+            organisation=other_organisation,
+            questionnaire=self.questionnaire,
+        )
+        baker.make(
+            QuestionnaireResponses,
+            facility=baker.make(Facility, county="Mombasa", organisation=self.global_organisation),
+            organisation=self.global_organisation,
+            questionnaire=self.questionnaire,
+        )
+        visible = QuestionnaireResponses.objects.filter(
+            facility__county__in=WHITELIST_COUNTIES, organisation=self.global_organisation
+        )
+
+        response = self.client.get(
+            reverse("api:questionnaireresponses-list"),
+            data={"exact_count": "true", "format": "datatables", "length": 10, "start": 0},
+        )
+
+        assert response.status_code == 200, response.json()
+        # The total only counts the responses that the user is allowed to view
+        assert response.data["recordsTotal"] == visible.count()
+        assert response.data["recordsFiltered"] == visible.count()
+
     def test_patch(self) -> None:
         data = {"active": False}
         response = self.client.patch(
@@ -296,3 +371,47 @@ class QuestionnaireResponsesViewSetTest(LoggedInMixin):
         assert response.status_code == 302
         assert self.responses.is_complete
         assert self.responses.finish_date is not None
+
+    def test_answers_analytics(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            baker.make(
+                QuestionAnswer,
+                organisation=self.global_organisation,
+                question=self.question1,
+                questionnaire_response=self.responses,
+                response={"content": True},
+            )
+        url = reverse("api:questionnaireresponses-answers-analytics")
+        response = self.client.get(url, data={"question_code": "1234", "group_by": "county"})
+
+        assert response.status_code == 200, response.json()
+        assert response.json() == [
+            {
+                "county": "Kajiado",
+                "question_code": "1234",
+                "count": 1,
+                "not_applicable": 0,
+                "yes": 1,
+                "no": 0,
+                "yes_ratio": 1.0,
+            }
+        ]
+
+        response = self.client.get(url, data={"question_code": "1234", "county": "Nairobi"})
+        assert response.status_code == 200
+        assert response.json() == []
+
+        response = self.client.get(url, data={"question_code": "1234", "format": "xlsx"})
+        assert response.status_code == 200
+        assert response["content-disposition"] == "attachment; filename=1234_analytics.xlsx"
+
+    def test_answers_analytics_with_invalid_query_params(self) -> None:
+        url = reverse("api:questionnaireresponses-answers-analytics")
+
+        response = self.client.get(url)
+        assert response.status_code == 400
+        assert "question_code" in response.json()
+
+        response = self.client.get(url, data={"question_code": "1234", "group_by": "ward"})
+        assert response.status_code == 400
+        assert response.json()["group_by"] == "Unknown dimensions: ward."
@@ -0,0 +1,264 @@
+import copy
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from model_bakery import baker
+
+from fahari.common.models import Facility, Organisation
+from fahari.sims.analytics import get_analytics_versions
+from fahari.sims.models import (
+    Question,
+    QuestionAnswer,
+    QuestionGroup,
+    Questionnaire,
+    QuestionnaireResponses,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def make_question_data(code, precedence, **overrides):
+    data = {
+        "answer_type": "yes_no",
+        "children": [],
+        "metadata": {"constraints": {}},
+        "precedence": precedence,
+        "precedence_display_type": None,
+        "query": "Question %s?" % code,
+        "question_code": code,
+    }
+    data.update(overrides)
+    return data
+
+
+QUESTIONNAIRE_DATA = {
+    "name": "Test Questionnaire",
+    "questionnaire_type": "mentorship",
+    "question_groups": [
+        {
+            "title": "Group 1",
+            "precedence": 1,
+            "precedence_display_type": "bullet",
+            "children": [
+                {
+                    "title": "Group 1.1",
+                    "precedence": 1,
+                    "precedence_display_type": "numbered_td",
+                    "children": [],
+                    "questions": [make_question_data("q3", 1, answer_type="int")],
+                }
+            ],
+            "questions": [
+                make_question_data("q1", 1),
+                make_question_data(
+                    "q2",
+                    2,
+                    answer_type="none",
+                    children=[
+                        make_question_data("q2a", 1, metadata={"depends_on": "q3"}),
+                        make_question_data("q2b", 2),
+                    ],
+                ),
+            ],
+        },
+        {
+            "title": "Group 2",
+            "precedence": 2,
+            "precedence_display_type": "bullet",
+            "children": [],
+            "questions": [make_question_data("q4", 1, answer_type="text")],
+        },
+    ],
+}
+
+
+def make_answer(organisation, question_code, content):
+    responses = baker.make(
+        QuestionnaireResponses,
+        facility=baker.make(Facility, organisation=organisation),
+        organisation=organisation,
+        questionnaire=Questionnaire.objects.get(name="Test Questionnaire"),
+    )
+    return baker.make(
+        QuestionAnswer,
+        organisation=organisation,
+        question=Question.objects.get(question_code=question_code),
+        questionnaire_response=responses,
+        response={"content": content},
+    )
+
+
+def load_questionnaire(tmp_path, data, organisation):
+    source = tmp_path / "questionnaire.json"
+    source.write_text(json.dumps(data))
+    stdout = StringIO()
+    call_command(
+        "load_questionnaire", str(source), organisation=str(organisation.pk), stdout=stdout
+    )
+    return stdout.getvalue()
+
+
+def test_load_questionnaire(tmp_path):
+    organisation = baker.make(Organisation)
+
+    output = load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+
+    assert "9 created, 0 updated, 0 deleted, 0 unchanged" in output
+    questionnaire = Questionnaire.objects.get(name="Test Questionnaire")
+    assert questionnaire.organisation == organisation
+    assert Question.objects.for_questionnaire(questionnaire).count() == 6
+    group1_1 = QuestionGroup.objects.get(title="Group 1.1")
+    assert group1_1.parent.title == "Group 1"
+    q2a = Question.objects.get(question_code="q2a")
+    assert q2a.parent.question_code == "q2"
+    assert q2a.question_group.title == "Group 1"
+    assert q2a.metadata == {"depends_on": "q3"}
+    assert Question.objects.get(question_code="q3").question_group == group1_1
+
+    # Re-loading the same questionnaire is a no-op
+    output = load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+    assert "0 created, 0 updated, 0 deleted, 9 unchanged" in output
+
+
+def test_load_questionnaire_changes(tmp_path):
+    organisation = baker.make(Organisation)
+    load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+    q2a = Question.objects.get(question_code="q2a")
+
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    group1 = data["question_groups"][0]
+    q1, q2 = group1["questions"]
+    # Swap the precedences of q1 and q2, reword q1 and move q2b to group 2
+    q1["precedence"], q2["precedence"] = 2, 1
+    q1["query"] = "Reworded question 1?"
+    q2b = q2["children"].pop()
+    q2b["precedence"] = 2
+    data["question_groups"][1]["questions"].append(q2b)
+    # Replace group 1.1 and its question with a new group
+    group1["children"] = [
+        {
+            "title": "Group 1.2",
+            "precedence": 1,
+            "precedence_display_type": None,
+            "children": [],
+            "questions": [make_question_data("q5", 1)],
+        }
+    ]
+    q2["children"][0]["metadata"] = {"depends_on": "q5"}
+
+    output = load_questionnaire(tmp_path, data, organisation)
+
+    assert "2 created, 4 updated, 2 deleted, 3 unchanged" in output
+    assert Question.objects.get(question_code="q1").query == "Reworded question 1?"
+    assert Question.objects.get(question_code="q1").precedence == 2
+    assert Question.objects.get(question_code="q2").precedence == 1
+    assert Question.objects.get(question_code="q2b").question_group.title == "Group 2"
+    assert Question.objects.get(question_code="q2b").parent is None
+    assert Question.objects.get(question_code="q2a").pk == q2a.pk
+    assert not Question.objects.filter(question_code="q3").exists()
+    assert not QuestionGroup.objects.filter(title="Group 1.1").exists()
+    assert QuestionGroup.objects.get(title="Group 1.2").parent.title == "Group 1"
+    questionnaire = Questionnaire.objects.get(name="Test Questionnaire")
+    assert Question.objects.for_questionnaire(questionnaire).count() == 6
+
+
+def test_load_questionnaire_invalid_data(tmp_path):
+    organisation = baker.make(Organisation)
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    group1 = data["question_groups"][0]
+    group1["questions"].extend(
+        [
+            make_question_data("q1", 3),
+            make_question_data("q6", 3, answer_type="essay"),
+            make_question_data("q7", 5, metadata={"depends_on": "q0"}),
+        ]
+    )
+    data["question_groups"].append(copy.deepcopy(data["question_groups"][1]))
+
+    with pytest.raises(CommandError) as exp:
+        load_questionnaire(tmp_path, data, organisation)
+
+    message = str(exp.value)
+    assert 'Question group "Group 1": The precedences of its children must be unique.' in message
+    assert 'Question "q1": A question with this question code already exists.' in message
+    assert 'Question "q6": answer_type' in message
+    assert 'Question "q7": The question it depends on, "q0", does not exist.' in message
+    assert 'Question group "Group 2": A question group with this title already exists.' in message
+    assert not Questionnaire.objects.exists()
+
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    del data["question_groups"][0]["title"]
+    with pytest.raises(CommandError, match='The entry "title" is missing'):
+        load_questionnaire(tmp_path, data, organisation)
+
+
+def test_load_questionnaire_conflicts(tmp_path):
+    organisation = baker.make(Organisation)
+    load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+    make_answer(organisation, "q4", "An answer")
+
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    data["question_groups"][1]["questions"] = []
+    with pytest.raises(CommandError, match="Answered questions cannot be removed"):
+        load_questionnaire(tmp_path, data, organisation)
+
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    data["name"] = "Another Questionnaire"
+    with pytest.raises(CommandError, match="The question code is used by another questionnaire"):
+        load_questionnaire(tmp_path, data, organisation)
+
+
+def test_load_questionnaire_answer_type_changes(tmp_path, django_capture_on_commit_callbacks):
+    organisation = baker.make(Organisation)
+    load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+    answer = make_answer(organisation, "q4", "An answer")
+    assert answer.has_valid_response
+    versions = get_analytics_versions()
+
+    data = copy.deepcopy(QUESTIONNAIRE_DATA)
+    data["question_groups"][1]["questions"][0]["answer_type"] = "fraction"
+    with django_capture_on_commit_callbacks(execute=True):
+        output = load_questionnaire(tmp_path, data, organisation)
+
+    assert "0 created, 1 updated, 0 deleted, 8 unchanged" in output
+    answer.refresh_from_db()
+    assert not answer.has_valid_response
+    assert get_analytics_versions()[1] == versions[1] + 1
+
+
+def test_backfill_answer_validity(tmp_path):
+    organisation = baker.make(Organisation)
+    load_questionnaire(tmp_path, QUESTIONNAIRE_DATA, organisation)
+    answer = make_answer(organisation, "q4", "An answer")
+    QuestionAnswer.objects.filter(pk=answer.pk).update(response={"content": None})
+
+    stdout = StringIO()
+    call_command("backfill_answer_validity", batch_size=1, stdout=stdout)
+    assert "Refreshed the validity of 1 answers" in stdout.getvalue()
+    answer.refresh_from_db()
+    assert not answer.has_valid_response
+
+    stdout = StringIO()
+    call_command(
+        "backfill_answer_validity",
+        questionnaire=str(answer.questionnaire_response.questionnaire.pk),
+        stdout=stdout,
+    )
+    assert "Refreshed the validity of 0 answers" in stdout.getvalue()
+
+
+def test_load_questionnaire_default_source():
+    call_command("load_questionnaire", stdout=StringIO())
+
+    questionnaire = Questionnaire.objects.get(name="Service Delivery")
+    assert questionnaire.organisation.code == 1
+    assert Question.objects.for_questionnaire(questionnaire).count() == Question.objects.count()
+
+
+def test_load_questionnaire_invalid_input(tmp_path):
+    with pytest.raises(CommandError, match="organisation does not exist"):
+        call_command("load_questionnaire", organisation="not-a-uuid")
+    with pytest.raises(CommandError, match="does not exist"):
+        call_command("load_questionnaire", str(tmp_path / "missing.json"))
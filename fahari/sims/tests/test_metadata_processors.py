@@ -0,0 +1,137 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from fahari.sims.constraints_checkers import (
+    MaxValueConstraintChecker,
+    RequiredByDefaultConstraintChecker,
+)
+from fahari.sims.exceptions import (
+    QuestionAnswerMetadataProcessingError,
+    QuestionMetadataProcessingError,
+)
+from fahari.sims.metadata_processors import (
+    ConstraintCheck,
+    ConstraintsCheckMetadataProcessor,
+    DependentQuestionExistsMetadataProcessor,
+)
+from fahari.sims.models import Question, QuestionAnswer
+
+from .test_models import _CommonTestCase
+
+pytestmark = pytest.mark.django_db
+
+
+def test_constraint_check():
+    check = ConstraintCheck("max_value", 10, MaxValueConstraintChecker())
+
+    assert check(5) is None
+    assert check(11) == "The given number must not exceed 10."
+
+
+class ConstraintsCheckMetadataProcessorTest(_CommonTestCase):
+    """Tests for the `ConstraintsCheckMetadataProcessor` class."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.processor = ConstraintsCheckMetadataProcessor()
+
+    def test_compile(self) -> None:
+        """Test that constraints are compiled into a cached check plan."""
+
+        plan = self.processor.compile({"max_value": 10, "min_value": 1})
+
+        assert [(c.constraint_name, c.constraint_value) for c in plan] == [
+            ("max_value", 10),
+            ("min_value", 1),
+            ("optional", None),
+        ]
+        assert isinstance(plan[-1].checker, RequiredByDefaultConstraintChecker)
+        assert self.processor.compile({"min_value": 1, "max_value": 10}) is plan
+        assert self.processor.compile({"max_value": 20, "min_value": 1}) is not plan
+        assert [c.constraint_name for c in self.processor.compile({"optional": True})] == []
+
+    def test_check(self) -> None:
+        """Test that answer values are checked against the given constraints."""
+
+        constraints = {"max_value": 10, "min_value": 1}
+
+        assert self.processor.check(constraints, 5) == {}
+        assert self.processor.check(constraints, 11) == {
+            "max_value": ["The given number must not exceed 10."]
+        }
+        assert self.processor.check({"optional": True}, None) == {}
+        assert self.processor.check({}, None) == {"optional": ["This value must be provided."]}
+
+    def test_check_many(self) -> None:
+        """Test that many answers can be checked at once."""
+
+        self.question1.metadata = {"constraints": {"max_value": 10}}
+        self.question1.save()
+        question5 = baker.make(
+            Question,
+            answer_type=Question.AnswerTypes.INTEGER.value,
+            metadata={},
+            organisation=self.organisation,
+            parent=None,
+            precedence=4,
+            question_group=self.question_group1,
+        )
+        answers = [
+            QuestionAnswer(question=self.question1, response={"content": 5}),
+            QuestionAnswer(question=self.question1, response={"content": 11}),
+            QuestionAnswer(question=self.question1, response={}),
+            QuestionAnswer(question=self.question1, response={}, is_not_applicable=True),
+            QuestionAnswer(question=question5, response={}),
+        ]
+
+        assert self.processor.check_many(answers) == [
+            {},
+            {"max_value": ["The given number must not exceed 10."]},
+            {"optional": ["This value must be provided."]},
+            {},
+            {},
+        ]
+
+    def test_process(self) -> None:
+        """Test that failed checks raise an error on process."""
+
+        constraints = {"max_value": 10}
+        answer = QuestionAnswer(question=self.question1, response={"content": 11})
+
+        self.processor.process(constraints, QuestionAnswer(response={"content": 5}))
+        with pytest.raises(QuestionAnswerMetadataProcessingError) as exp:
+            self.processor.process(constraints, answer)
+        assert exp.value.args[0] == "The given number must not exceed 10."
+
+
+class DependentQuestionExistsMetadataProcessorTest(_CommonTestCase):
+    """Tests for the `DependentQuestionExistsMetadataProcessor` class."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.processor = DependentQuestionExistsMetadataProcessor()
+
+    def test_process_many(self) -> None:
+        """Test that all the dependent on questions are resolved with a single query."""
+
+        entries = [
+            (self.question1.question_code, self.question3),
+            (self.question2.question_code, self.question4),
+        ]
+        with CaptureQueriesContext(connection) as context:
+            self.processor.process_many(entries)
+        assert len(context.captured_queries) == 1
+
+        with pytest.raises(QuestionMetadataProcessingError) as exp:
+            self.processor.process_many([*entries, ("0000", self.question4)])
+        assert exp.value.question == self.question4
+        assert str(exp.value) == 'Question with question_code "0000" does not exist'
+
+    def test_process(self) -> None:
+        """Test that a missing dependent on question fails processing."""
+
+        self.processor.process(self.question1.question_code, self.question3)
+        with pytest.raises(QuestionMetadataProcessingError):
+            self.processor.process("0000", self.question3)
@@ -1,6 +1,9 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from faker import Faker
 from model_bakery import baker
@@ -141,6 +144,49 @@ class QuestionTest(_CommonTestCase):
         assert self.question3.children.count() == 0
         assert self.question4.children.count() == 0
 
+    def test_hierarchy(self) -> None:
+        """Test Question model's `ancestors`, `descendants` and `depth` properties."""
+
+        question5 = baker.make(
+            Question,
+            answer_type=Question.AnswerTypes.TEXT.value,
+            organisation=self.organisation,
+            parent=self.question3,
+            precedence=1,
+            query="Screening method used.",
+            question_code="1415",
+            question_group=self.question_group1,
+        )
+
+        assert set(question5.ancestors) == {self.question2, self.question3}
+        assert set(self.question2.descendants) == {self.question3, question5}
+        assert not self.question1.ancestors.exists()
+        assert not self.question1.descendants.exists()
+        assert [self.question2.depth, self.question3.depth, question5.depth] == [0, 1, 2]
+
+        depths = dict(Question.objects.annotate_with_depth().values_list("pk", "stats_depth"))
+        assert depths[self.question1.pk] == 0
+        assert depths[question5.pk] == 2
+        assert set(Question.objects.ancestors_of(question5)) == {self.question2, self.question3}
+        assert set(Question.objects.descendants_of(self.question3)) == {question5}
+
+        # Moving a question moves it's whole subtree
+        self.question3.parent = self.question1
+        self.question3.save()
+        assert set(question5.ancestors) == {self.question1, self.question3}
+        assert not self.question2.descendants.exists()
+
+    def test_parent_cannot_be_a_descendant(self) -> None:
+        """Test that questions cannot be moved under themselves or their descendants."""
+
+        self.question2.parent = self.question3
+        with pytest.raises(ValidationError, match="child of itself or of its descendants"):
+            self.question2.save()
+
+        self.question2.parent = self.question2
+        with pytest.raises(ValidationError, match="child of itself or of its descendants"):
+            self.question2.save()
+
     def test_is_answerable_property(self) -> None:
         """Test Question model's `is_answerable` property."""
 
@@ -425,6 +471,19 @@ class QuestionTest(_CommonTestCase):
         assert question5 not in Question.objects.for_questionnaire(self.questionnaire)
         assert question6 not in Question.objects.for_questionnaire(self.questionnaire)
 
+    def test_run_many(self) -> None:
+        """Test Question model's `run_many` class method."""
+
+        self.question3.metadata = {"depends_on": self.question1.question_code}
+        self.question4.metadata = {"depends_on": self.question2.question_code}
+        with CaptureQueriesContext(connection) as context:
+            Question.run_many([self.question1, self.question3, self.question4])
+        assert len(context.captured_queries) == 1
+
+        self.question4.metadata = {"depends_on": "0000"}
+        with pytest.raises(ValidationError):
+            Question.run_many([self.question3, self.question4])
+
     def test_representation(self) -> None:
         """Test Question model's `__str__` method."""
 
@@ -454,6 +513,94 @@ class QuestionAnswerTest(_CommonTestCase):
 
         assert self.question_answer.is_valid
 
+    def test_has_valid_response(self) -> None:
+        """Test that the validity of an answer's response is stored and refreshed."""
+
+        assert self.question_answer.has_valid_response
+        assert QuestionAnswer.objects.valid().count() == 1
+
+        # Changing the answer type of a question refreshes its answers
+        self.question1.answer_type = Question.AnswerTypes.FRACTION.value
+        self.question1.save()
+        self.question_answer.refresh_from_db()
+        assert not self.question_answer.has_valid_response
+        assert QuestionAnswer.objects.invalid().count() == 1
+
+        # Including questions loaded from the database
+        question = Question.objects.get(pk=self.question1.pk)
+        question.answer_type = Question.AnswerTypes.YES_NO.value
+        question.save()
+        self.question_answer.refresh_from_db()
+        assert self.question_answer.has_valid_response
+        QuestionAnswer.objects.filter(pk=self.question_answer.pk).update(has_valid_response=False)
+        question.save()  # The answer type is unchanged, no refresh
+        assert QuestionAnswer.objects.invalid().count() == 1
+
+        # Writes that bypass `save()` leave the stored validity stale
+        QuestionAnswer.objects.filter(pk=self.question_answer.pk).update(
+            response={"content": [1, 2]}
+        )
+        assert QuestionAnswer.objects.valid().count() == 0
+        assert QuestionAnswer.objects.refresh_validity() == 1
+        assert QuestionAnswer.objects.valid().count() == 1
+        assert QuestionAnswer.objects.refresh_validity() == 0
+
+    def test_has_valid_response_for_blank_answers(self) -> None:
+        """Test that blank answers are only stored as valid when marked as non applicable."""
+
+        blank_answer = baker.make(
+            QuestionAnswer,
+            is_not_applicable=False,
+            organisation=self.organisation,
+            question=self.question4,
+            questionnaire_response=self.responses,
+            response={"content": None},
+        )
+        none_answer = baker.make(
+            QuestionAnswer,
+            is_not_applicable=False,
+            organisation=self.organisation,
+            question=self.question2,
+            questionnaire_response=self.responses,
+            response={"content": None},
+        )
+
+        assert blank_answer.is_valid
+        assert not blank_answer.has_valid_response
+        assert none_answer.has_valid_response
+        assert blank_answer not in QuestionAnswer.objects.valid()
+        assert set(QuestionAnswer.objects.valid()) == {self.question_answer, none_answer}
+        assert self.question4 not in self.responses.answered_questions
+
+        blank_answer.is_not_applicable = True
+        blank_answer.save()
+        assert blank_answer.has_valid_response
+        assert self.question4 in self.responses.answered_questions
+
+        # The stored validity agrees with the one used to backfill it
+        for answer in QuestionAnswer.objects.select_related("question"):
+            checker = Question.AnswerTypes(
+                answer.question.answer_type
+            ).answer_type_validity_checker
+            assert answer.has_valid_response == (
+                QuestionAnswer.objects.filter(
+                    checker.valid_answer_query_expression, pk=answer.pk
+                ).exists()
+            )
+
+    def test_run_many(self) -> None:
+        """Test QuestionAnswer model's `run_many` class method."""
+
+        self.question1.metadata = {"constraints": {}}
+        not_applicable_answer = QuestionAnswer(
+            is_not_applicable=True, question=self.question1, response={}
+        )
+        QuestionAnswer.run_many([self.question_answer, not_applicable_answer])
+
+        unanswered = QuestionAnswer(question=self.question1, response={})
+        with pytest.raises(ValidationError, match="This value must be provided."):
+            QuestionAnswer.run_many([self.question_answer, unanswered])
+
     def test_representation(self) -> None:
         """Test QuestionAnswer model's `__str__` method."""
 
@@ -506,6 +653,29 @@ class QuestionGroupTest(_CommonTestCase):
         assert self.question_group3.children.count() == 0
         assert self.question_group4.children.count() == 0
 
+    def test_hierarchy(self) -> None:
+        """Test QuestionGroup model's `ancestors`, `descendants` and `depth` properties."""
+
+        assert set(self.question_group3.ancestors) == {self.question_group2}
+        assert set(self.question_group2.descendants) == {self.question_group3}
+        assert not self.question_group4.ancestors.exists()
+        assert not self.question_group4.descendants.exists()
+        assert self.question_group3.depth == 1
+
+        depths = dict(QuestionGroup.objects.annotate_with_depth().values_list("pk", "stats_depth"))
+        assert depths[self.question_group2.pk] == 0
+        assert depths[self.question_group3.pk] == 1
+        assert set(QuestionGroup.objects.ancestors_of(self.question_group3)) == {
+            self.question_group2
+        }
+        assert set(QuestionGroup.objects.descendants_of(self.question_group2)) == {
+            self.question_group3
+        }
+
+        # Deleting a question group removes it's subtree
+        self.question_group2.delete()
+        assert not QuestionGroup.objects.filter(pk=self.question_group3.pk).exists()
+
     def test_direct_decedents_only_property(self) -> None:
         """Test QuestionGroup model's `direct_decedents_only` property."""
 
@@ -1077,6 +1247,26 @@ class QuestionnaireResponsesTest(_CommonTestCase):
         assert self.question3 not in self.responses.answered_questions
         assert self.question4 not in self.responses.answered_questions
 
+    def test_manager_annotate_with_stats_method(self) -> None:
+        """Test QuestionnaireResponses model manager's `annotate_with_stats` method."""
+
+        responses = QuestionnaireResponses.objects.annotate_with_stats().get(pk=self.responses.pk)
+        responses2 = QuestionnaireResponses.objects.annotate_with_stats().get(
+            pk=self.responses2.pk
+        )
+
+        for instance in (responses, responses2):
+            assert instance.stats_questions_count == instance.questions.count()  # type: ignore
+            assert (
+                instance.stats_answered_questions_count  # type: ignore
+                == instance.answered_questions.count()
+            )
+            assert instance.stats_is_complete == instance.is_complete  # type: ignore
+            assert instance.stats_progress == instance.progress  # type: ignore
+        with self.assertNumQueries(0):
+            assert responses.facility == self.facility
+            assert responses.questionnaire == self.questionnaire
+
     def test_get_absolute_url(self) -> None:
         """Test QuestionnaireResponses model's `get_absolute_url` method."""
 
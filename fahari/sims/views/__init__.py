@@ -1,4 +1,4 @@
-from .drf_views import QuestionnaireResponsesViewSet
+from .drf_views import QuestionnaireResponsesViewSet, async_questionnaire_responses_list_view
 from .vanilla_views import (
     QuestionnaireResponsesCaptureView,
     QuestionnaireResponsesCreateView,
@@ -14,4 +14,5 @@ __all__ = [
     "QuestionnaireResponsesView",
     "QuestionnaireResponsesViewSet",
     "QuestionnaireSelectionView",
+    "async_questionnaire_responses_list_view",
 ]
@@ -4,13 +4,18 @@ from django.core.exceptions import ValidationError
 from django.http.response import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.utils import timezone
-from rest_framework import status
+from rest_framework import permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from fahari.common.views import BaseView
+from fahari.common.pagination import KeysetPagination
+from fahari.common.renderers import ExcelIORenderer
+from fahari.common.views import BaseView, async_read_view
 
+from ..analytics import aggregates_to_workbook, get_answers_frame
 from ..filters import QuestionnaireResponsesFilter
 from ..models import Question, QuestionAnswer, QuestionGroup, QuestionnaireResponses
 from ..serializers import (
@@ -48,9 +53,59 @@ class QuestionnaireResponsesViewSet(BaseView):
     queryset = QuestionnaireResponses.objects.active()
     serializer_class = QuestionnaireResponsesSerializer
     filterset_class = QuestionnaireResponsesFilter
+    pagination_class = KeysetPagination
     ordering_fields = ("facility_name",)
-    search_fields = ("facility_name",)
+    search_fields = ("facility__name",)
     facility_field_lookup = "facility"
+    # The completion stats change with the answers, not the responses
+    conditional_requests = False
+
+    def get_queryset(self):
+        """Annotate the questionnaire responses with their completion stats on reads.
+
+        The stats are not added on writes as they would be stale by the time
+        the changed questionnaire responses are serialized.
+        """
+
+        queryset = super().get_queryset()
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = queryset.annotate_with_stats()
+        return queryset
+
+    @action(detail=False, methods=["GET"], renderer_classes=(JSONRenderer, ExcelIORenderer))
+    def answers_analytics(self, request: Request) -> Response:
+        """Aggregate the answers to a question across the filtered questionnaire responses.
+
+        The question is selected using the `question_code` query parameter,
+        the answers can be grouped using a comma separated list of dimensions
+        in the `group_by` query parameter and further filtered using the
+        `county` and `period` query parameters. Use `format=xlsx` to export
+        the aggregates as a workbook.
+        """
+
+        question_code = request.query_params.get("question_code")
+        if not question_code:
+            raise DRFValidationError({"question_code": "This query parameter is required."})
+        group_by = [d for d in request.query_params.get("group_by", "").split(",") if d]
+        filters = {
+            dimension: request.query_params[dimension]
+            for dimension in ("county", "period")
+            if dimension in request.query_params
+        }
+        responses = frozenset(
+            self.filter_queryset(self.get_queryset()).values_list("pk", flat=True)
+        )
+        try:
+            aggregates = get_answers_frame().aggregate(
+                question_code, group_by, responses, **filters
+            )
+        except ValueError as exp:
+            raise DRFValidationError({"group_by": str(exp)})
+
+        if request.accepted_renderer.format == ExcelIORenderer.format:
+            self.filename = "%s_analytics.xlsx" % question_code
+            return Response(aggregates_to_workbook(aggregates))
+        return Response(aggregates)
 
     @action(detail=True, methods=["POST"])
     def mark_question_group_as_applicable(self, request: Request, pk) -> Response:
@@ -288,3 +343,12 @@ class QuestionnaireResponsesViewSet(BaseView):
         response_data["question_group"]["is_complete"] = question_group.is_complete_for_responses(
             questionnaire_response
         )
+
+
+# =============================================================================
+# ASYNC READ VIEWS
+# =============================================================================
+
+async_questionnaire_responses_list_view = async_read_view(
+    QuestionnaireResponsesViewSet.as_view({"get": "list"})
+)
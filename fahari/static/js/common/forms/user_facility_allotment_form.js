@@ -41,19 +41,22 @@ document.addEventListener("DOMContentLoaded", function load() {
             hideComponent($subCountyFieldDiv);
             hideComponent($wardFieldDiv);
         } else if (this.value === "constituency") {
-            hideComponent($countyFieldDiv);
+            // The selected counties filter the constituencies to choose from
+            showComponent($countyFieldDiv);
             showComponent($constituencyFieldDiv);
             hideComponent($subCountyFieldDiv);
             hideComponent($wardFieldDiv);
         } else if (this.value === "sub_county") {
-            hideComponent($countyFieldDiv);
+            // The selected counties filter the sub counties to choose from
+            showComponent($countyFieldDiv);
             hideComponent($constituencyFieldDiv);
             showComponent($subCountyFieldDiv);
             hideComponent($wardFieldDiv);
         } else if (this.value === "ward") {
-            hideComponent($countyFieldDiv);
+            // The selected sub counties filter the wards to choose from
+            showComponent($countyFieldDiv);
             hideComponent($constituencyFieldDiv);
-            hideComponent($subCountyFieldDiv);
+            showComponent($subCountyFieldDiv);
             showComponent($wardFieldDiv);
         } else {
             hideComponent($countyFieldDiv);
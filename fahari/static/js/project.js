@@ -16,5 +16,29 @@
     // Initialize the bootstrap select plugin
     $("select").selectpicker();
 
+    // Only the selected choices of remote combo boxes are rendered, load the
+    // rest of the choices by the selected parent units whenever they change
+    $("select[data-choices_url]").each(function() {
+        const $select = $(this);
+        const $parent = $("#id_" + $select.data("parent_field"));
+
+        function loadChoices() {
+            const parents = [].concat($parent.val() || []);
+            const selected = [].concat($select.val() || []);
+
+            $.get($select.data("choices_url"), $.param({ parent: parents }, true), function(data) {
+                $select.find("option[value!='']").remove();
+                data.results.forEach(function(choice) {
+                    const isSelected = selected.includes(choice.id);
+                    $select.append(new Option(choice.text, choice.id, isSelected, isSelected));
+                });
+                $select.selectpicker("refresh").trigger("change");
+            });
+        }
+
+        $parent.on("change", loadChoices);
+        loadChoices();
+    });
+
     $(".datepicker").datepicker();
 })(jQuery);
@@ -1,2 +1 @@
-!function(a){function e(){dataLayer.push(arguments)}window.dataLayer=window.dataLayer||[],e("js",new Date),e("config","G-WW2W29ZMTZ"),a(".navbar-collapse a").click(function(){a(".navbar-collapse").collapse("hide")}),a("select").selectpicker(),a(".datepicker").datepicker()}(jQuery);
-//# sourceMappingURL=data:application/json;charset=utf8;base64,eyJ2ZXJzaW9uIjozLCJmaWxlIjoicHJvamVjdC5taW4uanMiLCJzb3VyY2VzIjpbInByb2plY3QuanMiXSwic291cmNlc0NvbnRlbnQiOlsiKGZ1bmN0aW9uKCQpIHtcbiAgICAvKiBHb29nbGUgQW5hbHl0aWNzICovXG4gICAgd2luZG93LmRhdGFMYXllciA9IHdpbmRvdy5kYXRhTGF5ZXIgfHwgW107XG5cbiAgICBmdW5jdGlvbiBndGFnKCkge1xuICAgICAgICBkYXRhTGF5ZXIucHVzaChhcmd1bWVudHMpO1xuICAgIH1cbiAgICBndGFnKFwianNcIiwgbmV3IERhdGUoKSk7XG4gICAgZ3RhZyhcImNvbmZpZ1wiLCBcIkctV1cyVzI5Wk1UWlwiKTtcblxuICAgIC8vIGF1dG8tY29sbGFwc2Ugb3BlbiBtZW51cyBpbiByZXNwb25zaXZlIG1vZGVcbiAgICAkKFwiLm5hdmJhci1jb2xsYXBzZSBhXCIpLmNsaWNrKGZ1bmN0aW9uKCkge1xuICAgICAgICAkKFwiLm5hdmJhci1jb2xsYXBzZVwiKS5jb2xsYXBzZShcImhpZGVcIik7XG4gICAgfSk7XG5cbiAgICAvLyBJbml0aWFsaXplIHRoZSBib290c3RyYXAgc2VsZWN0IHBsdWdpblxuICAgICQoXCJzZWxlY3RcIikuc2VsZWN0cGlja2VyKCk7XG5cbiAgICAkKFwiLmRhdGVwaWNrZXJcIikuZGF0ZXBpY2tlcigpO1xufSkoalF1ZXJ5KTtcbiJdLCJuYW1lcyI6WyIkIiwiZ3RhZyIsImRhdGFMYXllciIsInB1c2giLCJhcmd1bWVudHMiLCJ3aW5kb3ciLCJEYXRlIiwiY2xpY2siLCJjb2xsYXBzZSIsInNlbGVjdHBpY2tlciIsImRhdGVwaWNrZXIiLCJqUXVlcnkiXSwibWFwcGluZ3MiOiJDQUFBLFNBQVVBLEdBSU4sU0FBU0MsSUFDTEMsVUFBVUMsS0FBS0MsV0FIbkJDLE9BQU9ILFVBQVlHLE9BQU9ILFdBQWEsR0FLdkNELEVBQUssS0FBTSxJQUFJSyxNQUNmTCxFQUFLLFNBQVUsZ0JBR2ZELEVBQUUsc0JBQXNCTyxNQUFNLFdBQzFCUCxFQUFFLG9CQUFvQlEsU0FBUyxVQUluQ1IsRUFBRSxVQUFVUyxlQUVaVCxFQUFFLGVBQWVVLGFBbEJyQixDQW1CR0MifQ==
+!function(a){function e(){dataLayer.push(arguments)}window.dataLayer=window.dataLayer||[],e("js",new Date),e("config","G-WW2W29ZMTZ"),a(".navbar-collapse a").click(function(){a(".navbar-collapse").collapse("hide")}),a("select").selectpicker(),a("select[data-choices_url]").each(function(){const t=a(this),n=a("#id_"+t.data("parent_field"));function c(){const e=[].concat(n.val()||[]),c=[].concat(t.val()||[]);a.get(t.data("choices_url"),a.param({parent:e},!0),function(e){t.find("option[value!='']").remove(),e.results.forEach(function(e){const a=c.includes(e.id);t.append(new Option(e.text,e.id,a,a))}),t.selectpicker("refresh").trigger("change")})}n.on("change",c),c()}),a(".datepicker").datepicker()}(jQuery);
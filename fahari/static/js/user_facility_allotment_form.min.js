@@ -1,2 +1 @@
-function showComponent(e){e.slideDown()}function hideComponent(e){e.slideUp()}document.addEventListener("DOMContentLoaded",function(){$("#id_allotment_type").on("change",function(){$byFacilityFieldset=$("#allot_by_facility_fieldset"),$byRegionFieldset=$("#allot_by_region_fieldset"),"facility"===this.value?(showComponent($byFacilityFieldset),hideComponent($byRegionFieldset)):"region"===this.value?(showComponent($byRegionFieldset),hideComponent($byFacilityFieldset)):"both"===this.value?(showComponent($byFacilityFieldset),showComponent($byRegionFieldset)):(hideComponent($byFacilityFieldset),hideComponent($byRegionFieldset))}).trigger("change"),$("#id_region_type").on("change",function(){$countyFieldDiv=$("#div_id_counties"),$constituencyFieldDiv=$("#div_id_constituencies"),$subCountyFieldDiv=$("#div_id_sub_counties"),$wardFieldDiv=$("#div_id_wards"),"county"===this.value?(showComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"constituency"===this.value?(hideComponent($countyFieldDiv),showComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"sub_county"===this.value?(hideComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),showComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"ward"===this.value?(hideComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),showComponent($wardFieldDiv)):(hideComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv))}).trigger("change")});
-//# sourceMappingURL=data:application/json;charset=utf8;base64,eyJ2ZXJzaW9uIjozLCJmaWxlIjoidXNlcl9mYWNpbGl0eV9hbGxvdG1lbnRfZm9ybS5taW4uanMiLCJzb3VyY2VzIjpbInVzZXJfZmFjaWxpdHlfYWxsb3RtZW50X2Zvcm0uanMiXSwic291cmNlc0NvbnRlbnQiOlsiZnVuY3Rpb24gc2hvd0NvbXBvbmVudCgkY29tcG9uZW50KSB7XG4gICAgJGNvbXBvbmVudC5zbGlkZURvd24oKTtcbn1cblxuXG5mdW5jdGlvbiBoaWRlQ29tcG9uZW50KCRjb21wb25lbnQpIHtcbiAgICAkY29tcG9uZW50LnNsaWRlVXAoKTtcbn1cblxuXG5kb2N1bWVudC5hZGRFdmVudExpc3RlbmVyKFwiRE9NQ29udGVudExvYWRlZFwiLCBmdW5jdGlvbiBsb2FkKCkge1xuICAgICQoXCIjaWRfYWxsb3RtZW50X3R5cGVcIikub24oXCJjaGFuZ2VcIiwgZnVuY3Rpb24oKSB7XG4gICAgICAgICRieUZhY2lsaXR5RmllbGRzZXQgPSAkKFwiI2FsbG90X2J5X2ZhY2lsaXR5X2ZpZWxkc2V0XCIpO1xuICAgICAgICAkYnlSZWdpb25GaWVsZHNldCA9ICQoXCIjYWxsb3RfYnlfcmVnaW9uX2ZpZWxkc2V0XCIpO1xuXG4gICAgICAgIC8vIFNob3cgdGhlIGFwcHJvcHJpYXRlIGZpZWxkc2V0IGJhc2VkIG9uIHRoZSBzZWxlY3RlZCBhbGxvdG1lbnQgdHlwZVxuICAgICAgICBpZiAodGhpcy52YWx1ZSA9PT0gXCJmYWNpbGl0eVwiKSB7XG4gICAgICAgICAgICBzaG93Q29tcG9uZW50KCRieUZhY2lsaXR5RmllbGRzZXQpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkYnlSZWdpb25GaWVsZHNldCk7XG4gICAgICAgIH0gZWxzZSBpZiAodGhpcy52YWx1ZSA9PT0gXCJyZWdpb25cIikge1xuICAgICAgICAgICAgc2hvd0NvbXBvbmVudCgkYnlSZWdpb25GaWVsZHNldCk7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRieUZhY2lsaXR5RmllbGRzZXQpO1xuICAgICAgICB9IGVsc2UgaWYgKHRoaXMudmFsdWUgPT09IFwiYm90aFwiKSB7XG4gICAgICAgICAgICBzaG93Q29tcG9uZW50KCRieUZhY2lsaXR5RmllbGRzZXQpO1xuICAgICAgICAgICAgc2hvd0NvbXBvbmVudCgkYnlSZWdpb25GaWVsZHNldCk7XG4gICAgICAgIH0gZWxzZSB7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRieUZhY2lsaXR5RmllbGRzZXQpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkYnlSZWdpb25GaWVsZHNldCk7XG4gICAgICAgIH1cbiAgICB9KS50cmlnZ2VyKFwiY2hhbmdlXCIpOyAgLy8gVHJpZ2dlciB0aGUgaW5pdGlhbCBjaGFuZ2UgdG8gc2hvdyB0aGUgY29ycmVjdCBmaWVsZHNldFxuXG4gICAgJChcIiNpZF9yZWdpb25fdHlwZVwiKS5vbihcImNoYW5nZVwiLCBmdW5jdGlvbigpIHtcbiAgICAgICAgJGNvdW50eUZpZWxkRGl2ID0gJChcIiNkaXZfaWRfY291bnRpZXNcIik7XG4gICAgICAgICRjb25zdGl0dWVuY3lGaWVsZERpdiA9ICQoXCIjZGl2X2lkX2NvbnN0aXR1ZW5jaWVzXCIpO1xuICAgICAgICAkc3ViQ291bnR5RmllbGREaXYgPSAkKFwiI2Rpdl9pZF9zdWJfY291bnRpZXNcIik7XG4gICAgICAgICR3YXJkRmllbGREaXYgPSAkKFwiI2Rpdl9pZF93YXJkc1wiKTtcblxuICAgICAgICBpZiAodGhpcy52YWx1ZSA9PT0gXCJjb3VudHlcIikge1xuICAgICAgICAgICAgc2hvd0NvbXBvbmVudCgkY291bnR5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkY29uc3RpdHVlbmN5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkc3ViQ291bnR5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkd2FyZEZpZWxkRGl2KTtcbiAgICAgICAgfSBlbHNlIGlmICh0aGlzLnZhbHVlID09PSBcImNvbnN0aXR1ZW5jeVwiKSB7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRjb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBzaG93Q29tcG9uZW50KCRjb25zdGl0dWVuY3lGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRzdWJDb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCR3YXJkRmllbGREaXYpO1xuICAgICAgICB9IGVsc2UgaWYgKHRoaXMudmFsdWUgPT09IFwic3ViX2NvdW50eVwiKSB7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRjb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRjb25zdGl0dWVuY3lGaWVsZERpdik7XG4gICAgICAgICAgICBzaG93Q29tcG9uZW50KCRzdWJDb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCR3YXJkRmllbGREaXYpO1xuICAgICAgICB9IGVsc2UgaWYgKHRoaXMudmFsdWUgPT09IFwid2FyZFwiKSB7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRjb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRjb25zdGl0dWVuY3lGaWVsZERpdik7XG4gICAgICAgICAgICBoaWRlQ29tcG9uZW50KCRzdWJDb3VudHlGaWVsZERpdik7XG4gICAgICAgICAgICBzaG93Q29tcG9uZW50KCR3YXJkRmllbGREaXYpO1xuICAgICAgICB9IGVsc2Uge1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkY291bnR5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkY29uc3RpdHVlbmN5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkc3ViQ291bnR5RmllbGREaXYpO1xuICAgICAgICAgICAgaGlkZUNvbXBvbmVudCgkd2FyZEZpZWxkRGl2KTsgICAgICAgIH1cbiAgICB9KS50cmlnZ2VyKFwiY2hhbmdlXCIpOyAgLy8gVHJpZ2dlciB0aGUgaW5pdGlhbCBjaGFuZ2UgdG8gc2hvdyB0aGUgY29ycmVjdCBmaWVsZFxufSlcbiJdLCJuYW1lcyI6WyJzaG93Q29tcG9uZW50IiwiJGNvbXBvbmVudCIsInNsaWRlRG93biIsImhpZGVDb21wb25lbnQiLCJzbGlkZVVwIiwiZG9jdW1lbnQiLCJhZGRFdmVudExpc3RlbmVyIiwiJCIsIm9uIiwiJGJ5RmFjaWxpdHlGaWVsZHNldCIsIiRieVJlZ2lvbkZpZWxkc2V0IiwidGhpcyIsInZhbHVlIiwidHJpZ2dlciIsIiRjb3VudHlGaWVsZERpdiIsIiRjb25zdGl0dWVuY3lGaWVsZERpdiIsIiRzdWJDb3VudHlGaWVsZERpdiIsIiR3YXJkRmllbGREaXYiXSwibWFwcGluZ3MiOiJBQUFBLFNBQVNBLGNBQWNDLEdBQ25CQSxFQUFXQyxZQUlmLFNBQVNDLGNBQWNGLEdBQ25CQSxFQUFXRyxVQUlmQyxTQUFTQyxpQkFBaUIsbUJBQW9CLFdBQzFDQyxFQUFFLHNCQUFzQkMsR0FBRyxTQUFVLFdBQ2pDQyxvQkFBc0JGLEVBQUUsK0JBQ3hCRyxrQkFBb0JILEVBQUUsNkJBR0gsYUFBZkksS0FBS0MsT0FDTFosY0FBY1MscUJBQ2ROLGNBQWNPLG9CQUNRLFdBQWZDLEtBQUtDLE9BQ1paLGNBQWNVLG1CQUNkUCxjQUFjTSxzQkFDUSxTQUFmRSxLQUFLQyxPQUNaWixjQUFjUyxxQkFDZFQsY0FBY1UscUJBRWRQLGNBQWNNLHFCQUNkTixjQUFjTyxzQkFFbkJHLFFBQVEsVUFFWE4sRUFBRSxtQkFBbUJDLEdBQUcsU0FBVSxXQUM5Qk0sZ0JBQWtCUCxFQUFFLG9CQUNwQlEsc0JBQXdCUixFQUFFLDBCQUMxQlMsbUJBQXFCVCxFQUFFLHdCQUN2QlUsY0FBZ0JWLEVBQUUsaUJBRUMsV0FBZkksS0FBS0MsT0FDTFosY0FBY2MsaUJBQ2RYLGNBQWNZLHVCQUNkWixjQUFjYSxvQkFDZGIsY0FBY2MsZ0JBQ1EsaUJBQWZOLEtBQUtDLE9BQ1pULGNBQWNXLGlCQUNkZCxjQUFjZSx1QkFDZFosY0FBY2Esb0JBQ2RiLGNBQWNjLGdCQUNRLGVBQWZOLEtBQUtDLE9BQ1pULGNBQWNXLGlCQUNkWCxjQUFjWSx1QkFDZGYsY0FBY2dCLG9CQUNkYixjQUFjYyxnQkFDUSxTQUFmTixLQUFLQyxPQUNaVCxjQUFjVyxpQkFDZFgsY0FBY1ksdUJBQ2RaLGNBQWNhLG9CQUNkaEIsY0FBY2lCLGlCQUVkZCxjQUFjVyxpQkFDZFgsY0FBY1ksdUJBQ2RaLGNBQWNhLG9CQUNkYixjQUFjYyxrQkFDbkJKLFFBQVEifQ==
+function showComponent(e){e.slideDown()}function hideComponent(e){e.slideUp()}document.addEventListener("DOMContentLoaded",function(){$("#id_allotment_type").on("change",function(){$byFacilityFieldset=$("#allot_by_facility_fieldset"),$byRegionFieldset=$("#allot_by_region_fieldset"),"facility"===this.value?(showComponent($byFacilityFieldset),hideComponent($byRegionFieldset)):"region"===this.value?(showComponent($byRegionFieldset),hideComponent($byFacilityFieldset)):"both"===this.value?(showComponent($byFacilityFieldset),showComponent($byRegionFieldset)):(hideComponent($byFacilityFieldset),hideComponent($byRegionFieldset))}).trigger("change"),$("#id_region_type").on("change",function(){$countyFieldDiv=$("#div_id_counties"),$constituencyFieldDiv=$("#div_id_constituencies"),$subCountyFieldDiv=$("#div_id_sub_counties"),$wardFieldDiv=$("#div_id_wards"),"county"===this.value?(showComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"constituency"===this.value?(showComponent($countyFieldDiv),showComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"sub_county"===this.value?(showComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),showComponent($subCountyFieldDiv),hideComponent($wardFieldDiv)):"ward"===this.value?(showComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),showComponent($subCountyFieldDiv),showComponent($wardFieldDiv)):(hideComponent($countyFieldDiv),hideComponent($constituencyFieldDiv),hideComponent($subCountyFieldDiv),hideComponent($wardFieldDiv))}).trigger("change")});
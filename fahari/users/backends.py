@@ -0,0 +1,19 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .permission_snapshots import get_permission_snapshot
+
+
+class PermissionSnapshotBackend(ModelBackend):
+    """Model backend that checks permissions against the user's cached permission snapshot.
+
+    This spares permission checks, e.g. those of `DjangoModelPermissions` on
+    every API request, the permission queries of `ModelBackend`.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        """Return the permissions of the user and of their groups from their snapshot."""
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj)
+        return set(get_permission_snapshot(user_obj).permissions)
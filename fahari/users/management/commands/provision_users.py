@@ -0,0 +1,188 @@
+"""Create user accounts in bulk from a CSV file with "username", "email" and "name" columns."""
+import csv
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from fahari.common.models import Organisation
+from fahari.users.models import User, default_organisation
+from fahari.users.signals import (
+    bulk_assign_permissions,
+    get_permission_bundle_for_email,
+    is_from_whitelist_domain,
+)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class UsersProvisionResult(NamedTuple):
+    """A summary of the users created by `provision_users`."""
+
+    created: int
+    approved: int
+    invalid: Dict[int, List[str]]  # Errors keyed by line number
+
+
+def provision_users(
+    records: Iterable[Mapping[str, Optional[str]]],
+    organisation: Organisation,
+    groups: Sequence[Group] = (),
+    approve: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> UsersProvisionResult:
+    """Create a user for each of the given records.
+
+    New users get the same permissions as users that sign up, i.e. users
+    with a whitelisted email address are approved and granted the whitelist
+    permissions. Users are inserted using `bulk_create` and permissions and
+    groups are granted with one insert per permission bundle and per group,
+    so the number of queries doesn't grow with the number of users. No
+    emails are sent, approved users are marked as notified so that later
+    saves don't send the approval email either, and the users can only log
+    in after resetting their passwords.
+
+    :param records: The users to create, as dictionaries with a "username",
+           an "email" and an optional "name".
+    :param organisation: The organisation that the new users belong to.
+    :param groups: The groups to add the new users to.
+    :param approve: Approve all the new users, not only whitelisted ones.
+    :param batch_size: The maximum number of users to insert per query.
+    """
+
+    records = list(records)
+    usernames = {(record.get("username") or "").strip() for record in records}
+    emails = {(record.get("email") or "").strip().lower() for record in records}
+    taken_usernames = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    taken_emails = {
+        email.lower()
+        for email in User.objects.filter(email__in=emails).values_list("email", flat=True)
+    }
+
+    users: List[User] = []
+    invalid: Dict[int, List[str]] = {}
+    for line_number, record in enumerate(records, start=2):  # The first line is the header
+        username = (record.get("username") or "").strip()
+        email = (record.get("email") or "").strip().lower()
+        errors = []
+        if not username:
+            errors.append("A username is required.")
+        elif username in taken_usernames:
+            errors.append('The username "%s" is taken.' % username)
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append('"%s" is not a valid email address.' % email)
+        else:
+            if email in taken_emails:
+                errors.append('A user with the email "%s" already exists.' % email)
+        if errors:
+            invalid[line_number] = errors
+            continue
+
+        taken_usernames.add(username)
+        taken_emails.add(email)
+        is_approved = approve or is_from_whitelist_domain(email)
+        user = User(
+            approval_notified=is_approved,
+            email=email,
+            is_approved=is_approved,
+            name=(record.get("name") or "").strip(),
+            organisation=organisation,
+            username=username,
+        )
+        user.set_unusable_password()
+        users.append(user)
+
+    with transaction.atomic():
+        # `bulk_create` doesn't send `post_save`, permissions are granted here instead. The new
+        # users have no permission snapshots, so none are invalidated.
+        User.objects.bulk_create(users, batch_size=batch_size)
+        users_by_bundle: Dict[Tuple[str, ...], List[User]] = defaultdict(list)
+        for user in users:
+            users_by_bundle[get_permission_bundle_for_email(user.email)].append(user)
+        for bundle, bundle_users in users_by_bundle.items():
+            bulk_assign_permissions(bundle_users, bundle, invalidate_snapshots=False)
+
+        UserGroup = User.groups.through
+        UserGroup.objects.bulk_create(
+            (UserGroup(user_id=user.pk, group_id=group.pk) for user in users for group in groups),
+            batch_size=batch_size,
+        )
+
+    return UsersProvisionResult(
+        created=len(users),
+        approved=sum(user.is_approved for user in users),
+        invalid=invalid,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Create user accounts in bulk from a CSV file with "username", "email" and "name".'
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="The path of the CSV file to load.")
+        parser.add_argument(
+            "--organisation",
+            help="The id of the organisation that the new users belong to.",
+        )
+        parser.add_argument(
+            "--group",
+            action="append",
+            default=[],
+            dest="groups",
+            help="The name of a group to add the new users to, can be repeated.",
+        )
+        parser.add_argument(
+            "--approve",
+            action="store_true",
+            help="Approve all the new users, by default only whitelisted users are approved.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The maximum number of users to insert per query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            organisation = Organisation.objects.get(
+                pk=options["organisation"] or default_organisation()
+            )
+        except (Organisation.DoesNotExist, ValidationError):
+            raise CommandError("The given organisation does not exist.")
+        groups = list(Group.objects.filter(name__in=options["groups"]))
+        missing_groups = set(options["groups"]).difference(group.name for group in groups)
+        if missing_groups:
+            raise CommandError("Unknown groups: %s." % ", ".join(sorted(missing_groups)))
+
+        start = time.perf_counter()
+        try:
+            with open(options["source"], newline="") as source:
+                result = provision_users(
+                    csv.DictReader(source),
+                    organisation,
+                    groups=groups,
+                    approve=options["approve"],
+                    batch_size=options["batch_size"],
+                )
+        except FileNotFoundError:
+            raise CommandError('The file "%s" does not exist.' % options["source"])
+        elapsed = time.perf_counter() - start
+
+        for line_number, errors in result.invalid.items():
+            self.stderr.write(f"Skipped line {line_number}: {' '.join(errors)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Provisioned {result.created} users in {elapsed:.2f}s: "
+                f"{result.approved} approved, {len(result.invalid)} skipped."
+            )
+        )
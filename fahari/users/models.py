@@ -8,6 +8,8 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
+from .permission_snapshots import get_permission_snapshot
+
 DEFAULT_ORG_CODE = 1
 
 
@@ -56,27 +58,13 @@ class User(AbstractUser):
 
     @property
     def permissions(self):
-        perms = set(
-            [
-                f"{perm.content_type.app_label}.{perm.codename}"
-                for perm in self.user_permissions.all()
-            ]
-        )
-        groups = self.groups.all()
-        for group in groups:
-            group_perms = set(
-                [
-                    f"{perm.content_type.app_label}.{perm.codename}"
-                    for perm in group.permissions.all()
-                ]
-            )
-            perms = perms | group_perms
-        return ",\n".join(list(perms))
+        """Return the permissions of this user, and of their groups, as a string."""
+        return ",\n".join(sorted(get_permission_snapshot(self).permissions))
 
     @property
     def gps(self):
-        groups = [gp.name for gp in self.groups.all()]
-        return ",".join(groups) or "-"
+        """Return the names of this user's groups as a string."""
+        return ",".join(get_permission_snapshot(self).groups) or "-"
 
     def get_absolute_url(self):
         """Get url for user's detail view.
@@ -1,15 +1,21 @@
 import logging
+import operator
+from functools import lru_cache, reduce
+from typing import Iterable, Sequence, Tuple
 
 from allauth.account.signals import email_confirmed
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Permission
-from django.core.mail import EmailMessage
+from django.contrib.auth.models import Group, Permission
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 from django.http import HttpRequest
-from django.template.loader import get_template
+
+from fahari.common.outbox import queue_email
+
+from .permission_snapshots import bump_permissions_version_on_commit, forget_permission_snapshot
 
 LOGGER = logging.getLogger(__name__)
 BASIC_PERMISSIONS = [
@@ -27,6 +33,7 @@ WHITELIST_PERMISSIONS = BASIC_PERMISSIONS + [
     "ops.view_dailyupdate",
     "ops.add_timesheet",
 ]
+PERMISSIONS_CHANGED_ACTIONS = ("post_add", "post_remove", "post_clear")
 
 User = get_user_model()
 
@@ -53,26 +60,82 @@ def email_confirmed_hander(request, email_address, **kwargs):
         return False
 
 
-def assign_basic_permissions(user):
-    for perm_string in BASIC_PERMISSIONS:
-        content_type_app_label, perm_code_name = perm_string.split(".")
-        perm = Permission.objects.get(
-            content_type__app_label=content_type_app_label, codename=perm_code_name
-        )
-        user.user_permissions.add(perm)
+@lru_cache(maxsize=None)
+def get_permission_bundle(perm_strings: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Return the pks of the permissions with the given "<app_label>.<codename>" strings.
+
+    The permissions are resolved with a single query and memoized for the
+    life of the process, the memo is cleared whenever migrations run as
+    they may create or recreate permissions.
+    """
+    lookups = [perm_string.split(".") for perm_string in perm_strings]
+    permissions = {
+        f"{app_label}.{codename}": pk
+        for app_label, codename, pk in Permission.objects.filter(
+            reduce(
+                operator.or_,
+                (Q(content_type__app_label=label, codename=name) for label, name in lookups),
+            )
+        ).values_list("content_type__app_label", "codename", "pk")
+    }
+    missing = set(perm_strings).difference(permissions)
+    if missing:
+        raise Permission.DoesNotExist("Unknown permissions: %s." % ", ".join(sorted(missing)))
+    return tuple(sorted(set(permissions.values())))
 
-    user.save()
 
+@receiver(post_migrate)
+def permissions_migrated_handler(**kwargs):
+    get_permission_bundle.cache_clear()
 
-def assign_whitelist_permissions(user):
-    for perm_string in WHITELIST_PERMISSIONS:
-        content_type_app_label, perm_code_name = perm_string.split(".")
-        perm = Permission.objects.get(
-            content_type__app_label=content_type_app_label, codename=perm_code_name
-        )
-        user.user_permissions.add(perm)
 
-    user.save()
+def get_permission_bundle_for_email(email: str) -> Tuple[str, ...]:
+    """Return the permission strings that a new user with the given email is granted."""
+    if is_from_whitelist_domain(email):
+        return tuple(WHITELIST_PERMISSIONS)
+    return tuple(BASIC_PERMISSIONS)
+
+
+def assign_permissions(user, perm_strings: Sequence[str]) -> None:
+    """Grant a user the given permissions using a single insert."""
+    user.user_permissions.add(*get_permission_bundle(tuple(perm_strings)))
+
+
+def bulk_assign_permissions(
+    users: Iterable, perm_strings: Sequence[str], invalidate_snapshots: bool = True
+) -> int:
+    """Grant many users the given permissions using a single insert.
+
+    Permissions that a user already has are skipped. Invalidating the
+    permission snapshots of the users can be skipped for users that were
+    just created, as they have no snapshots yet.
+
+    :return: The number of users that were granted the permissions.
+    """
+    users = list(users)
+    permission_pks = get_permission_bundle(tuple(perm_strings))
+    UserPermission = User.user_permissions.through
+    UserPermission.objects.bulk_create(
+        (
+            UserPermission(user_id=user.pk, permission_id=permission_pk)
+            for user in users
+            for permission_pk in permission_pks
+        ),
+        ignore_conflicts=True,
+    )
+    if invalidate_snapshots:
+        for user in users:
+            forget_permission_snapshot(user)
+            bump_permissions_version_on_commit(user.pk)
+    return len(users)
+
+
+def assign_basic_permissions(user):
+    assign_permissions(user, BASIC_PERMISSIONS)
+
+
+def assign_whitelist_permissions(user):
+    assign_permissions(user, WHITELIST_PERMISSIONS)
 
 
 def is_from_whitelist_domain(user_email):
@@ -87,11 +150,13 @@ def is_from_whitelist_domain(user_email):
 @receiver(post_save, sender=User)
 def account_confirmed_handler(sender, instance, created, **kwargs):
     if created:
-        assign_basic_permissions(instance)
+        assign_permissions(instance, get_permission_bundle_for_email(instance.email))
         if is_from_whitelist_domain(instance.email):
-            assign_whitelist_permissions(instance)
+            # Approve the user without saving them again, which would re-fire this signal
             instance.is_approved = True
-            instance.save()
+            User.objects.filter(pk=instance.pk).update(is_approved=True)
+            if not instance.approval_notified:
+                send_user_account_approved_email(instance)
 
         return
 
@@ -105,6 +170,37 @@ def account_confirmed_handler(sender, instance, created, **kwargs):
     return True
 
 
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed_handler(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the permission snapshots of users whose permissions or groups change."""
+    if action not in PERMISSIONS_CHANGED_ACTIONS:
+        return
+    if not reverse:
+        forget_permission_snapshot(instance)
+        bump_permissions_version_on_commit(instance.pk)
+    elif pk_set:
+        for user_pk in pk_set:
+            bump_permissions_version_on_commit(user_pk)
+    else:
+        # All the users of a group or permission were removed
+        bump_permissions_version_on_commit()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed_handler(sender, action, **kwargs):
+    """Invalidate the permission snapshots of all users when the permissions of groups change."""
+    if action in PERMISSIONS_CHANGED_ACTIONS:
+        bump_permissions_version_on_commit()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_deleted_handler(sender, **kwargs):
+    """Invalidate the permission snapshots of all users when a group or permission is deleted."""
+    bump_permissions_version_on_commit()
+
+
 def send_admin_awaiting_approval_email(user, request: HttpRequest) -> None:
     context = {
         "user": user,
@@ -113,46 +209,37 @@ def send_admin_awaiting_approval_email(user, request: HttpRequest) -> None:
             "/admin/users/user/%s/change/" % str(user.pk)
         ),
     }
-    message = get_template("emails/account_pending_approval_admin.html").render(context)
-    mail = EmailMessage(
+    queue_email(
         subject="New Fahari System Account Pending Approval",
-        body=message,
-        from_email=settings.SERVER_EMAIL,
+        template_name="emails/mjml/account_pending_approval_admin.mjml",
+        context=context,
         to=[admin.email for admin in User.objects.filter(is_staff=True)],
         reply_to=[settings.SERVER_EMAIL],
     )
-    mail.content_subtype = "html"
-    mail.send()
 
 
 def send_user_awaiting_approval_email(user):
     context = {"user": user, "support_email": settings.SERVER_EMAIL}
-    message = get_template("emails/account_pending_approval_user.html").render(context)
-    mail = EmailMessage(
+    queue_email(
         subject="Fahari System Account Pending Approval",
-        body=message,
-        from_email=settings.SERVER_EMAIL,
+        template_name="emails/mjml/account_pending_approval_user.mjml",
+        context=context,
         to=[user.email],
         reply_to=[settings.SERVER_EMAIL],
     )
-    mail.content_subtype = "html"
-    mail.send()
 
 
 @transaction.atomic
 def send_user_account_approved_email(user):
     context = {"user": user, "support_email": settings.SERVER_EMAIL}
-    message = get_template("emails/account_approved.html").render(context)
-    mail = EmailMessage(
+    queue_email(
         subject="Fahari System Account Approved",
-        body=message,
-        from_email=settings.SERVER_EMAIL,
+        template_name="emails/mjml/account_approved.mjml",
+        context=context,
         to=[user.email],
         reply_to=[settings.SERVER_EMAIL],
     )
-    mail.content_subtype = "html"
-    mail.send()
 
-    # record the notification so that we do not re-send it
+    # record the notification so that we do not re-send it, without re-firing `post_save`
     user.approval_notified = True
-    user.save()
+    User.objects.filter(pk=user.pk).update(approval_notified=True)
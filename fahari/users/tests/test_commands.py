@@ -0,0 +1,105 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from fahari.common.models import Organisation, OutboundEmail
+from fahari.users.management.commands.provision_users import provision_users
+from fahari.users.models import User
+from fahari.users.signals import BASIC_PERMISSIONS, WHITELIST_PERMISSIONS, get_permission_bundle
+
+pytestmark = pytest.mark.django_db
+
+
+def make_users_csv(path, rows):
+    with open(path, "w", newline="") as source:
+        writer = csv.DictWriter(source, fieldnames=("username", "email", "name"))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_provision_users(tmp_path):
+    organisation = baker.make(Organisation)
+    baker.make(Group, name="Field Officers")
+    baker.make(User, username="taken", email="taken@example.com")
+    source = make_users_csv(
+        tmp_path / "users.csv",
+        [
+            {"username": "wanjiku", "email": "Wanjiku@example.com", "name": "Wanjiku Kamau"},
+            {"username": "ngure", "email": "ngure@savannahghi.org", "name": ""},
+            {"username": "taken", "email": "someone@example.com", "name": ""},
+            {"username": "someone", "email": "taken@example.com", "name": ""},
+            {"username": "wanjiku", "email": "wanjiku2@example.com", "name": ""},
+            {"username": "", "email": "not an email", "name": ""},
+        ],
+    )
+
+    stdout, stderr = StringIO(), StringIO()
+    call_command(
+        "provision_users",
+        source,
+        organisation=str(organisation.pk),
+        groups=["Field Officers"],
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert "Provisioned 2 users" in stdout.getvalue()
+    assert "1 approved, 4 skipped" in stdout.getvalue()
+    for line_number in (4, 5, 6, 7):
+        assert f"Skipped line {line_number}" in stderr.getvalue()
+    assert not OutboundEmail.objects.exists()
+
+    wanjiku = User.objects.get(username="wanjiku")
+    assert (wanjiku.email, wanjiku.name) == ("wanjiku@example.com", "Wanjiku Kamau")
+    assert wanjiku.organisation == organisation
+    assert not wanjiku.is_approved
+    assert not wanjiku.has_usable_password()
+    assert wanjiku.get_all_permissions() == set(BASIC_PERMISSIONS)
+    assert wanjiku.gps == "Field Officers"
+    ngure = User.objects.get(username="ngure")
+    assert ngure.is_approved
+    assert ngure.approval_notified
+    assert ngure.get_all_permissions() == set(WHITELIST_PERMISSIONS)
+    ngure.name = "Ngure"
+    ngure.save()
+    assert not OutboundEmail.objects.exists()  # Later saves don't send the approval email
+
+    stdout = StringIO()
+    call_command("provision_users", source, approve=True, stdout=stdout, stderr=StringIO())
+    assert "Provisioned 0 users" in stdout.getvalue()
+
+
+def test_provision_users_query_count(django_capture_on_commit_callbacks):
+    organisation = baker.make(Organisation)
+    groups = [baker.make(Group, name="Field Officers")]
+    get_permission_bundle(tuple(BASIC_PERMISSIONS))
+
+    def provision(count, prefix):
+        records = [
+            {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com"} for i in range(count)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks() as callbacks:
+                assert provision_users(records, organisation, groups=groups).created == count
+        return len(queries), len(callbacks)
+
+    queries, callbacks = provision(1, "one")
+    assert provision(5, "five") == (queries, callbacks)
+    assert not callbacks  # The new users have no permission snapshots to invalidate
+
+
+def test_provision_users_invalid_input(tmp_path):
+    source = make_users_csv(tmp_path / "users.csv", [])
+    with pytest.raises(CommandError, match="organisation"):
+        call_command("provision_users", source, organisation="not-a-uuid")
+    with pytest.raises(CommandError, match="Unknown groups: Nobody."):
+        call_command("provision_users", source, groups=["Nobody"])
+    with pytest.raises(CommandError, match="does not exist"):
+        call_command("provision_users", str(tmp_path / "missing.csv"))
@@ -0,0 +1,125 @@
+from functools import partial
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+from model_bakery import baker
+
+from fahari.users.backends import PermissionSnapshotBackend
+from fahari.users.models import User
+from fahari.users.permission_snapshots import get_permission_snapshot
+
+pytestmark = pytest.mark.django_db
+
+
+def fresh(user: User) -> User:
+    """Return a new instance of the given user, i.e. one without a memoized snapshot."""
+    return User.objects.get(pk=user.pk)
+
+
+def to_str(permission: Permission) -> str:
+    return f"{permission.content_type.app_label}.{permission.codename}"
+
+
+@pytest.fixture
+def user(user):
+    """A user without the permissions assigned to new users."""
+    user.user_permissions.clear()
+    return user
+
+
+@pytest.fixture
+def permissions():
+    return list(Permission.objects.select_related("content_type").order_by("pk")[:3])
+
+
+def test_permission_snapshot(user, permissions, django_assert_num_queries):
+    own, of_group, of_both = permissions
+    group = baker.make(Group, name="Field Officers")
+    group.permissions.add(of_group, of_both)
+    user.user_permissions.add(own, of_both)
+    user.groups.add(group)
+
+    user = fresh(user)
+    with django_assert_num_queries(2):
+        snapshot = get_permission_snapshot(user)
+        assert get_permission_snapshot(user) is snapshot
+    assert snapshot.groups == ("Field Officers",)
+    assert snapshot.permissions == {to_str(own), to_str(of_group), to_str(of_both)}
+    assert user.gps == "Field Officers"
+    assert user.permissions == ",\n".join(sorted(snapshot.permissions))
+
+    # Other instances of the user, e.g. those of later requests, share the cached snapshot
+    other_instance = fresh(user)
+    with django_assert_num_queries(0):
+        assert get_permission_snapshot(other_instance) == snapshot
+
+
+def test_permission_snapshot_invalidation(user, permissions, django_capture_on_commit_callbacks):
+    own, of_group, _ = permissions
+    group = baker.make(Group)
+    commit = partial(django_capture_on_commit_callbacks, execute=True)
+
+    with commit():
+        user.user_permissions.add(own)
+    assert get_permission_snapshot(user).permissions == {to_str(own)}
+    with commit():
+        user.groups.add(group)
+    assert get_permission_snapshot(user).groups == (group.name,)
+    with commit():
+        group.permissions.add(of_group)
+    assert get_permission_snapshot(fresh(user)).permissions == {to_str(own), to_str(of_group)}
+
+    # Changes made from the other side of the relations
+    with commit():
+        own.user_set.remove(user)
+    assert get_permission_snapshot(fresh(user)).permissions == {to_str(of_group)}
+    with commit():
+        group.user_set.clear()
+    assert get_permission_snapshot(fresh(user)).groups == ()
+    with commit():
+        group.user_set.add(user)
+    assert get_permission_snapshot(fresh(user)).groups == (group.name,)
+
+    with commit():
+        group.delete()
+    snapshot = get_permission_snapshot(fresh(user))
+    assert snapshot.groups == ()
+    assert not snapshot.permissions
+
+
+def test_permission_snapshot_invalidation_on_commit(
+    user, permissions, django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    own, _, _ = permissions
+    snapshot = get_permission_snapshot(fresh(user))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.user_permissions.add(own)
+
+    # The change has not committed yet, e.g. it could still be rolled back
+    with django_assert_num_queries(0):
+        assert get_permission_snapshot(fresh(user)) == snapshot
+
+    for callback in callbacks:
+        callback()
+    assert get_permission_snapshot(fresh(user)).permissions == {to_str(own)}
+
+
+def test_permission_snapshot_backend(user, permissions, django_assert_num_queries):
+    own, _, _ = permissions
+    backend = PermissionSnapshotBackend()
+    user.user_permissions.add(own)
+
+    user = fresh(user)
+    assert user.has_perm(to_str(own))
+    with django_assert_num_queries(0):
+        assert backend.has_perm(user, to_str(own))
+        assert not backend.has_perm(user, to_str(permissions[1]))
+        assert backend.has_module_perms(user, own.content_type.app_label)
+        assert not backend.get_all_permissions(user, obj=own)
+        assert not backend.get_all_permissions(AnonymousUser())
+
+    user.is_superuser = True
+    assert backend.get_all_permissions(user) == {
+        to_str(permission) for permission in Permission.objects.select_related("content_type")
+    }
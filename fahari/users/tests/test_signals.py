@@ -3,14 +3,19 @@ from unittest.mock import MagicMock
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from faker import Faker
 from model_bakery import baker
 
+from fahari.common.outbox import deliver_queued_emails
 from fahari.users.signals import (
     BASIC_PERMISSIONS,
+    WHITELIST_PERMISSIONS,
     account_confirmed_handler,
     assign_basic_permissions,
+    bulk_assign_permissions,
     email_confirmed_hander,
+    get_permission_bundle,
     is_from_whitelist_domain,
     send_admin_awaiting_approval_email,
     send_user_account_approved_email,
@@ -28,6 +33,7 @@ def test_send_user_account_approved_email(mailoutbox):
     assert user.approval_notified is False
     send_user_account_approved_email(user)
     assert user.approval_notified is True
+    deliver_queued_emails()
     assert len(mailoutbox) >= 1  # an automatic user approval email was also sent
 
     expected_subject = "Fahari System Account Approved"
@@ -47,6 +53,7 @@ def test_send_user_account_approved_email(mailoutbox):
 def test_send_user_awaiting_approval_email(mailoutbox):
     user = baker.make(User, email=fake.email(), is_approved=True, approval_notified=False)
     send_user_awaiting_approval_email(user)  # no error
+    deliver_queued_emails()
     assert len(mailoutbox) >= 1  # an automatic user approval email was also sent
     m = mailoutbox[len(mailoutbox) - 1]
     assert m.subject == "Fahari System Account Pending Approval"
@@ -63,6 +70,7 @@ def test_send_admin_awaiting_approval_email(mailoutbox, rf):
     user = baker.make(User, email=fake.email(), is_approved=True, approval_notified=False)
     request = rf.get("/")
     send_admin_awaiting_approval_email(user, request)  # no error
+    deliver_queued_emails()
     assert len(mailoutbox) >= 1
     m = mailoutbox[len(mailoutbox) - 1]
     assert m.subject == "New Fahari System Account Pending Approval"
@@ -97,6 +105,7 @@ def test_account_confirmed_handler_happy_case(mailoutbox):
 
     assert account_confirmed_handler(User, user, created=False) in [True, None]
     assert user.approval_notified is True
+    deliver_queued_emails()
     assert len(mailoutbox) >= 1
 
     expected_subject = "Fahari System Account Approved"
@@ -153,3 +162,46 @@ def test_account_confirmed_handler_newly_created_whitelist_user():
         email="noreply@savannahghi.org",
     )
     assert account_confirmed_handler(User, user, created=True) is None
+
+
+def test_get_permission_bundle(django_assert_num_queries):
+    get_permission_bundle.cache_clear()
+    with django_assert_num_queries(1):
+        bundle = get_permission_bundle(tuple(WHITELIST_PERMISSIONS))
+        assert get_permission_bundle(tuple(WHITELIST_PERMISSIONS)) == bundle
+    assert len(bundle) == len(WHITELIST_PERMISSIONS)
+
+    with pytest.raises(Permission.DoesNotExist):
+        get_permission_bundle(("users.can_view_dashboard", "users.can_fly"))
+
+
+def test_new_whitelist_user(mailoutbox, django_assert_max_num_queries):
+    with django_assert_max_num_queries(12):
+        user = User.objects.create(username="ngure", email="ngure@savannahghi.org")
+
+    user.refresh_from_db()
+    assert user.is_approved
+    assert user.approval_notified
+    assert set(WHITELIST_PERMISSIONS).issubset(user.get_all_permissions())
+    deliver_queued_emails()
+    approval_emails = [m for m in mailoutbox if m.subject == "Fahari System Account Approved"]
+    assert len(approval_emails) == 1
+
+
+def test_bulk_assign_permissions(django_assert_num_queries, django_capture_on_commit_callbacks):
+    users = baker.make(User, 3, email=fake.email)
+    user_permissions = User.user_permissions.through.objects.filter(user__in=users)
+    user_permissions.delete()
+    get_permission_bundle(tuple(BASIC_PERMISSIONS))
+
+    with django_assert_num_queries(1):
+        assert bulk_assign_permissions(users, BASIC_PERMISSIONS) == 3
+    with django_capture_on_commit_callbacks() as callbacks:
+        assert bulk_assign_permissions(users, BASIC_PERMISSIONS) == 3  # No-op
+    assert len(callbacks) == 3  # The permission snapshots are invalidated once committed
+    with django_capture_on_commit_callbacks() as callbacks:
+        bulk_assign_permissions(users, BASIC_PERMISSIONS, invalidate_snapshots=False)
+    assert not callbacks
+    assert user_permissions.count() == 3 * len(BASIC_PERMISSIONS)
+    for user in users:
+        assert set(BASIC_PERMISSIONS).issubset(User.objects.get(pk=user.pk).get_all_permissions())
@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from functools import lru_cache
-from typing import Any, Dict, Generic, Mapping, Sequence, TypeVar
+from typing import Any, Dict, Generic, Iterable, List, Mapping, Sequence, Tuple, Type, TypeVar
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -113,6 +113,33 @@ class MetadataProcessor:
         for metadata_entry_name in metadata:
             self.run_metadata_entry_processors_for_entry(metadata_entry_name)
 
+    @classmethod
+    def run_many(cls, instances: Iterable["MetadataProcessor"]) -> None:
+        """Run all metadata entries processors on the given instances in batches.
+
+        The instances are grouped by their class and by the processors
+        applicable to them after which each processor is run once per group.
+        This allows processors to implement `process_many` so that the number
+        of queries made scales with the number of processors rather than with
+        the number of instances.
+
+        :param instances: The metadata processors to run.
+        """
+
+        batches: Dict[
+            Tuple[Type[MetadataProcessor], MetadataEntryProcessor], List[MetadataProcessor]
+        ] = {}
+        for instance in instances:
+            qualified_class_name = instance.get_qualified_class_name()
+            for metadata_entry_name in instance.get_metadata():
+                for processor in get_registered_metadata_entry_processors(
+                    metadata_entry_name, qualified_class_name
+                ):
+                    batches.setdefault((type(instance), processor), []).append(instance)
+
+        for (instance_class, processor), batch in batches.items():
+            instance_class.run_metadata_entry_processor_many(processor, batch)
+
     def run_metadata_entry_processors_for_entry(self, metadata_entry_name: str) -> None:
         """Run metadata processors for the given entry."""
 
@@ -128,6 +155,20 @@ class MetadataProcessor:
 
         raise NotImplementedError("`run_processor` must be implemented.")
 
+    @classmethod
+    def run_metadata_entry_processor_many(
+        cls, processor: "MetadataEntryProcessor", instances: Sequence["MetadataProcessor"]
+    ) -> None:
+        """Run the given metadata entry processor on the given instances of this class.
+
+        The default implementation runs the processor on each instance in
+        turn. Override this to hand the whole batch over to the processor's
+        `process_many` method instead.
+        """
+
+        for instance in instances:
+            instance.run_metadata_entry_processor(processor)
+
 
 # =============================================================================
 # METADATA ENTRY PROCESSOR INTERFACE
@@ -145,3 +186,17 @@ class MetadataEntryProcessor(Generic[HM], metaclass=ABCMeta):
     @abstractmethod
     def process(self, metadata_entry_value: Any, metadata_container: HM) -> None:
         ...
+
+    def process_many(self, entries: Sequence[Tuple[Any, HM]]) -> None:
+        """Process the given metadata entry values and their metadata containers.
+
+        The default implementation processes each entry in turn. Processors
+        that need to query for data should override this to fetch the data
+        needed by all the entries at once.
+
+        :param entries: A sequence of metadata entry values and the metadata
+               containers they belong to.
+        """
+
+        for metadata_entry_value, metadata_container in entries:
+            self.process(metadata_entry_value, metadata_container)
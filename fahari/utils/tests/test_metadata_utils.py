@@ -0,0 +1,55 @@
+from typing import Any, List
+
+import pytest
+
+from fahari.utils.metadata_utils import MetadataEntryProcessor, MetadataProcessor
+
+
+class RecordingEntryProcessor(MetadataEntryProcessor["Container"]):
+    """Records the entries it processes."""
+
+    def __init__(self):
+        self.processed: List[Any] = []
+
+    @property
+    def metadata_entry_name(self) -> str:
+        return "entry"
+
+    def process(self, metadata_entry_value: Any, metadata_container: "Container") -> None:
+        self.processed.append((metadata_entry_value, metadata_container))
+
+
+class Container(MetadataProcessor):
+    """A metadata processor whose metadata has a single entry."""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def get_metadata(self):
+        return {"entry": self.value}
+
+    def run_metadata_entry_processor(self, processor: MetadataEntryProcessor) -> None:
+        processor.process(self.value, self)
+
+
+def test_run_metadata_entry_processor_many():
+    processor = RecordingEntryProcessor()
+    containers = [Container(1), Container(2)]
+
+    Container.run_metadata_entry_processor_many(processor, containers)
+
+    assert processor.processed == [(1, containers[0]), (2, containers[1])]
+
+
+def test_process_many():
+    processor = RecordingEntryProcessor()
+    containers = [Container(1), Container(2)]
+
+    processor.process_many([(c.value, c) for c in containers])
+
+    assert processor.processed == [(1, containers[0]), (2, containers[1])]
+
+
+def test_run_metadata_entry_processor_not_implemented():
+    with pytest.raises(NotImplementedError):
+        MetadataProcessor().run_metadata_entry_processor(RecordingEntryProcessor())
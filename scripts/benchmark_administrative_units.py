@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Benchmark the administrative units hierarchy index.
+
+Reports the time it takes to build the index at startup and the average
+time taken by the lookups used by the `Facility` and `UserFacilityAllotment`
+model validators.
+"""
+import sys
+import timeit
+from pathlib import Path
+
+ITERATIONS = 100_000
+REPEAT = 5
+
+
+def benchmark():
+    from fahari.common.constants import ADMINISTRATIVE_UNITS
+    from fahari.common.utils import (
+        build_administrative_units_index,
+        get_administrative_units_index,
+        get_wards_for_sub_county,
+        has_constituency,
+        has_sub_county,
+        has_ward,
+    )
+
+    build_time = min(
+        timeit.repeat(
+            lambda: build_administrative_units_index(ADMINISTRATIVE_UNITS), number=1, repeat=REPEAT
+        )
+    )
+    print(f"Index build time: {build_time * 1_000:.3f} ms")
+
+    get_administrative_units_index()  # Warm up the index
+    lookups = {
+        "has_constituency": lambda: has_constituency("Kajiado", "Magadi"),
+        "has_sub_county": lambda: has_sub_county("Nairobi", "Westlands"),
+        "has_ward": lambda: has_ward("Kajiado North", "Ngong"),
+        "get_wards_for_sub_county": lambda: get_wards_for_sub_county("Kajiado North"),
+    }
+    for name, lookup in lookups.items():
+        best = min(timeit.repeat(lookup, number=ITERATIONS, repeat=REPEAT))
+        print(f"{name}: {best / ITERATIONS * 1_000_000:.3f} µs per call")
+
+
+if __name__ == "__main__":
+    base_path = Path(__file__).parent.parent.resolve()
+    sys.path.append(str(base_path))
+
+    benchmark()